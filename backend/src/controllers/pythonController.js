@@ -3,7 +3,7 @@ import pythonBridge from '../utils/pythonBridge.js'
 export const speakQuestion = async (req, res) => {
   try {
     const { question } = req.body
-    const result = await pythonBridge.speakQuestion(question)
+    const result = await pythonBridge.speakQuestion(question, req.ip)
     res.json(result)
   } catch (error) {
     res.status(500).json({ error: error.message })
@@ -13,7 +13,7 @@ export const speakQuestion = async (req, res) => {
 export const speakWarning = async (req, res) => {
   try {
     const { warningType } = req.body
-    const result = await pythonBridge.speakWarning(warningType)
+    const result = await pythonBridge.speakWarning(warningType, req.ip)
     res.json(result)
   } catch (error) {
     res.status(500).json({ error: error.message })
@@ -23,7 +23,7 @@ export const speakWarning = async (req, res) => {
 export const startListening = async (req, res) => {
   try {
     const { sessionId } = req.body
-    const result = await pythonBridge.startListening(sessionId)
+    const result = await pythonBridge.startListening(sessionId, req.ip)
     res.json(result)
   } catch (error) {
     res.status(500).json({ error: error.message })
@@ -33,7 +33,7 @@ export const startListening = async (req, res) => {
 export const stopListening = async (req, res) => {
   try {
     const { sessionId } = req.body
-    const result = await pythonBridge.stopListening(sessionId)
+    const result = await pythonBridge.stopListening(sessionId, req.ip)
     res.json(result)
   } catch (error) {
     res.status(500).json({ error: error.message })
@@ -10,7 +10,7 @@ export const getPersonalizedQuestions = async (req, res) => {
       num_questions: numQuestions || 5
     }
 
-    const result = await pythonBridge.generateQuestions(userProfile)
+    const result = await pythonBridge.generateQuestions(userProfile, req.ip)
 
     res.json({
       success: true,
@@ -5,7 +5,7 @@ export const generateReport = async (req, res) => {
     const reportData = req.body
 
     // Generate report using Python service
-    const result = await pythonBridge.generateReport(reportData)
+    const result = await pythonBridge.generateReport(reportData, req.ip)
 
     res.json({
       success: true,
@@ -2,12 +2,16 @@ import axios from 'axios'
 
 const PYTHON_API_URL = process.env.PYTHON_API_URL || 'http://localhost:5001'
 
+// Pass the caller's address on so the Python API can rate-limit each client
+// (with RATE_TRUSTED_PROXIES=1) rather than this backend as a whole
+const forwardedFor = (client) => (client ? { headers: { 'X-Forwarded-For': client } } : undefined)
+
 class PythonBridge {
-  async speakQuestion(questionText) {
+  async speakQuestion(questionText, client) {
     try {
       const response = await axios.post(`${PYTHON_API_URL}/tts/speak-question`, {
         question: questionText
-      })
+      }, forwardedFor(client))
       return response.data
     } catch (error) {
       console.error('Error speaking question:', error.message)
@@ -15,11 +19,11 @@ class PythonBridge {
     }
   }
 
-  async speakWarning(warningType) {
+  async speakWarning(warningType, client) {
     try {
       const response = await axios.post(`${PYTHON_API_URL}/tts/speak-warning`, {
         warning_type: warningType
-      })
+      }, forwardedFor(client))
       return response.data
     } catch (error) {
       console.error('Error speaking warning:', error.message)
@@ -27,11 +31,11 @@ class PythonBridge {
     }
   }
 
-  async startListening(sessionId) {
+  async startListening(sessionId, client) {
     try {
       const response = await axios.post(`${PYTHON_API_URL}/stt/start-listening`, {
         session_id: sessionId
-      })
+      }, forwardedFor(client))
       return response.data
     } catch (error) {
       console.error('Error starting listening:', error.message)
@@ -39,11 +43,11 @@ class PythonBridge {
     }
   }
 
-  async stopListening(sessionId) {
+  async stopListening(sessionId, client) {
     try {
       const response = await axios.post(`${PYTHON_API_URL}/stt/stop-listening`, {
         session_id: sessionId
-      })
+      }, forwardedFor(client))
       return response.data
     } catch (error) {
       console.error('Error stopping listening:', error.message)
@@ -51,11 +55,11 @@ class PythonBridge {
     }
   }
 
-  async generateReport(reportData) {
+  async generateReport(reportData, client) {
     try {
       const response = await axios.post(`${PYTHON_API_URL}/report/generate`, {
         report_data: reportData
-      })
+      }, forwardedFor(client))
       return response.data
     } catch (error) {
       console.error('Error generating report:', error.message)
@@ -63,11 +67,11 @@ class PythonBridge {
     }
   }
 
-  async generateQuestions(userProfile) {
+  async generateQuestions(userProfile, client) {
     try {
       const response = await axios.post(`${PYTHON_API_URL}/questions/generate`, {
         user_profile: userProfile
-      })
+      }, forwardedFor(client))
       return response.data
     } catch (error) {
       console.error('Error generating questions:', error.message)
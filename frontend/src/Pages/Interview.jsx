@@ -3,7 +3,8 @@ import { useNavigate } from 'react-router-dom'
 import gsap from 'gsap'
 import { useInterview } from '../hooks/useInterview'
 import { useProctoring } from '../hooks/useProctoring'
-import { getQuestions } from '../services/api'
+import { useAuth } from '../hooks/useAuth'
+import { getQuestions, streamPersonalizedQuestions } from '../services/api'
 import InterviewAvatar from '../components/Interview/InterviewAvatar'
 import QuestionCard from '../components/Interview/QuestionCard'
 import AnswerInput from '../components/Interview/AnswerInput'
@@ -13,6 +14,8 @@ import './Interview.css'
 function Interview() {
   const [questions, setQuestions] = useState([])
   const [loading, setLoading] = useState(true)
+  const [streaming, setStreaming] = useState(false)
+  const { user } = useAuth()
   const { interviewState, startInterview, submitAnswer, endInterview } = useInterview()
   useProctoring()
   const navigate = useNavigate()
@@ -32,23 +35,47 @@ function Interview() {
     }
   }, [interviewState.currentQuestion, questions])
 
+  // The only end path: after the last answer, or once streaming finishes if the
+  // candidate answered every question while later ones were still streaming
+  useEffect(() => {
+    if (!streaming && questions.length > 0 && interviewState.currentQuestion >= questions.length) {
+      handleInterviewEnd()
+    }
+  }, [streaming, questions.length, interviewState.currentQuestion])
+
   const loadQuestions = async () => {
+    const interests = Array.isArray(user?.interests)
+      ? user.interests
+      : user?.interests ? [user.interests] : ['Programming']
+
+    // Start as soon as the first question arrives; the rest stream in behind it
+    setStreaming(true)
     try {
-      const response = await getQuestions()
-      setQuestions(response.data.questions)
-      setLoading(false)
+      await streamPersonalizedQuestions({
+        interests,
+        skill_level: user?.skillLevel || 'intermediate',
+        num_questions: 5,
+        candidate_id: user?.id || user?.email
+      }, (question) => {
+        setQuestions(prev => [...prev, question])
+        setLoading(false)
+      })
     } catch (error) {
-      console.error('Failed to load questions:', error)
+      console.error('Failed to stream questions, loading defaults:', error)
+      try {
+        const response = await getQuestions()
+        setQuestions(prev => prev.length ? prev : response.data.questions)
+      } catch (fallbackError) {
+        console.error('Failed to load questions:', fallbackError)
+      }
+    } finally {
+      setStreaming(false)
       setLoading(false)
     }
   }
 
   const handleAnswerSubmit = (answer) => {
     submitAnswer(answer)
-    
-    if (interviewState.currentQuestion >= questions.length - 1) {
-      handleInterviewEnd()
-    }
   }
 
   const handleInterviewEnd = () => {
@@ -85,11 +112,13 @@ function Interview() {
         </div>
 
         <div className="interview-right" ref={questionRef}>
-          {currentQuestion && (
+          {currentQuestion ? (
             <>
               <QuestionCard question={currentQuestion} />
               <AnswerInput onSubmit={handleAnswerSubmit} />
             </>
+          ) : streaming && (
+            <div className="loading-screen">Preparing your next question...</div>
           )}
         </div>
       </div>
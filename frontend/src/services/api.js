@@ -22,6 +22,47 @@ export const submitInterview = (interviewData) => api.post('/interview/submit',
 export const getPersonalizedQuestions = (userProfile) => 
   api.post('/questions/personalized', userProfile)
 
+// Streams questions as NDJSON from the Python service, calling onQuestion for each one
+// as soon as it arrives. Resolves with the full list once the stream ends.
+export const streamPersonalizedQuestions = async (userProfile, onQuestion) => {
+  const response = await fetch(`${PYTHON_API_URL}/questions/generate-stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ user_profile: userProfile })
+  })
+  if (!response.ok || !response.body) {
+    throw new Error(`Question stream failed with status ${response.status}`)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  const questions = []
+  let buffer = ''
+
+  const handleLine = (line) => {
+    if (!line.trim()) return
+    const message = JSON.parse(line)
+    if (message.type === 'question') {
+      questions.push(message.question)
+      onQuestion?.(message.question, message.index)
+    } else if (message.type === 'error') {
+      throw new Error(message.error)
+    }
+  }
+
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    lines.forEach(handleLine)
+  }
+  handleLine(buffer)
+
+  return questions
+}
+
 // Python Services
 export const speakQuestion = (question) => 
   api.post('/python/speak-question', { question })
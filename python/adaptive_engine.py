@@ -0,0 +1,220 @@
+"""
+EduNerve AI - Adaptive Interview Engine
+Chooses each question's difficulty and topic from the scores of previous answers
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Item difficulty of each bank level on the ability scale
+DIFFICULTY_LEVELS = {'beginner': -1.0, 'intermediate': 0.0, 'advanced': 1.0}
+
+class AdaptiveSession:
+    """
+    Ability estimate for one interview, updated after every answer.
+
+    Answers are scored with a Rasch (one-parameter IRT) model: the chance of a
+    good answer to an item of difficulty b is p = 1 / (1 + e^(b - theta)).
+    Each score moves theta by (score - p) / information, a single Newton step
+    on the likelihood, so an update is O(1) regardless of interview length.
+    The next question uses the difficulty closest to theta (most informative)
+    and the topic measured least so far.
+    """
+
+    def __init__(self, session_id, topics, skill_level='intermediate', max_questions=10,
+                 min_questions=3, target_se=0.65, prior_information=1.0):
+        """
+        Args:
+            session_id (str): Interview session
+            topics (list): (interest, bank tags) pairs to cover, tags most specific first
+            skill_level (str): Self-reported level, used as the starting estimate
+            max_questions (int): Questions asked at most
+            min_questions (int): Questions asked at least before stopping early
+            target_se (float): Stop once the ability standard error falls to this
+            prior_information (float): Weight of the starting estimate
+        """
+        self.session_id = session_id
+        self.topics = list(topics)
+        self.max_questions = max_questions
+        self.min_questions = min(min_questions, max_questions)
+        self.target_se = target_se
+
+        self.theta = DIFFICULTY_LEVELS.get(skill_level, 0.0)
+        self.information = prior_information
+        self.topic_theta = {interest: self.theta for interest, _ in self.topics}
+        self.topic_information = {interest: prior_information for interest, _ in self.topics}
+
+        self.asked = OrderedDict()     # question id -> question awaiting or holding a score
+        self.question_topics = {}      # question id -> interest it was drawn for
+        self.exhausted = False         # the bank had nothing left to ask
+        self.history = []              # scored answers in order
+        self.updated_at = time.time()
+
+    @staticmethod
+    def probability(theta, difficulty):
+        return 1.0 / (1.0 + math.exp(difficulty - theta))
+
+    @property
+    def standard_error(self):
+        return 1.0 / math.sqrt(self.information)
+
+    @property
+    def finished(self):
+        answered = len(self.history)
+        return self.exhausted or answered >= self.max_questions or \
+            (answered >= self.min_questions and self.standard_error <= self.target_se)
+
+    def target_levels(self):
+        """Bank levels ordered from most to least informative for the current estimate"""
+        return sorted(DIFFICULTY_LEVELS, key=lambda level: abs(DIFFICULTY_LEVELS[level] - self.theta))
+
+    def topics_by_need(self):
+        """(interest, tags) topics, least measured first; earlier interests win ties"""
+        return sorted(self.topics, key=lambda topic: self.topic_information[topic[0]])
+
+    def ask(self, question, interest):
+        """Record a question put to the candidate and the topic it measures"""
+        self.asked[question['id']] = question
+        self.question_topics[question['id']] = interest
+
+    def record_score(self, question_id, score):
+        """
+        Update the estimate with an answer's score
+
+        Args:
+            question_id (str): Question that was answered
+            score (float): 0-1, or a 0-100 percentage
+
+        Returns:
+            dict: The scored answer
+        """
+        question = self.asked.get(question_id)
+        if question is None:
+            raise KeyError(f'Question {question_id} was not asked in session {self.session_id}')
+        if 'score' in question:
+            raise ValueError(f'Question {question_id} was already scored')
+
+        score = float(score)
+        if score > 1:
+            score /= 100.0
+        score = min(max(score, 0.0), 1.0)
+
+        difficulty = DIFFICULTY_LEVELS[question['difficulty'].lower()]
+        p = self.probability(self.theta, difficulty)
+        self.information += p * (1 - p)
+        self.theta += (score - p) / self.information
+
+        interest = self.question_topics.get(question_id, question['category'])
+        if interest in self.topic_theta:
+            p_topic = self.probability(self.topic_theta[interest], difficulty)
+            self.topic_information[interest] += p_topic * (1 - p_topic)
+            self.topic_theta[interest] += (score - p_topic) / self.topic_information[interest]
+
+        question['score'] = score
+        entry = {'question_id': question_id, 'category': interest,
+                 'difficulty': question['difficulty'], 'score': score, 'theta': round(self.theta, 3)}
+        self.history.append(entry)
+        self.updated_at = time.time()
+        return entry
+
+    def estimated_level(self):
+        """Bank level closest to the current estimate"""
+        return self.target_levels()[0]
+
+    def to_dict(self):
+        return {
+            'session_id': self.session_id,
+            'theta': round(self.theta, 3),
+            'standard_error': round(self.standard_error, 3),
+            'estimated_level': self.estimated_level(),
+            'answered': len(self.history),
+            'finished': self.finished,
+            'topics': {
+                interest: {
+                    'theta': round(self.topic_theta[interest], 3),
+                    'standard_error': round(1.0 / math.sqrt(self.topic_information[interest]), 3)
+                }
+                for interest, _ in self.topics
+            },
+            'history': list(self.history)
+        }
+
+class AdaptiveEngine:
+    """Adaptive sessions for many concurrent interviews, drawing questions from the bank"""
+
+    def __init__(self, bank, question_factory, max_sessions=10000, min_questions=None, target_se=None):
+        """
+        Args:
+            bank (QuestionBank): Source of questions
+            question_factory (function): (bank question, interest, level) -> response dict
+            max_sessions (int): Sessions kept (least recently used are dropped)
+            min_questions (int): Defaults to ADAPTIVE_MIN_QUESTIONS (3)
+            target_se (float): Defaults to ADAPTIVE_TARGET_SE (0.65)
+        """
+        self.bank = bank
+        self.question_factory = question_factory
+        self.max_sessions = max_sessions
+        self.min_questions = min_questions or int(os.getenv('ADAPTIVE_MIN_QUESTIONS', 3))
+        self.target_se = target_se or float(os.getenv('ADAPTIVE_TARGET_SE', 0.65))
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    def start(self, session_id, topics, skill_level, max_questions):
+        """Create (or restart) a session and return it"""
+        session = AdaptiveSession(session_id, topics, skill_level, max_questions=max_questions,
+                                  min_questions=self.min_questions, target_se=self.target_se)
+        with self._lock:
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def end(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+
+    def next_question(self, session):
+        """
+        Pick the next question for a session
+
+        Returns:
+            dict: Question, or None when the session is finished or the bank is exhausted
+        """
+        if session.finished:
+            return None
+        used = set(session.asked)
+        # Least measured topic first, closest difficulty first, then the topic's broader tags;
+        # other levels and topics before giving up
+        for interest, tags in session.topics_by_need():
+            for level in session.target_levels():
+                for tag in tags:
+                    sample = self.bank.sample([tag], [level], 1, exclude=used)
+                    if sample:
+                        question = self.question_factory(sample[0], interest, level)
+                        session.ask(question, interest)
+                        return question
+        session.exhausted = True
+        return None
+
+    def get_stats(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+        finished = [s for s in sessions if s.finished]
+        return {
+            'sessions': len(sessions),
+            'finished': len(finished),
+            'avg_questions_to_finish': round(sum(len(s.history) for s in finished) / len(finished), 2)
+            if finished else None,
+            'target_se': self.target_se
+        }
@@ -3,35 +3,256 @@ EduNerve AI - Python API Server
 Flask server to handle TTS, STT, Cheating Detection, Report Generation, and Question Generation
 """
 
-from flask import Flask, request, jsonify, send_file
+import time
+_boot_started = time.perf_counter()
+
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-from text_to_speech import AIAvatarSpeaker
-from speech_recognition_service import AnswerListener
-from cheating_detection import CheatingDetector
-from report_generator import InterviewReportGenerator
-from question_generator import PersonalizedQuestionGenerator
+from werkzeug.utils import secure_filename
+from lazy_services import ServiceRegistry
+from logging_setup import configure_logging, install_request_context
+from session_store import SessionOwnedElsewhere
+from metrics import instrument_flask
+from profiler import install_profiler
+from rate_limit import install_admission_control
+from serialization import dumps, install_response_encoding, wants_minimal
 import os
 import json
-import cv2
+import uuid
 import base64
-import numpy as np
+import logging
 from dotenv import load_dotenv
 from datetime import datetime
 
 load_dotenv()
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# First, so its after_request hook runs last and compresses the final body
+install_response_encoding(app)
 CORS(app)
+install_request_context(app)
+instrument_flask(app)
+admission = install_admission_control(app)
+install_profiler(app)
 
-# Initialize services
-tts_speaker = AIAvatarSpeaker()
-report_generator = InterviewReportGenerator()
-question_generator = PersonalizedQuestionGenerator()
-cheating_detector = CheatingDetector()
+# Services are imported and constructed on first use (or by SERVICE_WARMUP),
+# so workers boot without loading cv2, mediapipe, matplotlib, reportlab or openai
+services = ServiceRegistry()
+tts_speaker = services.register('tts', 'text_to_speech', 'AIAvatarSpeaker')
+report_generator = services.register('report', 'report_generator', 'InterviewReportGenerator')
+question_generator = services.register('questions', 'question_generator', 'PersonalizedQuestionGenerator')
+cheating_detector = services.register('proctoring', 'cheating_detection', 'CheatingDetector')
 
-# Store for active listeners (in production, use Redis or similar)
+# Session ownership, transcripts and proctoring counters shared by all workers
+# (SESSION_STORE=memory|redis); the live listeners themselves stay in the owning worker
+sessions = services.register('sessions', 'session_store', 'create_session_store_from_env')
 active_listeners = {}
 
+def evict_listener(session_id):
+    """Stop and forget a listener the scheduler found idle"""
+    listener = active_listeners.pop(session_id, None)
+    if listener:
+        listener.stop_listening()
+        sessions.save_transcript(session_id, listener.transcript)
+        sessions.release(session_id, status='evicted')
+
+# Shared speech recognition pool for all STT sessions (its threads start on first use,
+# so a preforking server never creates them before fork)
+stt_scheduler = services.register(
+    'stt_scheduler', 'stt_scheduler', 'RecognitionScheduler',
+    num_workers=int(os.getenv('STT_WORKERS', 4)),
+    max_sessions=int(os.getenv('STT_MAX_SESSIONS', 200)),
+    idle_timeout=float(os.getenv('STT_IDLE_TIMEOUT', 300)),
+    on_evict=evict_listener
+)
+
+# Recognizer backend shared by all sessions (STT_BACKEND=google|whisper|fake)
+stt_backend = services.register('stt_backend', 'stt_backends', 'get_backend')
+
+def shutdown_services(timeout=30.0):
+    """
+    Drain work in progress before the process exits
+
+    Recording stops for every STT session, segments already captured are
+    recognized (up to `timeout` seconds) so their transcripts are complete,
+    and then background workers are stopped. Requests in flight, such as
+    report generation, are drained by the server before this is called.
+    Batch transcription jobs are resumable and simply stop.
+    """
+    started = time.monotonic()
+    listeners = list(active_listeners.items())
+    for _, listener in listeners:
+        listener.stop_capture()
+
+    scheduler = services.get_ready('stt_scheduler')
+    if scheduler:
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        if not scheduler.drain(remaining):
+            logger.warning("STT queue not drained within %ss", timeout)
+    store = services.get_ready('sessions')
+    for session_id, listener in listeners:
+        listener.stop_listening()
+        active_listeners.pop(session_id, None)
+        if store:
+            # Another worker resumes the session from here when the client reconnects
+            store.save_transcript(session_id, listener.transcript)
+            store.release(session_id, status='interrupted')
+    if scheduler:
+        scheduler.shutdown()
+    if store:
+        store.shutdown()
+
+    generator = services.get_ready('questions')
+    if generator:
+        if generator.pool:
+            generator.pool.shutdown()
+        generator.executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info("Services shut down in %.1fs (%d STT sessions drained)", time.monotonic() - started, len(listeners))
+
+def open_stt_session(session_id):
+    """
+    Start recording for a session on this worker, resuming its stored transcript
+    when a dead or restarted worker left it active
+
+    Returns:
+        bool: Whether the session was resumed
+
+    Raises:
+        SessionOwnedElsewhere: Another live worker is recording this session
+        RuntimeError: The microphone could not be opened
+    """
+    if session_id in active_listeners:
+        stt_scheduler.touch(session_id)
+        sessions.touch(session_id)
+        return False
+
+    record = sessions.claim(session_id, kind='stt')
+    from speech_recognition_service import AnswerListener
+    listener = AnswerListener(session_id=session_id, scheduler=stt_scheduler.get(), backend=stt_backend.get())
+    if record['resumed']:
+        snapshot = sessions.load_transcript(session_id)
+        if snapshot:
+            listener.transcript.restore(snapshot)
+    try:
+        # Mirror the transcript after every recognized utterance so any worker can serve it
+        listener.start_listening(callback=lambda text: sessions.save_transcript(session_id, listener.transcript))
+    except RuntimeError:
+        sessions.release(session_id, status='failed')
+        raise
+    active_listeners[session_id] = listener
+    return record['resumed']
+
+def close_stt_session(session_id):
+    """
+    Stop a session and get its final transcript
+
+    A session left behind by a dead worker is closed from its stored transcript.
+
+    Returns:
+        dict: 'transcript' and 'segments', or None for an unknown session
+
+    Raises:
+        SessionOwnedElsewhere: Another live worker is recording this session
+    """
+    listener = active_listeners.pop(session_id, None)
+    if listener:
+        listener.stop_listening()
+        sessions.save_transcript(session_id, listener.transcript)
+        sessions.release(session_id)
+        return {'transcript': listener.get_transcript(), 'segments': listener.get_segments()}
+
+    record = sessions.owned_record(session_id)
+    snapshot = sessions.load_transcript(session_id) if record else None
+    if snapshot is None:
+        return None
+    if record.get('owner'):
+        sessions.release(session_id)
+    return {'transcript': snapshot['text'], 'segments': snapshot['segments']}
+
+def read_stt_transcript(session_id, since=None):
+    """
+    Current transcript of a session (only changes after 'since' when given)
+
+    Sessions recorded by another worker are served from the stored snapshot,
+    which lags the owner by the utterance being recognized.
+
+    Returns:
+        dict: Transcript fields, or None for an unknown session
+    """
+    listener = active_listeners.get(session_id)
+    if listener:
+        stt_scheduler.touch(session_id)
+        sessions.touch(session_id)
+        if since is not None:
+            return listener.get_updates(int(since))
+        return {'transcript': listener.get_transcript(), 'segments': listener.get_segments(),
+                'offset': listener.transcript.offset}
+
+    snapshot = sessions.load_transcript(session_id)
+    if snapshot is None:
+        return None
+    if since is not None:
+        changed = sorted((s for s in snapshot['segments'] if s['offset'] > int(since)), key=lambda s: s['offset'])
+        return {'segments': changed, 'offset': snapshot['offset'], 'speaking': False, 'stored': True}
+    return {'transcript': snapshot['text'], 'segments': snapshot['segments'], 'offset': snapshot['offset'],
+            'stored': True}
+
+def _forward_to_owner(record):
+    """
+    Send the current request to the worker that owns its session
+
+    Returns:
+        Response: The owner's response, or None when it has no address or is unreachable
+    """
+    address = record.get('address')
+    if not address or request.headers.get('X-Forwarded-By-Worker'):
+        return None
+    import urllib.error
+    import urllib.request
+    forwarded = urllib.request.Request(
+        address.rstrip('/') + request.full_path.rstrip('?'),
+        data=request.get_data() or None,
+        method=request.method,
+        headers={'Content-Type': request.content_type or 'application/json',
+                 'X-Forwarded-By-Worker': sessions.worker_id,
+                 'X-Request-ID': request.headers.get('X-Request-ID', '')}
+    )
+    try:
+        with urllib.request.urlopen(forwarded, timeout=float(os.getenv('SESSION_FORWARD_TIMEOUT', 10))) as reply:
+            return _forwarded_response(reply.read(), reply.status, reply.headers)
+    except urllib.error.HTTPError as e:
+        return _forwarded_response(e.read(), e.code, e.headers)
+    except OSError as e:
+        logger.warning("Could not forward to session owner %s: %s", record['owner'], e)
+        return None
+
+def _forwarded_response(body, status, headers):
+    response = Response(body, status=status, content_type=headers.get('Content-Type'))
+    if headers.get('X-Session-Owner'):
+        response.headers['X-Session-Owner'] = headers['X-Session-Owner']
+    return response
+
+def _owner_conflict(record):
+    """409 naming the owning worker, when the request could not be forwarded to it"""
+    response = jsonify({
+        'error': 'Session is handled by another worker',
+        'session_id': record['session_id'],
+        'owner': record['owner']
+    })
+    response.headers['X-Session-Owner'] = record['owner']
+    return response, 409
+
+def _stt_response(body, session_id):
+    response = jsonify({'success': True, **body, 'session_id': session_id})
+    response.headers['X-Session-Owner'] = sessions.worker_id
+    return response
+
+if os.getenv('PROFILE_STARTUP', 'false').lower() == 'true':
+    logger.info("api_server loaded in %.1fms", (time.perf_counter() - _boot_started) * 1000)
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -39,7 +260,8 @@ def health_check():
         'status': 'healthy',
         'service': 'EduNerve AI Python API',
         'version': '2.0.0',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'services': services.status()
     })
 
 # ============================================
@@ -97,16 +319,14 @@ def start_listening():
         data = request.json
         session_id = data.get('session_id', 'default')
         
-        if session_id not in active_listeners:
-            listener = AnswerListener()
-            listener.start_listening()
-            active_listeners[session_id] = listener
+        try:
+            resumed = open_stt_session(session_id)
+        except SessionOwnedElsewhere as e:
+            return _forward_to_owner(e.record) or _owner_conflict(e.record)
+        except RuntimeError as e:
+            return jsonify({'error': str(e)}), 503
         
-        return jsonify({
-            'success': True,
-            'message': 'Started listening',
-            'session_id': session_id
-        })
+        return _stt_response({'message': 'Started listening', 'resumed': resumed}, session_id)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -117,17 +337,12 @@ def stop_listening():
         data = request.json
         session_id = data.get('session_id', 'default')
         
-        if session_id in active_listeners:
-            listener = active_listeners[session_id]
-            listener.stop_listening()
-            transcript = listener.get_transcript()
-            del active_listeners[session_id]
-            
-            return jsonify({
-                'success': True,
-                'transcript': transcript,
-                'session_id': session_id
-            })
+        try:
+            result = close_stt_session(session_id)
+        except SessionOwnedElsewhere as e:
+            return _forward_to_owner(e.record) or _owner_conflict(e.record)
+        if result is not None:
+            return _stt_response(result, session_id)
         
         return jsonify({'error': 'No active listener for this session'}), 404
     except Exception as e:
@@ -135,25 +350,200 @@ def stop_listening():
 
 @app.route('/stt/get-transcript', methods=['POST'])
 def get_transcript():
-    """Get current transcript without stopping"""
+    """
+    Get current transcript without stopping
+
+    With 'since' set to the offset from the previous poll, only the segments
+    added or recognized after it are returned instead of the whole transcript.
+    """
     try:
         data = request.json
         session_id = data.get('session_id', 'default')
+        since = data.get('since')
         
-        if session_id in active_listeners:
-            listener = active_listeners[session_id]
-            transcript = listener.get_transcript()
-            
-            return jsonify({
-                'success': True,
-                'transcript': transcript,
-                'session_id': session_id
-            })
+        if session_id not in active_listeners:
+            # Fresher from the owner when it can be reached; the stored snapshot otherwise
+            record = sessions.get_record(session_id)
+            if record and record.get('owner') and not sessions.is_owner(record):
+                forwarded = _forward_to_owner(record)
+                if forwarded is not None:
+                    return forwarded
+
+        result = read_stt_transcript(session_id, since)
+        if result is not None:
+            return _stt_response(result, session_id)
         
         return jsonify({'error': 'No active listener for this session'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/stt/metrics', methods=['GET'])
+def stt_metrics():
+    """Get recognition queue depth and latency metrics"""
+    return jsonify({
+        'success': True,
+        'backend': stt_backend.name,
+        'metrics': stt_scheduler.get_metrics()
+    })
+
+@app.route('/sessions/<session_id>', methods=['GET'])
+def session_info(session_id):
+    """Owner, status and proctoring counts of a session (answered by any worker)"""
+    record = sessions.get_record(session_id)
+    if record is None:
+        return jsonify({'error': 'Session not found'}), 404
+    return jsonify({
+        'success': True,
+        'session': record,
+        'local': session_id in active_listeners,
+        'proctoring': sessions.get_proctoring(session_id),
+        'store': sessions.get_stats()
+    })
+
+# ============================================
+# BATCH TRANSCRIPTION ENDPOINTS
+# ============================================
+
+BATCH_AUDIO_ROOT = os.path.abspath(os.getenv('BATCH_AUDIO_ROOT', 'recordings'))
+BATCH_OUTPUT_DIR = os.getenv('BATCH_OUTPUT_DIR', 'batch_transcripts')
+batch_jobs = {}
+
+@app.route('/stt/batch-transcribe', methods=['POST'])
+def batch_transcribe():
+    """
+    Transcribe recorded interview audio in the background
+
+    Accepts either multipart uploads ('files') or JSON with a 'directory'
+    under BATCH_AUDIO_ROOT. An optional 'questions' mapping of file name to
+    [{question_id, start, end}] aligns transcripts to questions. Posting again
+    with the same 'job_id' resumes the job, skipping files already done.
+    """
+    from batch_transcriber import BatchTranscriptionJob, find_audio_files, AUDIO_EXTENSIONS
+    try:
+        data = request.form if request.files else (request.json or {})
+        job_id = secure_filename(data.get('job_id', '')) or uuid.uuid4().hex[:12]
+
+        existing = batch_jobs.get(job_id)
+        if existing and existing.get_progress()['status'] == 'running':
+            return jsonify({'error': 'Job is already running', 'progress': existing.get_progress()}), 409
+        try:
+            sessions.claim(f'batch:{job_id}', kind='batch')
+        except SessionOwnedElsewhere as e:
+            return jsonify({'error': 'Job is already running', 'owner': e.record['owner']}), 409
+
+        started = False
+        try:
+            if request.files:
+                questions = json.loads(data.get('questions', '{}'))
+                upload_dir = os.path.join(BATCH_OUTPUT_DIR, 'uploads', job_id)
+                os.makedirs(upload_dir, exist_ok=True)
+
+                files = []
+                for upload in request.files.getlist('files'):
+                    filename = secure_filename(upload.filename)
+                    if not filename.lower().endswith(AUDIO_EXTENSIONS):
+                        return jsonify({'error': f'Unsupported audio file: {upload.filename}'}), 400
+                    path = os.path.join(upload_dir, filename)
+                    upload.save(path)
+                    files.append(path)
+                root = upload_dir
+            else:
+                questions = data.get('questions', {})
+                root = os.path.abspath(os.path.join(BATCH_AUDIO_ROOT, data.get('directory', '')))
+                if os.path.commonpath([root, BATCH_AUDIO_ROOT]) != BATCH_AUDIO_ROOT or not os.path.isdir(root):
+                    return jsonify({'error': 'Directory not found under the batch audio root'}), 400
+                files = find_audio_files(root)
+
+            if not files:
+                return jsonify({'error': 'No audio files provided'}), 400
+
+            job = BatchTranscriptionJob(
+                files,
+                os.path.join(BATCH_OUTPUT_DIR, f'{job_id}.jsonl'),
+                workers=int(os.getenv('BATCH_STT_WORKERS', os.cpu_count() or 1)),
+                questions=questions,
+                root=root,
+                job_id=job_id
+            )
+            batch_jobs[job_id] = job
+            job.start(on_finish=lambda progress: sessions.release(f'batch:{job_id}', status=progress['status'],
+                                                                  progress=progress))
+            started = True
+        finally:
+            if not started:
+                sessions.release(f'batch:{job_id}')
+
+        return jsonify({
+            'success': True,
+            'job_id': job.job_id,
+            'files': len(files),
+            'status_url': f'/stt/batch-status/{job.job_id}',
+            'results_url': f'/stt/batch-results/{job.job_id}'
+        }), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _batch_job_elsewhere(job_id):
+    """
+    Find a batch job this worker does not have
+
+    Returns:
+        tuple: (response, progress): the owner's response when another live worker
+            runs the job, otherwise None and the progress stored when it finished (or None)
+    """
+    try:
+        record = sessions.owned_record(f'batch:{job_id}')
+    except SessionOwnedElsewhere as e:
+        return _forward_to_owner(e.record) or _owner_conflict(e.record), None
+    return None, (record or {}).get('progress')
+
+@app.route('/stt/batch-status/<job_id>', methods=['GET'])
+def batch_status(job_id):
+    """Get progress of a batch transcription job"""
+    job = batch_jobs.get(job_id)
+    if job:
+        progress = job.get_progress()
+    else:
+        forwarded, progress = _batch_job_elsewhere(job_id)
+        if forwarded:
+            return forwarded
+        if progress is None:
+            return jsonify({'error': 'Batch job not found'}), 404
+
+    return jsonify({
+        'success': True,
+        'progress': progress
+    })
+
+@app.route('/stt/batch-results/<job_id>', methods=['GET'])
+def batch_results(job_id):
+    """Get the transcripts finished so far (JSONL with ?format=jsonl)"""
+    from batch_transcriber import read_results
+    try:
+        job = batch_jobs.get(job_id)
+        progress = job.get_progress() if job else None
+        if job is None:
+            forwarded, progress = _batch_job_elsewhere(job_id)
+            if forwarded:
+                return forwarded
+
+        output_path = os.path.join(BATCH_OUTPUT_DIR, f'{secure_filename(job_id)}.jsonl')
+        if not os.path.exists(output_path):
+            return jsonify({'error': 'No results for this job'}), 404
+
+        if request.args.get('format') == 'jsonl':
+            return send_file(output_path, mimetype='application/x-ndjson', as_attachment=True,
+                             download_name=f'{job_id}.jsonl')
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'progress': progress,
+            'results': read_results(output_path)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ============================================
 # PROCTORING ENDPOINTS
 # ============================================
@@ -169,16 +559,28 @@ def analyze_frame():
             return jsonify({'error': 'No frame data provided'}), 400
         
         # Decode base64 frame
-        frame_bytes = base64.b64decode(frame_data.split(','))
+        import cv2
+        import numpy as np
+        frame_bytes = base64.b64decode(frame_data.split(',')[-1])
         nparr = np.frombuffer(frame_bytes, np.uint8)
         frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         
         # Analyze frame
         analysis = cheating_detector.analyze_behavior(frame)
         
+        # Per-session counters live in the shared store, so frames may go to any worker
+        session_id = data.get('session_id')
+        if session_id:
+            sessions.record_alerts(session_id, analysis['alerts'])
+        
+        if wants_minimal(request.headers):
+            # Per-frame polling only needs what drives the UI
+            return jsonify({key: analysis[key] for key in ('face_count', 'gaze_direction', 'alerts')})
+        
         return jsonify({
             'success': True,
-            'analysis': analysis
+            'analysis': analysis,
+            **({'session_counts': sessions.get_proctoring(session_id)} if session_id else {})
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -189,6 +591,11 @@ def check_violations():
     try:
         data = request.json
         violations = data.get('violations', {})
+        if data.get('session_id'):
+            # Counts from analyzed frames, overridden by client-side counts (tab switches)
+            stored = sessions.get_proctoring(data['session_id'])
+            stored.pop('frames', None)
+            violations = {**stored, **violations}
         
         # Define violation thresholds
         thresholds = {
@@ -281,6 +688,8 @@ def generate_questions():
     try:
         data = request.json
         user_profile = data.get('user_profile', {})
+        if not isinstance(user_profile, dict):
+            return jsonify({'error': 'user_profile must be an object'}), 400
         
         # Validate user profile
         if not user_profile.get('interests'):
@@ -293,6 +702,9 @@ def generate_questions():
         # Generate questions
         questions = question_generator.generate_questions(user_profile)
         
+        if wants_minimal(request.headers):
+            return jsonify({'questions': questions, 'count': len(questions)})
+        
         return jsonify({
             'success': True,
             'questions': questions,
@@ -302,6 +714,91 @@ def generate_questions():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/questions/generate-stream', methods=['POST'])
+def generate_questions_stream():
+    """
+    Stream personalized questions as NDJSON, one line per question as soon as it is ready
+
+    Lines are {"type": "question", "index": i, "question": {...}}, followed by
+    {"type": "done", "count": n}, or {"type": "error", "error": "..."} on failure.
+    """
+    data = request.json or {}
+    user_profile = data.get('user_profile', {})
+    if not isinstance(user_profile, dict):
+        return jsonify({'error': 'user_profile must be an object'}), 400
+
+    def generate():
+        count = 0
+        try:
+            for question in question_generator.iter_questions(user_profile):
+                yield dumps({'type': 'question', 'index': count, 'question': question}) + b'\n'
+                count += 1
+            yield dumps({'type': 'done', 'count': count}) + b'\n'
+        except Exception as e:
+            yield dumps({'type': 'error', 'error': str(e), 'count': count}) + b'\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/questions/adaptive/start', methods=['POST'])
+def start_adaptive_interview():
+    """Start an adaptive interview and get its first question"""
+    try:
+        data = request.json or {}
+        user_profile = data.get('user_profile', {})
+        if not isinstance(user_profile, dict):
+            return jsonify({'error': 'user_profile must be an object'}), 400
+        user_profile.setdefault('session_id', data.get('session_id', 'default'))
+        user_profile.setdefault('num_questions', 10)
+
+        # The interview's state lives in the worker that started it
+        try:
+            sessions.claim(f"adaptive:{user_profile['session_id']}", kind='adaptive')
+        except SessionOwnedElsewhere as e:
+            return _forward_to_owner(e.record) or _owner_conflict(e.record)
+
+        result = question_generator.start_adaptive_interview(user_profile)
+        return jsonify({'success': True, **result})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/questions/adaptive/answer', methods=['POST'])
+def answer_adaptive_question():
+    """Score an answer in an adaptive interview and get the next question"""
+    try:
+        data = request.json or {}
+        for field in ('session_id', 'question_id', 'score'):
+            if data.get(field) is None:
+                return jsonify({'error': f'{field} is required'}), 400
+
+        try:
+            sessions.owned_record(f"adaptive:{data['session_id']}")
+        except SessionOwnedElsewhere as e:
+            return _forward_to_owner(e.record) or _owner_conflict(e.record)
+        sessions.touch(f"adaptive:{data['session_id']}")
+
+        result = question_generator.answer_adaptive_question(
+            data['session_id'], data['question_id'], data['score']
+        )
+        return jsonify({'success': True, **result})
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/questions/stats', methods=['GET'])
+def question_stats():
+    """Get question generation and cache hit-rate metrics"""
+    return jsonify({
+        'success': True,
+        'stats': question_generator.get_stats()
+    })
+
 # ============================================
 # UTILITY ENDPOINTS
 # ============================================
@@ -320,7 +817,12 @@ def test():
             'stt': {
                 'start': '/stt/start-listening',
                 'stop': '/stt/stop-listening',
-                'transcript': '/stt/get-transcript'
+                'transcript': '/stt/get-transcript',
+                'metrics': '/stt/metrics',
+                'session': '/sessions/<session_id>',
+                'batch_transcribe': '/stt/batch-transcribe',
+                'batch_status': '/stt/batch-status/<job_id>',
+                'batch_results': '/stt/batch-results/<job_id>'
             },
             'proctoring': {
                 'analyze': '/proctoring/analyze-frame',
@@ -331,8 +833,13 @@ def test():
                 'download': '/report/download/<filename>'
             },
             'questions': {
-                'generate': '/questions/generate'
-            }
+                'generate': '/questions/generate',
+                'generate_stream': '/questions/generate-stream',
+                'adaptive_start': '/questions/adaptive/start',
+                'adaptive_answer': '/questions/adaptive/answer',
+                'stats': '/questions/stats'
+            },
+            'metrics': '/metrics'
         }
     })
 
@@ -383,4 +890,5 @@ if __name__ == '__main__':
 ╚═══════════════════════════════════════════════════════════╝
     """)
     
+    services.warmup_from_env()
     app.run(host=host, port=port, debug=debug)
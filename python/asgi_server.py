@@ -0,0 +1,460 @@
+"""
+EduNerve AI - Async (ASGI) API Server
+Event-loop variant of api_server for I/O-bound endpoints
+
+Question generation awaits OpenAI through an async client, so a request that
+is waiting on the LLM holds no thread. Blocking libraries without async
+clients (gTTS playback, microphone setup) run on an I/O thread pool, and
+CPU-bound proctoring and report rendering on their own executors. Routes not
+defined here (batch transcription, adaptive interviews, /test, ...) are
+served by the Flask app from api_server, sharing the same services.
+
+Usage:
+    hypercorn asgi_server:app --bind 0.0.0.0:5001
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import httpx    # installed with openai
+from asgiref.wsgi import WsgiToAsgi
+from quart import Quart, Response, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from werkzeug.exceptions import HTTPException
+from session_store import SessionOwnedElsewhere
+import api_server
+import metrics
+from rate_limit import client_address, retry_after_header
+from serialization import dumps, loads, wants_minimal
+from api_server import services, sessions, open_stt_session, close_stt_session, read_stt_transcript
+from api_server import tts_speaker, report_generator, question_generator, cheating_detector
+
+logger = logging.getLogger(__name__)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson-backed jsonify for the Quart routes (compression is left to the proxy for these)"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+quart_app = cors(Quart(__name__))
+quart_app.json = FastJSONProvider(quart_app)
+
+# Blocking network and device calls (gTTS, playback, microphone calibration)
+io_executor = ThreadPoolExecutor(max_workers=int(os.getenv('ASGI_IO_THREADS', 32)), thread_name_prefix='asgi-io')
+# Frame analysis: OpenCV and MediaPipe release the GIL while they work
+cpu_executor = ThreadPoolExecutor(max_workers=int(os.getenv('ASGI_CPU_THREADS', os.cpu_count() or 1)),
+                                  thread_name_prefix='asgi-cpu')
+# matplotlib's pyplot state is global, so reports are rendered one at a time
+report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='asgi-report')
+
+_async_questions = None
+
+def async_questions():
+    """AsyncQuestionGenerator sharing the Flask app's generator (built on first use)"""
+    global _async_questions
+    if _async_questions is None:
+        from async_question_generator import AsyncQuestionGenerator
+        from llm_client import create_async_llm_client_from_env
+
+        generator = question_generator.get()
+        llm = None
+        if generator.llm is not None:
+            llm = create_async_llm_client_from_env(generator.openai_api_key, breaker=generator.llm.breaker)
+        _async_questions = AsyncQuestionGenerator(generator, llm)
+    return _async_questions
+
+async def run_in(executor, function, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+_forward_client = None
+
+async def forward_to_owner(record):
+    """
+    Async version of api_server._forward_to_owner
+
+    Returns:
+        Response: The owner's response, or None when it has no address or is unreachable
+    """
+    global _forward_client
+    address = record.get('address')
+    if not address or request.headers.get('X-Forwarded-By-Worker'):
+        return None
+    if _forward_client is None:
+        _forward_client = httpx.AsyncClient(timeout=float(os.getenv('SESSION_FORWARD_TIMEOUT', 10)))
+    try:
+        reply = await _forward_client.request(
+            request.method,
+            address.rstrip('/') + request.full_path.rstrip('?'),
+            content=await request.get_data() or None,
+            headers={'Content-Type': request.content_type or 'application/json',
+                     'X-Forwarded-By-Worker': sessions.worker_id,
+                     'X-Request-ID': request.headers.get('X-Request-ID', '')}
+        )
+    except httpx.HTTPError as e:
+        logger.warning("Could not forward to session owner %s: %s", record['owner'], e)
+        return None
+    response = Response(reply.content, status=reply.status_code, content_type=reply.headers.get('Content-Type'))
+    if reply.headers.get('X-Session-Owner'):
+        response.headers['X-Session-Owner'] = reply.headers['X-Session-Owner']
+    return response
+
+def owner_conflict(record):
+    """409 naming the worker that owns a session (see api_server._owner_conflict)"""
+    return jsonify({'error': 'Session is handled by another worker', 'session_id': record['session_id'],
+                    'owner': record['owner']}), 409, {'X-Session-Owner': record['owner']}
+
+def stt_response(body, session_id):
+    return jsonify({'success': True, **body, 'session_id': session_id}), 200, {'X-Session-Owner': sessions.worker_id}
+
+@quart_app.route('/health', methods=['GET'])
+async def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'service': 'EduNerve AI Python API',
+        'version': '2.0.0',
+        'server': 'asgi',
+        'timestamp': datetime.now().isoformat(),
+        'services': services.status()
+    })
+
+# ============================================
+# TEXT-TO-SPEECH ENDPOINTS
+# ============================================
+
+@quart_app.route('/tts/speak-question', methods=['POST'])
+async def speak_question():
+    """Text-to-speech for interview questions"""
+    try:
+        data = await request.get_json()
+        question_text = data.get('question', '')
+
+        if not question_text:
+            return jsonify({'error': 'No question provided'}), 400
+
+        await run_in(io_executor, lambda: tts_speaker.speak_question(question_text))
+
+        return jsonify({
+            'success': True,
+            'message': 'Question spoken',
+            'text': question_text
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@quart_app.route('/tts/speak-warning', methods=['POST'])
+async def speak_warning():
+    """Text-to-speech for proctoring warnings"""
+    try:
+        data = await request.get_json()
+        warning_type = data.get('warning_type', '')
+
+        if not warning_type:
+            return jsonify({'error': 'No warning type provided'}), 400
+
+        await run_in(io_executor, lambda: tts_speaker.speak_warning(warning_type))
+
+        return jsonify({
+            'success': True,
+            'message': 'Warning spoken',
+            'type': warning_type
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# SPEECH-TO-TEXT ENDPOINTS
+# ============================================
+
+@quart_app.route('/stt/start-listening', methods=['POST'])
+async def start_listening():
+    """Start speech recognition"""
+    try:
+        data = await request.get_json()
+        session_id = data.get('session_id', 'default')
+
+        try:
+            # Opening the microphone includes a two second noise calibration
+            resumed = await run_in(io_executor, open_stt_session, session_id)
+        except SessionOwnedElsewhere as e:
+            return await forward_to_owner(e.record) or owner_conflict(e.record)
+        except RuntimeError as e:
+            return jsonify({'error': str(e)}), 503
+
+        return stt_response({'message': 'Started listening', 'resumed': resumed}, session_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@quart_app.route('/stt/stop-listening', methods=['POST'])
+async def stop_listening():
+    """Stop speech recognition and get transcript"""
+    try:
+        data = await request.get_json()
+        session_id = data.get('session_id', 'default')
+
+        try:
+            result = await run_in(io_executor, close_stt_session, session_id)
+        except SessionOwnedElsewhere as e:
+            return await forward_to_owner(e.record) or owner_conflict(e.record)
+        if result is not None:
+            return stt_response(result, session_id)
+
+        return jsonify({'error': 'No active listener for this session'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@quart_app.route('/stt/get-transcript', methods=['POST'])
+async def get_transcript():
+    """Get current transcript without stopping (only changes after 'since' when given)"""
+    try:
+        data = await request.get_json()
+        session_id = data.get('session_id', 'default')
+
+        if session_id not in api_server.active_listeners:
+            # Fresher from the owner when it can be reached; the stored snapshot otherwise
+            record = await run_in(io_executor, sessions.get_record, session_id)
+            if record and record.get('owner') and not sessions.is_owner(record):
+                forwarded = await forward_to_owner(record)
+                if forwarded is not None:
+                    return forwarded
+
+        result = await run_in(io_executor, read_stt_transcript, session_id, data.get('since'))
+        if result is None:
+            return jsonify({'error': 'No active listener for this session'}), 404
+        return stt_response(result, session_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# PROCTORING ENDPOINTS
+# ============================================
+
+@quart_app.route('/proctoring/analyze-frame', methods=['POST'])
+async def analyze_frame():
+    """Analyze a single frame for cheating detection"""
+    try:
+        data = await request.get_json()
+        frame_data = data.get('frame', '')
+
+        if not frame_data:
+            return jsonify({'error': 'No frame data provided'}), 400
+
+        def analyze():
+            import cv2
+            import numpy as np
+            frame_bytes = base64.b64decode(frame_data.split(',')[-1])
+            frame = cv2.imdecode(np.frombuffer(frame_bytes, np.uint8), cv2.IMREAD_COLOR)
+            return cheating_detector.analyze_behavior(frame)
+
+        analysis = await run_in(cpu_executor, analyze)
+
+        session_id = data.get('session_id')
+        if session_id:
+            await run_in(io_executor, sessions.record_alerts, session_id, analysis['alerts'])
+
+        if wants_minimal(request.headers):
+            return jsonify({key: analysis[key] for key in ('face_count', 'gaze_direction', 'alerts')})
+
+        counts = await run_in(io_executor, sessions.get_proctoring, session_id) if session_id else None
+        return jsonify({
+            'success': True,
+            'analysis': analysis,
+            **({'session_counts': counts} if session_id else {})
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# REPORT GENERATION ENDPOINTS
+# ============================================
+
+@quart_app.route('/report/generate', methods=['POST'])
+async def generate_report():
+    """Generate PDF report"""
+    try:
+        data = await request.get_json()
+        report_data = data.get('report_data', {})
+
+        timestamp = int(time.time())
+        filename = f"interview_report_{timestamp}.pdf"
+        output_path = os.path.join('reports', filename)
+        os.makedirs('reports', exist_ok=True)
+
+        await run_in(report_executor, lambda: report_generator.generate_report(report_data, output_path))
+
+        return jsonify({
+            'success': True,
+            'filename': filename,
+            'download_url': f'/report/download/{filename}',
+            'timestamp': timestamp
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# QUESTION GENERATION ENDPOINTS
+# ============================================
+
+@quart_app.route('/questions/generate', methods=['POST'])
+async def generate_questions():
+    """Generate personalized questions"""
+    try:
+        data = await request.get_json()
+        user_profile = data.get('user_profile', {})
+        if not isinstance(user_profile, dict):
+            return jsonify({'error': 'user_profile must be an object'}), 400
+
+        if not user_profile.get('interests'):
+            user_profile['interests'] = ['Programming']
+        if not user_profile.get('skill_level'):
+            user_profile['skill_level'] = 'intermediate'
+        if not user_profile.get('num_questions'):
+            user_profile['num_questions'] = 5
+
+        if not question_generator.ready:
+            await run_in(io_executor, question_generator.get)
+        questions = await async_questions().generate_questions(user_profile)
+
+        if wants_minimal(request.headers):
+            return jsonify({'questions': questions, 'count': len(questions)})
+
+        return jsonify({
+            'success': True,
+            'questions': questions,
+            'count': len(questions),
+            'user_profile': user_profile
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@quart_app.route('/questions/generate-stream', methods=['POST'])
+async def generate_questions_stream():
+    """Stream personalized questions as NDJSON (same line format as the Flask endpoint)"""
+    data = await request.get_json() or {}
+    user_profile = data.get('user_profile', {})
+    if not isinstance(user_profile, dict):
+        return jsonify({'error': 'user_profile must be an object'}), 400
+    if not question_generator.ready:
+        await run_in(io_executor, question_generator.get)
+
+    async def generate():
+        count = 0
+        try:
+            async for question in async_questions().iter_questions(user_profile):
+                yield dumps({'type': 'question', 'index': count, 'question': question}) + b'\n'
+                count += 1
+            yield dumps({'type': 'done', 'count': count}) + b'\n'
+        except Exception as e:
+            yield dumps({'type': 'error', 'error': str(e), 'count': count}) + b'\n'
+
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@quart_app.route('/questions/stats', methods=['GET'])
+async def question_stats():
+    """Get question generation metrics, including the async LLM client"""
+    stats = await run_in(io_executor, question_generator.get_stats)
+    if _async_questions is not None and _async_questions.llm is not None:
+        stats['async_llm'] = _async_questions.llm.get_stats()
+    return jsonify({'success': True, 'stats': stats})
+
+@quart_app.after_serving
+async def shutdown():
+    await run_in(None, api_server.shutdown_services)
+    if _async_questions is not None and _async_questions.llm is not None:
+        await _async_questions.llm.client.close()
+    if _forward_client is not None:
+        await _forward_client.aclose()
+    for executor in (io_executor, cpu_executor, report_executor):
+        executor.shutdown(wait=False)
+
+class AsgiDispatcher:
+    """
+    Serves routes defined on the Quart app natively and everything else through the Flask app
+
+    Quart routes go through the Flask app's admission controller too, so both
+    share the same rate limits and heavy-route slots. Clients are identified by
+    the X-Session-ID header (the body is not read here) or their address.
+    """
+
+    def __init__(self, async_app, wsgi_app, admission=None):
+        self.async_app = async_app
+        self.wsgi_app = WsgiToAsgi(wsgi_app)
+        self.admission = admission
+        self._routes = async_app.url_map.bind('')
+
+    def _async_route(self, path, method):
+        """URL rule of the Quart route for a request, or None"""
+        try:
+            rule, _ = self._routes.match(path, method=method, return_rule=True)
+            return rule.rule
+        except HTTPException:
+            return None
+
+    async def _reject(self, send, route, method, retry_after):
+        metrics.REQUEST_LATENCY.observe(0.0, route=route, method=method, status=429)
+        body = json.dumps({'error': 'Too many requests', 'route': route, 'retry_after': round(retry_after, 2)})
+        await send({'type': 'http.response.start', 'status': 429,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'access-control-allow-origin', b'*'),
+                                (b'retry-after', retry_after_header(retry_after).encode())]})
+        await send({'type': 'http.response.body', 'body': body.encode()})
+
+    async def __call__(self, scope, receive, send):
+        route = self._async_route(scope['path'], scope['method']) if scope['type'] == 'http' else None
+        if scope['type'] == 'http' and route is None:
+            # Flask records its own request metrics and applies admission control
+            await self.wsgi_app(scope, receive, send)
+            return
+
+        ticket = False
+        if route is not None and self.admission is not None:
+            headers = dict(scope.get('headers') or [])
+            session_id = headers.get(b'x-session-id', b'').decode()
+            if session_id:
+                client = f'session:{session_id}'
+            else:
+                client = 'addr:' + client_address((scope.get('client') or ('',))[0],
+                                                  headers.get(b'x-forwarded-for', b'').decode())
+            ticket, retry_after = self.admission.admit(route, client, headers.get(b'x-priority', b'').decode())
+            if ticket is None:
+                await self._reject(send, route, scope['method'], retry_after)
+                return
+        try:
+            await self._serve_async(scope, receive, send, route)
+        finally:
+            if self.admission is not None:
+                self.admission.release(ticket)
+
+    async def _serve_async(self, scope, receive, send, route):
+        if route is None or not metrics.ENABLED:
+            await self.async_app(scope, receive, send)
+            return
+
+        status = {'code': 500}
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        started = time.perf_counter()
+        metrics.REQUESTS_IN_FLIGHT.inc(route=route)
+        try:
+            await self.async_app(scope, receive, send_with_status)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec(route=route)
+            metrics.REQUEST_LATENCY.observe(time.perf_counter() - started, route=route,
+                                            method=scope['method'], status=status['code'])
+
+app = AsgiDispatcher(quart_app, api_server.app, api_server.admission)
@@ -0,0 +1,215 @@
+"""
+EduNerve AI - Async Question Generation
+Event-loop version of the OpenAI path of PersonalizedQuestionGenerator, for the ASGI server
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List
+from json_stream_parser import IncrementalObjectParser
+from metrics import stage_timer
+from question_similarity import QuestionSetFilter
+
+logger = logging.getLogger(__name__)
+
+class AsyncQuestionGenerator:
+    """
+    Runs the LLM requests of a PersonalizedQuestionGenerator on the event loop.
+
+    Prompts, parsing, the cache, the pool, the question bank and duplicate
+    filtering are all shared with the wrapped generator; only the network
+    calls differ, so a waiting request costs a coroutine instead of a thread.
+    """
+
+    def __init__(self, generator, llm):
+        """
+        Args:
+            generator (PersonalizedQuestionGenerator): Shared generator state
+            llm (AsyncLLMClient): Async OpenAI client, or None to always use templates
+        """
+        self.generator = generator
+        self.llm = llm
+
+    def _llm_ready(self):
+        return self.llm is not None and self.llm.available()
+
+    async def _request_questions(self, interest: str, skill_level: str, num_questions: int, stop_at: float,
+                                 avoid: List[str] = None) -> List[Dict]:
+        """Async version of PersonalizedQuestionGenerator._request_questions"""
+        generator = self.generator
+        stream = await self.llm.create_completion(
+            deadline=stop_at, **generator._completion_request(interest, skill_level, num_questions, avoid)
+        )
+
+        parser = IncrementalObjectParser()
+        questions = []
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    questions.extend(generator._parse_questions(parser, chunk.choices[0].delta.content,
+                                                                interest, skill_level))
+                if len(questions) >= num_questions or time.monotonic() > stop_at:
+                    break
+        except Exception:
+            self.llm.record_failure()
+            if not questions:
+                raise
+        finally:
+            if hasattr(stream, 'close'):
+                await stream.close()
+
+        if parser.incomplete or parser.malformed:
+            generator.stats['llm_salvaged'] += 1
+        return questions[:num_questions]
+
+    async def _generate_for_interest(self, interest: str, skill_level: str, num_questions: int,
+                                     stop_at: float) -> List[Dict]:
+        """Async version of PersonalizedQuestionGenerator._generate_for_interest"""
+        if time.monotonic() >= stop_at:
+            return []
+        questions = []
+
+        for attempt in range(1 + self.generator.llm_topups):
+            if time.monotonic() >= stop_at:
+                break
+            if attempt:
+                self.generator.stats['llm_topups'] += 1
+            questions.extend(await self._request_questions(
+                interest, skill_level, num_questions - len(questions), stop_at,
+                avoid=[q['text'] for q in questions]
+            ))
+            if len(questions) >= num_questions:
+                break
+
+        if not questions:
+            raise ValueError(f'No valid questions in OpenAI response for {interest}')
+        return questions[:num_questions]
+
+    def _start_parts(self, interests: List[str], skill_level: str, num_questions: int, deadline: float):
+        """One task per interest; returns {task: (interest, count)}"""
+        stop_at = time.monotonic() + 0.9 * deadline
+        return {
+            asyncio.ensure_future(self._generate_for_interest(interest, skill_level, count, stop_at)):
+                (interest, count)
+            for interest, count in zip(interests, self.generator._split_counts(interests, num_questions)) if count
+        }
+
+    def _finish_part(self, interest: str, count: int, task, skill_level: str) -> List[Dict]:
+        """Result of one interest's task, topped up from templates if it failed or timed out"""
+        part = []
+        if task.done() and not task.cancelled() and task.exception() is None:
+            part = task.result()
+        elif task.done() and not task.cancelled():
+            logger.warning("Error generating %s questions with OpenAI: %s", interest, task.exception())
+        else:
+            task.cancel()
+            logger.warning("OpenAI timed out for %s, using templates", interest)
+
+        if len(part) < count:
+            part.extend(self.generator.generate_fallback([interest], skill_level, count - len(part)))
+        return part
+
+    async def generate_with_openai(self, interests: List[str], skill_level: str, num_questions: int = 5,
+                                   deadline: float = None) -> List[Dict]:
+        """Async version of PersonalizedQuestionGenerator.generate_with_openai"""
+        if not self._llm_ready():
+            return self.generator.generate_fallback(interests, skill_level, num_questions)
+
+        deadline = deadline or self.generator.llm_deadline
+        parts = self._start_parts(interests, skill_level, num_questions, deadline)
+        if parts:
+            with stage_timer('questions', 'openai_wait'):
+                await asyncio.wait(parts, timeout=deadline)
+
+        questions = []
+        for task, (interest, count) in parts.items():
+            questions.extend(self._finish_part(interest, count, task, skill_level))
+        return questions[:num_questions]
+
+    async def generate_questions(self, user_profile: Dict) -> List[Dict]:
+        """Async version of PersonalizedQuestionGenerator.generate_questions"""
+        generator = self.generator
+        interests, skill_level, num_questions = generator._validate_profile(user_profile)
+        generator.stats['requests'] += 1
+
+        with stage_timer('questions', 'generate'):
+            if generator.pool:
+                questions = generator.generate_from_pool(interests, skill_level, num_questions,
+                                                         user_profile.get('session_id'))
+            elif self._llm_ready():
+                cache_key = None
+                questions = None
+                if generator.cache:
+                    cache_key = generator.cache.make_key(interests, skill_level, num_questions)
+                    questions = generator.cache.get(cache_key)
+                    if questions:
+                        generator.stats['cache_hits'] += 1
+                if not questions:
+                    questions = await self.generate_with_openai(interests, skill_level, num_questions)
+                    generator._record_generated(questions, cache_key)
+            else:
+                generator.stats['fallback'] += 1
+                questions = generator.generate_fallback(interests, skill_level, num_questions)
+
+        with stage_timer('questions', 'dedupe'):
+            return generator.remove_near_duplicates(questions, interests, skill_level, num_questions,
+                                                    user_profile.get('candidate_id'))
+
+    async def iter_questions(self, user_profile: Dict):
+        """Async version of PersonalizedQuestionGenerator.iter_questions"""
+        generator = self.generator
+        if generator.pool or not self._llm_ready():
+            for question in generator.iter_questions(user_profile):
+                yield question
+            return
+
+        interests, skill_level, num_questions = generator._validate_profile(user_profile)
+        generator.stats['requests'] += 1
+        question_set = QuestionSetFilter(generator.similarity_threshold, generator.history,
+                                         user_profile.get('candidate_id'))
+
+        def emit(questions):
+            return [q for q in questions if len(question_set.kept) < num_questions and question_set.accept(q)]
+
+        cached = None
+        cache_key = None
+        if generator.cache:
+            cache_key = generator.cache.make_key(interests, skill_level, num_questions)
+            cached = generator.cache.get(cache_key)
+        if cached:
+            generator.stats['cache_hits'] += 1
+            for question in emit(cached):
+                yield question
+        else:
+            seed = generator.generate_fallback(interests[:1], skill_level, 1)
+            generated = list(seed)
+            for question in emit(seed):
+                yield question
+
+            rotated = interests[1:] + interests[:1]
+            remaining = num_questions - len(question_set.kept)
+            deadline = generator.llm_deadline
+            pending = self._start_parts(rotated, skill_level, remaining, deadline) if remaining else {}
+            stop_at = time.monotonic() + deadline
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=max(0.0, stop_at - time.monotonic()),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    interest, count = pending.pop(task)
+                    part = self._finish_part(interest, count, task, skill_level)
+                    generated.extend(part)
+                    for question in emit(part):
+                        yield question
+            for task, (interest, count) in pending.items():
+                part = self._finish_part(interest, count, task, skill_level)
+                generated.extend(part)
+                for question in emit(part):
+                    yield question
+
+            generator._record_generated(generated[:num_questions], cache_key, seeded=len(seed))
+
+        for question in generator._complete_set(question_set, interests, skill_level, num_questions):
+            yield question
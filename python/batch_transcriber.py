@@ -0,0 +1,348 @@
+"""
+EduNerve AI - Batch Transcription for Recorded Interviews
+Decodes, VAD-segments and transcribes audio files across a process pool
+
+Usage:
+    python batch_transcriber.py recordings/ --output transcripts.jsonl --workers 4
+    python batch_transcriber.py q1.wav q2.wav --backend whisper
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import speech_recognition as sr
+from stt_backends import get_backend
+from voice_activity import VoiceActivityDetector
+
+try:
+    import fcntl
+except ImportError:     # Windows: no advisory locks, one process per job is up to the caller
+    fcntl = None
+
+AUDIO_EXTENSIONS = ('.wav', '.aiff', '.aif', '.flac')
+
+# One backend per worker process, created on first use
+_process_backend = None
+
+def _pool_context():
+    """
+    Start method for transcription processes
+
+    The API server runs jobs from a multithreaded process, where fork can copy
+    locks held by other threads; forkserver (or spawn where it is unavailable)
+    starts workers from a clean process instead.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+class JobAlreadyRunning(RuntimeError):
+    """Another process holds the lock on the job's output"""
+
+def _lock_output(out):
+    """Hold an exclusive lock on an open output file until it is closed"""
+    if fcntl is None:
+        return
+    try:
+        fcntl.flock(out.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise JobAlreadyRunning(f'{out.name} is being written by another running job') from None
+
+def find_audio_files(directory):
+    """List supported audio files under a directory, sorted by name"""
+    paths = []
+    for ext in AUDIO_EXTENSIONS:
+        paths.extend(glob.glob(os.path.join(directory, '**', f'*{ext}'), recursive=True))
+    return sorted(paths)
+
+def decode_audio(path):
+    """
+    Decode an audio file to mono 16-bit PCM
+
+    Returns:
+        tuple: (pcm bytes, sample rate)
+    """
+    with sr.AudioFile(path) as source:
+        audio = sr.Recognizer().record(source)
+    return audio.get_raw_data(convert_width=2), audio.sample_rate
+
+def align_to_questions(segments, questions, duration):
+    """
+    Group transcript segments by the question being answered
+
+    Args:
+        segments (list): Recognized segments with 'start', 'end', 'text'
+        questions (list): Dicts with 'question_id', 'start' and optional 'end' in seconds;
+            None treats the whole file as a single answer
+        duration (float): File length in seconds
+
+    Returns:
+        list: One dict per question with its 'transcript' and 'segments'
+    """
+    if not questions:
+        questions = [{'question_id': None, 'start': 0, 'end': duration}]
+
+    ordered = sorted(questions, key=lambda q: q.get('start', 0))
+    answers = []
+    for i, question in enumerate(ordered):
+        start = question.get('start', 0)
+        end = question.get('end')
+        if end is None:
+            end = ordered[i + 1].get('start', duration) if i + 1 < len(ordered) else duration
+
+        # A segment belongs to the question whose window contains its midpoint
+        owned = [s for s in segments if start <= (s['start'] + s['end']) / 2 < end]
+        answers.append({
+            'question_id': question.get('question_id'),
+            'start': start,
+            'end': end,
+            'transcript': ' '.join(s['text'] for s in owned if s['text']),
+            'segments': owned
+        })
+    return answers
+
+def transcribe_file(path, backend_name=None, questions=None, key=None):
+    """
+    Transcribe one recording (runs inside a worker process)
+
+    Args:
+        path (str): Audio file
+        backend_name (str): STT backend, defaults to STT_BACKEND
+        questions (list): Optional question timeline for align_to_questions
+        key (str): Identifier written to the output record, defaults to the path
+
+    Returns:
+        dict: Result record for the JSONL output
+    """
+    global _process_backend
+    if _process_backend is None or (backend_name and _process_backend.name != backend_name):
+        _process_backend = get_backend(backend_name)
+
+    started = time.perf_counter()
+    pcm, sample_rate = decode_audio(path)
+    duration = len(pcm) / (2 * sample_rate)
+
+    segments = []
+    for boundary in VoiceActivityDetector(sample_rate=sample_rate).detect_segments(pcm):
+        audio = sr.AudioData(pcm[boundary['start_sample'] * 2:boundary['end_sample'] * 2], sample_rate, 2)
+        try:
+            text, confidence = _process_backend.recognize(audio)
+        except sr.UnknownValueError:
+            text, confidence = '', 0.0
+        segments.append({
+            'start': boundary['start'],
+            'end': boundary['end'],
+            'text': text,
+            'confidence': confidence
+        })
+
+    return {
+        'file': key or path,
+        'duration': round(duration, 3),
+        'backend': _process_backend.name,
+        'questions': align_to_questions(segments, questions or [{
+            'question_id': os.path.splitext(os.path.basename(key or path))[0],
+            'start': 0,
+            'end': duration
+        }], duration),
+        'processing_seconds': round(time.perf_counter() - started, 3)
+    }
+
+class BatchTranscriptionJob:
+    """
+    Transcribe a set of files into a JSONL file, one record per file.
+
+    Records are appended as soon as each file finishes, and files already
+    present in the output are skipped, so an interrupted job resumes where
+    it stopped when run again with the same output path.
+    """
+
+    def __init__(self, files, output_path, backend_name=None, workers=None, questions=None,
+                 root=None, job_id=None):
+        """
+        Args:
+            files (list): Audio file paths
+            output_path (str): JSONL file to append results to
+            backend_name (str): STT backend for the worker processes
+            workers (int): Process pool size, defaults to the CPU count
+            questions (dict): Optional file key -> question timeline
+            root (str): Directory that file keys are made relative to
+            job_id (str): Identifier reported in progress
+        """
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.files = files
+        self.output_path = output_path
+        self.backend_name = backend_name
+        self.workers = workers or os.cpu_count() or 1
+        self.questions = questions or {}
+        self.root = root
+        self._lock = threading.Lock()
+        self.progress = {
+            'job_id': self.job_id,
+            'status': 'pending',
+            'total': len(files),
+            'completed': 0,
+            'skipped': 0,
+            'failed': 0,
+            'audio_seconds': 0.0,
+            'errors': [],
+            'started_at': None,
+            'finished_at': None
+        }
+
+    def key_for(self, path):
+        return os.path.relpath(path, self.root) if self.root else os.path.basename(path)
+
+    def completed_keys(self):
+        """Keys of files already in the output (for resuming)"""
+        done = set()
+        if not os.path.exists(self.output_path):
+            return done
+        with open(self.output_path) as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)['file'])
+                except (ValueError, KeyError):
+                    continue   # ignore a line truncated by an earlier crash
+        return done
+
+    def get_progress(self):
+        with self._lock:
+            progress = dict(self.progress, errors=list(self.progress['errors']))
+        done = progress['completed'] + progress['skipped'] + progress['failed']
+        progress['percent'] = round(100 * done / progress['total'], 1) if progress['total'] else 100.0
+        return progress
+
+    def _update(self, **changes):
+        with self._lock:
+            for field, value in changes.items():
+                if field in ('completed', 'skipped', 'failed', 'audio_seconds'):
+                    self.progress[field] += value
+                elif field == 'error':
+                    self.progress['errors'].append(value)
+                else:
+                    self.progress[field] = value
+
+    def run(self, on_progress=None):
+        """
+        Transcribe all pending files
+
+        Args:
+            on_progress (function): Called with get_progress() after every file
+
+        Returns:
+            dict: Final progress
+        """
+        self._update(status='running', started_at=time.time())
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+            with open(self.output_path, 'a') as out:
+                # Another process appending the same files would duplicate or interleave records
+                _lock_output(out)
+                done = self.completed_keys()
+                pending = []
+                for path in self.files:
+                    key = self.key_for(path)
+                    if key in done:
+                        self._update(skipped=1)
+                    else:
+                        pending.append((path, key))
+                self._transcribe(pending, out, on_progress)
+        except Exception as e:
+            # A job stuck in 'running' would block its job_id forever
+            self._update(status='failed', finished_at=time.time(), error={'file': None, 'error': str(e)})
+            raise
+
+        self._update(status='completed', finished_at=time.time())
+        return self.get_progress()
+
+    def _transcribe(self, pending, out, on_progress):
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context()) as pool:
+            futures = {
+                pool.submit(transcribe_file, path, self.backend_name, self.questions.get(key), key): key
+                for path, key in pending
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    record = future.result()
+                    out.write(json.dumps(record) + '\n')
+                    out.flush()
+                    self._update(completed=1, audio_seconds=record['duration'])
+                except Exception as e:
+                    self._update(failed=1, error={'file': key, 'error': str(e)})
+
+                if on_progress:
+                    on_progress(self.get_progress())
+
+    def start(self, on_finish=None):
+        """
+        Run the job in a background thread
+
+        Args:
+            on_finish (function): Called with the final progress, whether the job completed or failed
+        """
+        def run():
+            try:
+                self.run()
+            finally:
+                if on_finish:
+                    on_finish(self.get_progress())
+
+        thread = threading.Thread(target=run, name=f"batch-stt-{self.job_id}", daemon=True)
+        thread.start()
+        return thread
+
+def read_results(output_path):
+    """Load all records from a job's JSONL output"""
+    results = []
+    if os.path.exists(output_path):
+        with open(output_path) as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except ValueError:
+                    continue
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch-transcribe recorded interview audio')
+    parser.add_argument('inputs', nargs='+', help='Audio files or directories')
+    parser.add_argument('--output', default='transcripts.jsonl', help='JSONL output (resumable)')
+    parser.add_argument('--backend', default=None, help='google, whisper or fake (default: STT_BACKEND)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--questions', default=None,
+                        help='JSON file mapping file names to [{question_id, start, end}, ...]')
+    args = parser.parse_args()
+
+    files = []
+    root = None
+    for item in args.inputs:
+        if os.path.isdir(item):
+            root = root or item
+            files.extend(find_audio_files(item))
+        else:
+            files.append(item)
+
+    questions = None
+    if args.questions:
+        with open(args.questions) as f:
+            questions = json.load(f)
+
+    job = BatchTranscriptionJob(files, args.output, backend_name=args.backend, workers=args.workers,
+                                questions=questions, root=root)
+
+    def report(progress):
+        print(f"[{progress['percent']:5.1f}%] {progress['completed']} done, "
+              f"{progress['skipped']} skipped, {progress['failed']} failed")
+
+    result = job.run(on_progress=report)
+    print(f"✅ Transcribed {result['completed']} files ({result['audio_seconds']:.1f}s of audio) -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import cv2
 import mediapipe as mp
 import numpy as np
 from datetime import datetime
+from metrics import stage_timer
 
 class CheatingDetector:
     def __init__(self):
@@ -146,9 +147,12 @@ class CheatingDetector:
         Returns:
             dict: Analysis results with alerts
         """
-        face_count = self.detect_faces(frame)
-        gaze = self.detect_gaze_direction(frame)
-        head_pose = self.detect_head_pose(frame)
+        with stage_timer('proctoring', 'face_detection'):
+            face_count = self.detect_faces(frame)
+        with stage_timer('proctoring', 'gaze'):
+            gaze = self.detect_gaze_direction(frame)
+        with stage_timer('proctoring', 'head_pose'):
+            head_pose = self.detect_head_pose(frame)
         
         analysis = {
             'timestamp': datetime.now().isoformat(),
@@ -0,0 +1,50 @@
+"""
+EduNerve AI - Gunicorn Configuration
+Worker and thread counts derived from the environment and CPU count
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Environment:
+    PYTHON_API_PORT (5001), FLASK_HOST (0.0.0.0)
+    WEB_CONCURRENCY: worker processes (default: one per core, since frame
+        analysis and report rendering are CPU-bound)
+    GUNICORN_THREADS: threads per worker for I/O-bound requests such as
+        OpenAI calls (default 4)
+    GUNICORN_TIMEOUT (120), GUNICORN_GRACEFUL_TIMEOUT (30), GUNICORN_MAX_REQUESTS (0 = never recycle)
+    SESSION_STORE: use redis with more than one worker, so every worker sees
+        every STT session, adaptive interview and batch job (the default
+        memory store is per worker)
+    WORKER_FORWARDING (auto), WORKER_FORWARD_HOST (127.0.0.1): each worker
+        serves the app on a private port too, so requests for an STT session,
+        adaptive interview or batch job can be forwarded to the worker holding it
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('PYTHON_API_PORT', 5001)}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Load the app (and service modules) once in the master; workers share it copy-on-write
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+def post_fork(server, worker):
+    from wsgi import init_worker
+    init_worker()
+
+def worker_exit(server, worker):
+    # Runs after the worker stopped accepting and finished in-flight requests
+    from wsgi import shutdown_worker
+    shutdown_worker(graceful_timeout)
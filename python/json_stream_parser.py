@@ -0,0 +1,109 @@
+"""
+EduNerve AI - Incremental JSON Object Parser
+Extracts complete JSON objects from streamed, fenced or truncated LLM output
+"""
+
+import json
+import re
+
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+class IncrementalObjectParser:
+    """
+    Pulls every complete top-level JSON object out of a text stream.
+
+    Text outside objects (prose, ``` fences, the surrounding array brackets,
+    commas) is skipped, so a response cut off mid-object still yields all the
+    objects before the cut. Each character is scanned once across feeds.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0          # next character to scan
+        self._start = None     # start of the object being scanned
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.malformed = 0     # complete objects that could not be decoded
+
+    def feed(self, chunk):
+        """
+        Add text and return the objects it completed
+
+        Args:
+            chunk (str): Next piece of the response
+
+        Returns:
+            list: Decoded dicts, in order
+        """
+        self._buffer += chunk
+        objects = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._start is not None:
+                    self._in_string = True
+            elif ch == '{':
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif ch == '}' and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    decoded = self._decode(buffer[self._start:i + 1])
+                    if decoded is not None:
+                        objects.append(decoded)
+                    self._start = None
+            i += 1
+
+        # Drop consumed text so the buffer only holds the open object
+        if self._start is None:
+            self._buffer, self._pos = '', 0
+        else:
+            self._buffer = buffer[self._start:]
+            self._pos = i - self._start
+            self._start = 0
+        return objects
+
+    def _decode(self, text):
+        for candidate in (text, _TRAILING_COMMA.sub(r'\1', text)):
+            try:
+                value = json.loads(candidate)
+                return value if isinstance(value, dict) else None
+            except ValueError:
+                continue
+        self.malformed += 1
+        return None
+
+    @property
+    def incomplete(self):
+        """True if the stream ended inside an object (truncated output)"""
+        return self._start is not None
+
+def extract_objects(text):
+    """Decode every complete JSON object in a full response"""
+    return IncrementalObjectParser().feed(text)
+
+# Example usage
+if __name__ == "__main__":
+    truncated = '''Here are your questions:
+```json
+[
+  {"text": "What is a closure?", "category": "Programming", "difficulty": "Intermediate"},
+  {"text": "Explain the {event} loop.", "category": "Programming", "difficulty": "Advanced",},
+  {"text": "What is memoiza'''
+
+    parser = IncrementalObjectParser()
+    for i in range(0, len(truncated), 16):
+        for obj in parser.feed(truncated[i:i + 16]):
+            print("Parsed:", obj)
+    print("Truncated:", parser.incomplete)
@@ -0,0 +1,160 @@
+"""
+EduNerve AI - Lazy Service Registry
+Imports and constructs heavy services on first use, with optional background warmup
+"""
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class LazyService:
+    """
+    Stand-in for a service object that is built the first time it is used.
+
+    Attribute access is forwarded to the real object, so module-level names
+    like `report_generator` keep working while cv2, mediapipe, matplotlib and
+    friends are only imported when an endpoint actually needs them.
+    """
+
+    def __init__(self, name, module, attr, *args, **kwargs):
+        """
+        Args:
+            name (str): Service name used in status and profiling output
+            module (str): Module to import
+            attr (str): Class or factory function in that module
+            args, kwargs: Passed to the class or factory
+        """
+        self._name = name
+        self._module = module
+        self._attr = attr
+        self._args = args
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._instance = None
+        self._error = None
+        self._timings = {}
+
+    def get(self):
+        """Build the service if needed and return it"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                try:
+                    modules_before = len(sys.modules)
+                    started = time.perf_counter()
+                    factory = getattr(importlib.import_module(self._module), self._attr)
+                    imported = time.perf_counter()
+                    self._instance = factory(*self._args, **self._kwargs)
+                    self._timings = {
+                        'import_ms': round((imported - started) * 1000, 1),
+                        'init_ms': round((time.perf_counter() - imported) * 1000, 1),
+                        'modules_loaded': len(sys.modules) - modules_before
+                    }
+                    self._error = None
+                    if os.getenv('PROFILE_STARTUP', 'false').lower() == 'true':
+                        logger.info("%s: import %sms (%s modules), init %sms", self._name,
+                                    self._timings['import_ms'], self._timings['modules_loaded'],
+                                    self._timings['init_ms'], extra={'service': self._name, **self._timings})
+                except Exception as e:
+                    self._error = str(e)
+                    raise
+            return self._instance
+
+    def import_module(self):
+        """Import the service's module without constructing it (safe before fork)"""
+        importlib.import_module(self._module)
+
+    @property
+    def ready(self):
+        return self._instance is not None
+
+    def status(self):
+        return {'ready': self.ready, **self._timings, **({'error': self._error} if self._error else {})}
+
+    def __getattr__(self, attr):
+        # Only called for attributes LazyService itself lacks
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+class ServiceRegistry:
+    """Named lazy services plus startup warmup"""
+
+    def __init__(self):
+        self._services = {}
+        self._warmup_thread = None
+
+    def register(self, name, module, attr, *args, **kwargs):
+        """Declare a service; returns its LazyService stand-in"""
+        service = LazyService(name, module, attr, *args, **kwargs)
+        self._services[name] = service
+        return service
+
+    def warmup(self, names=None, background=True):
+        """
+        Build services ahead of the first request
+
+        Args:
+            names (list): Services to build, in order (default: all)
+            background (bool): Build on a daemon thread so startup is not delayed
+        """
+        names = [n for n in (names or self._services) if n in self._services]
+
+        def run():
+            for name in names:
+                try:
+                    self._services[name].get()
+                except Exception as e:
+                    logger.warning("Warmup of %s failed: %s", name, e)
+
+        if not background:
+            run()
+            return None
+        self._warmup_thread = threading.Thread(target=run, name='service-warmup', daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
+
+    def warmup_from_env(self):
+        """
+        Start warmup as configured by SERVICE_WARMUP
+
+        'all' warms every service, a comma-separated list warms those, and
+        'none' (default) leaves every service to be built on first use.
+        """
+        setting = os.getenv('SERVICE_WARMUP', 'none').strip().lower()
+        if setting in ('', 'none', 'false'):
+            return None
+        names = None if setting in ('all', 'true') else [n.strip() for n in setting.split(',')]
+        return self.warmup(names)
+
+    def preload_modules(self, names=None):
+        """
+        Import service modules without constructing anything
+
+        Used by a preforking server before it forks: the imported code and any
+        module-level data are shared copy-on-write by every worker, while
+        threads, sockets and model sessions are still created per worker.
+        """
+        for name in names or self._services:
+            try:
+                started = time.perf_counter()
+                self._services[name].import_module()
+                if os.getenv('PROFILE_STARTUP', 'false').lower() == 'true':
+                    logger.info("preloaded %s in %.1fms", name, (time.perf_counter() - started) * 1000)
+            except Exception as e:
+                logger.warning("Preload of %s failed: %s", name, e)
+
+    def get_ready(self, name):
+        """The built service, or None if it was never used (so shutdown does not build it)"""
+        service = self._services.get(name)
+        return service.get() if service is not None and service.ready else None
+
+    def status(self):
+        return {name: service.status() for name, service in self._services.items()}
@@ -0,0 +1,437 @@
+"""
+EduNerve AI - Resilient LLM Client
+Connection pooling, deadlines, jittered retries, a concurrency limit and a circuit breaker around OpenAI
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+class LLMUnavailableError(Exception):
+    """The call was not attempted: the circuit is open or no slot freed up before the deadline"""
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    are rejected immediately. Once `reset_timeout` seconds pass, a single probe
+    call is let through (half-open): success closes the circuit, failure
+    re-opens it for another `reset_timeout`.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.stats = {'opened': 0, 'probes': 0, 'rejected': 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """True if a call may be made now (claims the probe slot when half-open)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.stats['probes'] += 1
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.stats['opened'] += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def cancel_probe(self):
+        """Release the half-open probe slot when the probe call never ran"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def get_stats(self):
+        state = self.state
+        with self._lock:
+            return {**self.stats, 'state': state, 'consecutive_failures': self._failures,
+                    'failure_threshold': self.failure_threshold, 'reset_timeout': self.reset_timeout}
+
+class RetryPolicy:
+    """Retries transient errors with capped exponential backoff and full jitter"""
+
+    def __init__(self, max_attempts=3, base_delay=0.25, max_delay=2.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """Sleep before retry number `attempt` (1-based): uniform in [0, min(max, base * 2^(attempt-1))]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    @staticmethod
+    def is_retryable(error):
+        """Timeouts, connection errors, 429 and 5xx responses"""
+        status = getattr(error, 'status_code', None)
+        if status is not None:
+            return status == 429 or status >= 500
+        return isinstance(error, (TimeoutError, ConnectionError)) or \
+            type(error).__name__ in ('APIConnectionError', 'APITimeoutError')
+
+class SlotHoldingStream:
+    """
+    A streamed completion that keeps its concurrency slot until the body has
+    been read: the slot is released once the stream is exhausted, fails or is
+    closed (or garbage collected without being closed).
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._iterator = None
+        self._release = release
+
+    def _done(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._iterator is None:
+            self._iterator = iter(self._stream)
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self._done()
+            raise
+
+    def close(self):
+        try:
+            if hasattr(self._stream, 'close'):
+                self._stream.close()
+        finally:
+            self._done()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self._done()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._stream, name)
+
+class AsyncSlotHoldingStream(SlotHoldingStream):
+    """SlotHoldingStream for an async stream"""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            self._iterator = self._stream.__aiter__()
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            self._done()
+            raise
+
+    async def close(self):
+        try:
+            if hasattr(self._stream, 'close'):
+                await self._stream.close()
+        finally:
+            self._done()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+class LLMClient:
+    """Wraps an OpenAI client so every call respects a deadline, the concurrency limit and the breaker"""
+
+    def __init__(self, client, max_concurrency=16, retry=None, breaker=None):
+        """
+        Args:
+            client: OpenAI client (or anything with chat.completions.create)
+            max_concurrency (int): Upstream calls in flight at once
+            retry (RetryPolicy): Retry policy; defaults to RetryPolicy()
+            breaker (CircuitBreaker): Circuit breaker; defaults to CircuitBreaker()
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._in_flight = 0
+        self.stats = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'deadline_exceeded': 0,
+                      'rejected_open': 0, 'rejected_busy': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def available(self):
+        """False while the circuit is open, so callers can go straight to templates"""
+        return self.breaker.state != CircuitBreaker.OPEN
+
+    def create_completion(self, deadline, **kwargs):
+        """
+        Call chat.completions.create before a deadline
+
+        Args:
+            deadline (float): time.monotonic() value by which the call must finish
+            kwargs: Passed to chat.completions.create (its timeout is set from the deadline)
+
+        Returns:
+            The completion returned by the client; a stream (stream=True) is
+            wrapped in SlotHoldingStream so the slot is held until it is read or closed
+
+        Raises:
+            LLMUnavailableError: The circuit is open or the concurrency limit held until the deadline
+            Exception: The last upstream error once retries or time run out
+        """
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise LLMUnavailableError('LLM circuit breaker is open')
+
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            self._count('rejected_busy')
+            self.breaker.cancel_probe()
+            raise LLMUnavailableError('No LLM connection slot before the deadline')
+
+        with self._lock:
+            self._in_flight += 1
+        handed_off = False
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count('deadline_exceeded')
+                    self.breaker.record_failure()
+                    raise TimeoutError('LLM deadline exceeded')
+
+                started = time.monotonic()
+                try:
+                    result = self.client.chat.completions.create(timeout=remaining, **kwargs)
+                except Exception as e:
+                    delay = self.retry.delay(attempt)
+                    if attempt < self.retry.max_attempts and self.retry.is_retryable(e) and \
+                            time.monotonic() + delay < deadline:
+                        self._count('retries')
+                        time.sleep(delay)
+                        continue
+                    self._count('failed')
+                    self.breaker.record_failure()
+                    raise
+
+                self._record_latency(time.monotonic() - started)
+                self._count('succeeded')
+                self.breaker.record_success()
+                if kwargs.get('stream'):
+                    handed_off = True
+                    return SlotHoldingStream(result, self._release_slot)
+                return result
+        finally:
+            if not handed_off:
+                self._release_slot()
+
+    def _release_slot(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def record_failure(self):
+        """Report an error found after the call returned (e.g. a stream that broke off)"""
+        self._count('failed')
+        self.breaker.record_failure()
+
+    def _record_latency(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            if len(self._latencies) > 1000:
+                del self._latencies[:500]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            latencies = sorted(self._latencies)
+            stats['in_flight'] = self._in_flight
+        stats['max_concurrency'] = self.max_concurrency
+        stats['latency_ms'] = {
+            'p50': round(latencies[len(latencies) // 2] * 1000, 1),
+            'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+            'max': round(latencies[-1] * 1000, 1)
+        } if latencies else {}
+        stats['breaker'] = self.breaker.get_stats()
+        return stats
+
+class AsyncLLMClient(LLMClient):
+    """LLMClient for an AsyncOpenAI client: waits on the event loop instead of blocking threads"""
+
+    def __init__(self, client, max_concurrency=256, retry=None, breaker=None):
+        super().__init__(client, max_concurrency, retry, breaker)
+        self._slots = None      # created on first use, inside the running event loop
+
+    async def create_completion(self, deadline, **kwargs):
+        """Async version of LLMClient.create_completion"""
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise LLMUnavailableError('LLM circuit breaker is open')
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._count('rejected_busy')
+            self.breaker.cancel_probe()
+            raise LLMUnavailableError('No LLM connection slot before the deadline')
+
+        with self._lock:
+            self._in_flight += 1
+        handed_off = False
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count('deadline_exceeded')
+                    self.breaker.record_failure()
+                    raise TimeoutError('LLM deadline exceeded')
+
+                started = time.monotonic()
+                try:
+                    result = await self.client.chat.completions.create(timeout=remaining, **kwargs)
+                except Exception as e:
+                    delay = self.retry.delay(attempt)
+                    if attempt < self.retry.max_attempts and self.retry.is_retryable(e) and \
+                            time.monotonic() + delay < deadline:
+                        self._count('retries')
+                        await asyncio.sleep(delay)
+                        continue
+                    self._count('failed')
+                    self.breaker.record_failure()
+                    raise
+
+                self._record_latency(time.monotonic() - started)
+                self._count('succeeded')
+                self.breaker.record_success()
+                if kwargs.get('stream'):
+                    handed_off = True
+                    return AsyncSlotHoldingStream(result, self._release_slot)
+                return result
+        finally:
+            if not handed_off:
+                self._release_slot()
+
+def _client_options(httpx):
+    return {
+        'limits': httpx.Limits(
+            max_connections=int(os.getenv('LLM_MAX_CONNECTIONS', 20)),
+            max_keepalive_connections=int(os.getenv('LLM_MAX_KEEPALIVE', 10)),
+            keepalive_expiry=30
+        ),
+        'timeout': httpx.Timeout(30.0, connect=float(os.getenv('LLM_CONNECT_TIMEOUT', 3)))
+    }
+
+def _retry_from_env():
+    return RetryPolicy(
+        max_attempts=int(os.getenv('LLM_MAX_ATTEMPTS', 3)),
+        base_delay=float(os.getenv('LLM_RETRY_BASE_DELAY', 0.25)),
+        max_delay=float(os.getenv('LLM_RETRY_MAX_DELAY', 2))
+    )
+
+def _breaker_from_env():
+    return CircuitBreaker(
+        failure_threshold=int(os.getenv('LLM_BREAKER_THRESHOLD', 5)),
+        reset_timeout=float(os.getenv('LLM_BREAKER_RESET', 30))
+    )
+
+def create_llm_client_from_env(api_key):
+    """
+    Build an OpenAI client with explicit pool limits, wrapped in LLMClient
+
+    OPENAI_BASE_URL (e.g. the mock server), LLM_MAX_CONNECTIONS (20),
+    LLM_MAX_KEEPALIVE (10), LLM_CONNECT_TIMEOUT seconds (3), LLM_MAX_CONCURRENCY (16),
+    LLM_MAX_ATTEMPTS (3), LLM_RETRY_BASE_DELAY (0.25), LLM_RETRY_MAX_DELAY (2),
+    LLM_BREAKER_THRESHOLD (5), LLM_BREAKER_RESET (30)
+
+    Returns:
+        LLMClient
+    """
+    import httpx
+    from openai import OpenAI
+
+    client = OpenAI(
+        api_key=api_key,
+        base_url=os.getenv('OPENAI_BASE_URL') or None,
+        http_client=httpx.Client(**_client_options(httpx)),
+        max_retries=0     # retries are handled by LLMClient within the deadline
+    )
+    return LLMClient(client, max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', 16)),
+                     retry=_retry_from_env(), breaker=_breaker_from_env())
+
+def create_async_llm_client_from_env(api_key, breaker=None):
+    """
+    Build an AsyncOpenAI client wrapped in AsyncLLMClient
+
+    Same settings as create_llm_client_from_env, except the concurrency limit
+    comes from LLM_ASYNC_MAX_CONCURRENCY (256) since waiting calls hold no thread.
+
+    Args:
+        api_key (str): OpenAI API key
+        breaker (CircuitBreaker): Share a breaker with the sync client so both see upstream failures
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(
+        api_key=api_key,
+        base_url=os.getenv('OPENAI_BASE_URL') or None,
+        http_client=httpx.AsyncClient(**_client_options(httpx)),
+        max_retries=0
+    )
+    return AsyncLLMClient(client, max_concurrency=int(os.getenv('LLM_ASYNC_MAX_CONCURRENCY', 256)),
+                          retry=_retry_from_env(), breaker=breaker or _breaker_from_env())
@@ -0,0 +1,440 @@
+"""
+EduNerve AI - Interview Session Load Simulator
+Replays concurrent synthetic candidates through a full interview against the API server
+
+Each candidate fetches questions, has every question spoken, answers while
+STT listens (polling the transcript and sending proctoring frames every few
+seconds), then checks violations and generates a report. OpenAI, gTTS and
+speech recognition are replaced by local stand-ins: the mock LLM server, the
+fake TTS backend, WAV fixtures as microphone input and the fake recognizer.
+Frame analysis and report rendering run for real, since they are local work
+whose cost is what deployments have to be sized for. Several gunicorn workers
+need a shared session store (--session-redis), as in production: with each
+worker's own memory store, transcript polls reaching a worker that does not
+record the session would fail.
+
+Usage:
+    python load_simulator.py --launch --candidates 20 --ramp 30
+    python load_simulator.py --launch --server gunicorn --workers 4 --session-redis redis://localhost:6379/0 \
+        --candidates 100 --time-scale 0.25
+    python load_simulator.py --url http://localhost:5001 --server-pid 4242 --candidates 10
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from load_test_questions import INTERESTS, LEVELS, percentile
+from mock_llm_server import MockBehaviour, serve
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_AUDIO = os.path.join(HERE, 'fixtures', 'audio')
+
+def synthetic_frame(width=640, height=480, seed=0):
+    """JPEG data URL of a noisy frame with a face-like ellipse (needs OpenCV and numpy)"""
+    import cv2
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(60, 120, (height, width, 3), dtype=np.uint8)
+    cv2.ellipse(frame, (width // 2, height // 2), (90, 120), 0, 0, 360, (150, 180, 220), -1)
+    cv2.circle(frame, (width // 2 - 35, height // 2 - 25), 10, (40, 40, 40), -1)
+    cv2.circle(frame, (width // 2 + 35, height // 2 - 25), 10, (40, 40, 40), -1)
+    ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return 'data:image/jpeg;base64,' + base64.b64encode(jpeg.tobytes()).decode()
+
+def load_frame(path):
+    with open(path, 'rb') as f:
+        return 'data:image/jpeg;base64,' + base64.b64encode(f.read()).decode()
+
+class RouteStats:
+    """Latency and outcome of every request, by route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route, seconds, status):
+        with self._lock:
+            self.latencies[route].append(seconds)
+            self.statuses[route][status] += 1
+
+    def summary(self, wall):
+        routes = {}
+        with self._lock:
+            for route, values in sorted(self.latencies.items()):
+                values = sorted(values)
+                statuses = dict(self.statuses[route])
+                ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400)
+                routes[route] = {
+                    'requests': len(values),
+                    'ok': ok,
+                    'statuses': {str(k): v for k, v in statuses.items()},
+                    'throughput_rps': round(len(values) / wall, 2) if wall else 0.0,
+                    'latency_ms': {
+                        'p50': round(percentile(values, 0.50) * 1000, 1),
+                        'p90': round(percentile(values, 0.90) * 1000, 1),
+                        'p99': round(percentile(values, 0.99) * 1000, 1),
+                        'max': round(values[-1] * 1000, 1)
+                    }
+                }
+        return routes
+
+class ProcessSampler:
+    """
+    CPU, memory and thread usage of a server process and its children (gunicorn
+    workers), read from /proc once per interval; unavailable on other platforms
+    """
+
+    def __init__(self, pid, interval=1.0):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self._page = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+    @staticmethod
+    def available():
+        return os.path.exists('/proc/self/stat')
+
+    def _tree(self):
+        pids = {self.pid}
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                try:
+                    with open(f'/proc/{entry}/stat') as f:
+                        if int(f.read().rsplit(')', 1)[1].split()[1]) == self.pid:
+                            pids.add(int(entry))
+                except (OSError, IndexError, ValueError):
+                    continue
+        return pids
+
+    def _read(self):
+        cpu_ticks, rss, threads = 0, 0, 0
+        for pid in self._tree():
+            try:
+                with open(f'/proc/{pid}/stat') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+                cpu_ticks += int(fields[11]) + int(fields[12])    # utime + stime
+                threads += int(fields[17])
+                with open(f'/proc/{pid}/statm') as f:
+                    rss += int(f.read().split()[1]) * self._page
+            except (OSError, IndexError, ValueError):
+                continue
+        return time.monotonic(), cpu_ticks / self._ticks, rss, threads
+
+    def _run(self):
+        previous = self._read()
+        while not self._stop.wait(self.interval):
+            current = self._read()
+            wall = current[0] - previous[0]
+            self.samples.append({
+                'cpu_percent': round(100 * (current[1] - previous[1]) / wall, 1) if wall else 0.0,
+                'rss_mb': round(current[2] / 2 ** 20, 1),
+                'threads': current[3]
+            })
+            previous = current
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='process-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def summary(self):
+        if not self.samples:
+            return None
+        cpu = sorted(s['cpu_percent'] for s in self.samples)
+        return {
+            'cpu_percent': {'avg': round(sum(cpu) / len(cpu), 1), 'p90': percentile(cpu, 0.9), 'max': cpu[-1]},
+            'rss_mb_max': max(s['rss_mb'] for s in self.samples),
+            'threads_max': max(s['threads'] for s in self.samples),
+            'cores': os.cpu_count()
+        }
+
+class Candidate:
+    """One synthetic candidate going through a whole interview"""
+
+    def __init__(self, index, base_url, stats, frame, options, seed=0):
+        self.session_id = f'sim-{seed}-{index}'
+        self.base_url = base_url
+        self.stats = stats
+        self.frame = frame
+        self.options = options
+        self.rng = random.Random(seed * 100003 + index)
+        self.failures = 0
+
+    def call(self, route, payload, timeout=60):
+        """POST one request, recording its latency; returns the JSON body or None"""
+        request = urllib.request.Request(
+            self.base_url + route, data=json.dumps(payload).encode(), method='POST',
+            headers={'Content-Type': 'application/json', 'X-Session-ID': self.session_id,
+                     'Prefer': 'return=minimal'}
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            body, status = b'', e.code
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            body, status = b'', 'error'
+        self.stats.record(route, time.perf_counter() - started, status)
+        if status != 200:
+            self.failures += 1
+            return None
+        return json.loads(body or b'{}')
+
+    def pause(self, seconds):
+        time.sleep(seconds * self.options['time_scale'])
+
+    def answer(self, question):
+        """Listen to one spoken answer, polling the transcript and sending proctoring frames"""
+        options = self.options
+        if self.call('/stt/start-listening', {'session_id': self.session_id}) is None:
+            return ''
+
+        scale = options['time_scale']
+        started = time.monotonic()
+        end = started + self.rng.uniform(0.6, 1.4) * options['answer_seconds'] * scale
+        next_frame = started
+        next_poll = started + options['poll_interval'] * scale
+        offset = 0
+        while time.monotonic() < end:
+            now = time.monotonic()
+            if self.frame and now >= next_frame:
+                self.call('/proctoring/analyze-frame', {'session_id': self.session_id, 'frame': self.frame})
+                next_frame = now + options['frame_interval'] * scale
+            if now >= next_poll:
+                updates = self.call('/stt/get-transcript', {'session_id': self.session_id, 'since': offset})
+                if updates:
+                    offset = updates.get('offset', offset)
+                next_poll = now + options['poll_interval'] * scale
+            time.sleep(max(0.0, min(next_frame if self.frame else end, next_poll, end) - time.monotonic()))
+
+        result = self.call('/stt/stop-listening', {'session_id': self.session_id})
+        return (result or {}).get('transcript', '')
+
+    def run(self):
+        """
+        Returns:
+            dict: Interview duration and failed request count
+        """
+        started = time.monotonic()
+        profile = {
+            'interests': self.rng.sample(INTERESTS, self.rng.choice([1, 2])),
+            'skill_level': self.rng.choice(LEVELS),
+            'num_questions': self.options['questions'],
+            'session_id': self.session_id
+        }
+        body = self.call('/questions/generate', {'user_profile': profile})
+        questions = (body or {}).get('questions') or [{'text': 'Tell me about a project you are proud of.'}]
+
+        answers = []
+        for question in questions:
+            self.call('/tts/speak-question', {'question': question['text']})
+            self.pause(self.options['think_seconds'])
+            answers.append(self.answer(question))
+
+        violations = self.call('/proctoring/check-violations', {'session_id': self.session_id, 'violations': {}})
+        words = sum(len(a.split()) for a in answers)
+        self.call('/report/generate', {'report_data': {
+            'candidate_name': f'Candidate {self.session_id}',
+            'overall_score': min(100, 40 + words // 5),
+            'summary': ' '.join(answers)[:600] or 'No answers recorded.',
+            'strengths': ['Clear structure'], 'improvements': ['More depth on trade-offs'],
+            'skills': [{'name': interest, 'score': self.rng.randint(50, 95)} for interest in profile['interests']],
+            'psychometrics': [{'trait': 'Communication', 'score': self.rng.randint(50, 95)}],
+            'proctoring': {'noFaceCount': 0, 'multipleFaceCount': 0, 'lookingAwayCount': 0, 'tabChanges': 0,
+                           'passed': bool(violations and violations.get('pass'))}
+        }}, timeout=120)
+        return {'seconds': time.monotonic() - started, 'failures': self.failures}
+
+def stand_in_environment(llm_url):
+    """Environment for an API server whose external services are all local stand-ins"""
+    return {
+        'OPENAI_API_KEY': 'mock',
+        'OPENAI_BASE_URL': llm_url,
+        'TTS_BACKEND': 'fake',
+        'STT_BACKEND': 'fake',
+        'STT_AUDIO_SOURCE': FIXTURE_AUDIO,
+        'FLASK_DEBUG': 'false',
+        'LOG_LEVEL': os.getenv('LOG_LEVEL', 'WARNING')
+    }
+
+def launch_server(kind, port, workers, llm_url, session_redis=None):
+    """Start api_server (Flask dev server or gunicorn) with stand-ins; returns (process, base URL)"""
+    env = {**os.environ, **stand_in_environment(llm_url), 'PYTHON_API_PORT': str(port), 'FLASK_HOST': '127.0.0.1'}
+    if session_redis:
+        env.update(SESSION_STORE='redis', SESSION_REDIS_URL=session_redis)
+    if kind == 'gunicorn':
+        env['WEB_CONCURRENCY'] = str(workers)
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application']
+    else:
+        command = [sys.executable, 'api_server.py']
+    process = subprocess.Popen(command, cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'API server exited with code {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'{base_url}/health', timeout=2):
+                return process, base_url
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError('API server did not become healthy within 60s')
+
+def simulate(base_url, candidates, ramp, options, frame=None, server_pid=None, seed=0):
+    """
+    Run `candidates` interviews, starting them evenly over `ramp` seconds
+
+    Returns:
+        dict: Per-route throughput and latency, interview durations and server resource usage
+    """
+    stats = RouteStats()
+    sampler = ProcessSampler(server_pid).start() if server_pid and ProcessSampler.available() else None
+    results = []
+    lock = threading.Lock()
+
+    def run_candidate(index):
+        result = Candidate(index, base_url, stats, frame, options, seed).run()
+        with lock:
+            results.append(result)
+
+    started = time.perf_counter()
+    threads = []
+    for i in range(candidates):
+        thread = threading.Thread(target=run_candidate, args=(i,), name=f'candidate-{i}', daemon=True)
+        thread.start()
+        threads.append(thread)
+        if i < candidates - 1 and ramp:
+            time.sleep(ramp / candidates)
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    if sampler:
+        sampler.stop()
+
+    durations = sorted(r['seconds'] for r in results)
+    return {
+        'candidates': candidates,
+        'wall_seconds': round(wall, 1),
+        'interviews': {
+            'completed': sum(1 for r in results if not r['failures']),
+            'with_failures': sum(1 for r in results if r['failures']),
+            'seconds_p50': round(percentile(durations, 0.5), 1),
+            'seconds_p90': round(percentile(durations, 0.9), 1)
+        },
+        'routes': stats.summary(wall),
+        'resources': sampler.summary() if sampler else None,
+        'options': options
+    }
+
+def print_report(report):
+    print(f"\n{report['candidates']} candidates in {report['wall_seconds']}s: "
+          f"{report['interviews']['completed']} clean, {report['interviews']['with_failures']} with failed requests; "
+          f"interview p50 {report['interviews']['seconds_p50']}s, p90 {report['interviews']['seconds_p90']}s\n")
+    print(f"{'route':<30} {'reqs':>6} {'ok':>6} {'429':>5} {'req/s':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8}")
+    for route, row in report['routes'].items():
+        latency = row['latency_ms']
+        print(f"{route:<30} {row['requests']:>6} {row['ok']:>6} {row['statuses'].get('429', 0):>5} "
+              f"{row['throughput_rps']:>7} {latency['p50']:>8} "
+              f"{latency['p90']:>8} {latency['p99']:>8} {latency['max']:>8}")
+    resources = report['resources']
+    if resources:
+        print(f"\nServer: CPU avg {resources['cpu_percent']['avg']}% / p90 {resources['cpu_percent']['p90']}% / "
+              f"max {resources['cpu_percent']['max']}% of one core ({resources['cores']} cores), "
+              f"RSS max {resources['rss_mb_max']} MB, threads max {resources['threads_max']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate concurrent interview sessions against the API server')
+    parser.add_argument('--url', default=None, help='Running API server (with stand-ins configured)')
+    parser.add_argument('--launch', action='store_true', help='Start the API server and mock LLM with stand-ins')
+    parser.add_argument('--server', choices=['flask', 'gunicorn'], default='flask', help='Server to launch')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers when launching')
+    parser.add_argument('--session-redis', default=os.getenv('SESSION_REDIS_URL'),
+                        help='Redis URL for the shared session store (required for several gunicorn workers)')
+    parser.add_argument('--port', type=int, default=5099, help='Port for the launched server')
+    parser.add_argument('--server-pid', type=int, default=None, help='Process to sample when not launching')
+    parser.add_argument('--candidates', type=int, default=10)
+    parser.add_argument('--ramp', type=float, default=10, help='Seconds over which candidates start')
+    parser.add_argument('--questions', type=int, default=3, help='Questions per interview')
+    parser.add_argument('--answer-seconds', type=float, default=20, help='Mean answer length')
+    parser.add_argument('--think-seconds', type=float, default=3, help='Pause between question and answer')
+    parser.add_argument('--frame-interval', type=float, default=3, help='Seconds between proctoring frames')
+    parser.add_argument('--poll-interval', type=float, default=1, help='Seconds between transcript polls')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='Multiplier for all candidate pauses')
+    parser.add_argument('--frame', default=None, help='JPEG to send as proctoring frames (default: synthetic)')
+    parser.add_argument('--no-frames', action='store_true', help='Skip proctoring frames')
+    parser.add_argument('--llm-latency-ms', type=float, default=800, help='Mock LLM median latency')
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', default=None, help='Also write the report to this file')
+    args = parser.parse_args()
+
+    if args.launch and args.server == 'gunicorn' and args.workers > 1 and not args.session_redis:
+        parser.error('Several gunicorn workers need a shared session store: pass --session-redis '
+                     '(or --workers 1)')
+
+    frame = None
+    if not args.no_frames:
+        frame = load_frame(args.frame) if args.frame else synthetic_frame(seed=args.seed)
+
+    process = None
+    mock = None
+    base_url = args.url
+    server_pid = args.server_pid
+    if args.launch:
+        mock = serve(port=0, behaviour=MockBehaviour(latency_ms=args.llm_latency_ms,
+                                                     error_rate=args.llm_error_rate, seed=args.seed))
+        llm_url = f'http://127.0.0.1:{mock.server_address[1]}/v1'
+        process, base_url = launch_server(args.server, args.port, args.workers, llm_url, args.session_redis)
+        server_pid = process.pid
+        print(f"🚀 API server ({args.server}) at {base_url}, mock LLM at {llm_url}")
+    elif not base_url:
+        parser.error('Pass --url of a running server or --launch')
+
+    options = {
+        'questions': args.questions,
+        'answer_seconds': args.answer_seconds,
+        'think_seconds': args.think_seconds,
+        'frame_interval': args.frame_interval,
+        'poll_interval': args.poll_interval,
+        'time_scale': args.time_scale
+    }
+    try:
+        report = simulate(base_url, args.candidates, args.ramp, options, frame, server_pid, args.seed)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=60)
+        if mock:
+            mock.shutdown()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
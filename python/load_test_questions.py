@@ -0,0 +1,135 @@
+"""
+EduNerve AI - Question Generation Load Test
+Drives /questions/generate at a fixed request rate and reports latency, fallback and cache rates
+
+Usage:
+    python mock_llm_server.py --latency-ms 800 --error-rate 0.05 &
+    OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:8089/v1 python api_server.py &
+    python load_test_questions.py --rps 20 --duration 60
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+INTERESTS = ['Programming', 'Data Science', 'Web Development', 'AI/ML', 'Cloud']
+LEVELS = ['beginner', 'intermediate', 'advanced']
+
+def _request(url, payload=None, timeout=30):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.status, json.loads(response.read() or b'{}')
+
+def random_profile(rng, profiles=None):
+    """A request profile; with `profiles` set, drawn from that many distinct ones (controls cache reuse)"""
+    if profiles:
+        rng = random.Random(rng.randrange(profiles))
+    return {
+        'interests': rng.sample(INTERESTS, rng.choice([1, 2])),
+        'skill_level': rng.choice(LEVELS),
+        'num_questions': rng.choice([5, 8, 10])
+    }
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def run_load_test(base_url, rps, duration, concurrency=64, profiles=None, timeout=30, seed=0):
+    """
+    Send requests on an open-loop schedule (request i is due at i / rps)
+
+    Latency is measured from each request's scheduled time, so queueing in the
+    client when the server falls behind is counted instead of hidden.
+
+    Returns:
+        dict: Achieved rate, latency percentiles, error counts and server-side rates
+    """
+    rng = random.Random(seed)
+    total = int(rps * duration)
+    payloads = [{'user_profile': random_profile(rng, profiles)} for _ in range(total)]
+    latencies = []
+    outcomes = {'ok': 0, 'http_errors': 0, 'timeouts': 0, 'short_sets': 0}
+    lock = threading.Lock()
+
+    before = _request(f'{base_url}/questions/stats')[1].get('stats', {})
+
+    def send(payload, due):
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            status, body = _request(f'{base_url}/questions/generate', payload, timeout)
+            outcome = 'ok'
+            if body.get('count', 0) < payload['user_profile']['num_questions']:
+                outcome = 'short_sets'
+        except urllib.error.HTTPError:
+            outcome = 'http_errors'
+        except (urllib.error.URLError, TimeoutError):
+            outcome = 'timeouts'
+        elapsed = time.perf_counter() - due
+        with lock:
+            latencies.append(elapsed)
+            outcomes[outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, payload in enumerate(payloads):
+            pool.submit(send, payload, started + i / rps)
+    wall = time.perf_counter() - started
+
+    after = _request(f'{base_url}/questions/stats')[1].get('stats', {})
+    delta = {key: after.get(key, 0) - before.get(key, 0)
+             for key in ('requests', 'openai', 'partial', 'fallback', 'cache_hits', 'llm_salvaged', 'llm_topups')}
+    served = delta['requests'] or 1
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'target_rps': rps,
+        'achieved_rps': round(total / wall, 2) if wall else 0,
+        **outcomes,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50) * 1000, 1),
+            'p90': round(percentile(latencies, 0.90) * 1000, 1),
+            'p99': round(percentile(latencies, 0.99) * 1000, 1),
+            'max': round(latencies[-1] * 1000, 1) if latencies else 0.0
+        },
+        'server': {
+            **delta,
+            'fallback_rate': round(delta['fallback'] / served, 4),
+            'partial_rate': round(delta['partial'] / served, 4),
+            'cache_hit_rate': round(delta['cache_hits'] / served, 4)
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test /questions/generate')
+    parser.add_argument('--url', default=f"http://localhost:{os.getenv('PYTHON_API_PORT', 5001)}",
+                        help='Python API base URL')
+    parser.add_argument('--rps', type=float, default=10, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of load')
+    parser.add_argument('--concurrency', type=int, default=64, help='Client threads')
+    parser.add_argument('--profiles', type=int, default=None,
+                        help='Distinct profiles to draw from (small values exercise the cache)')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"🚀 {args.rps} req/s for {args.duration}s against {args.url}")
+    result = run_load_test(args.url, args.rps, args.duration, args.concurrency, args.profiles,
+                           args.timeout, args.seed)
+
+    print("\n📊 Results")
+    for key, value in result.items():
+        print(f"   {key}: {value}")
+
+if __name__ == "__main__":
+    main()
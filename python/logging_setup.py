@@ -0,0 +1,219 @@
+"""
+EduNerve AI - Logging Setup
+Structured, queue-based logging with correlation ids and sampling of high-frequency messages
+
+Log calls only format the record and put it on a bounded in-memory queue; a
+single listener thread writes to stdout. When the queue is full, records are
+dropped and counted rather than blocking the caller.
+
+Environment:
+    LOG_LEVEL (INFO), LOG_FORMAT (json | text), LOG_QUEUE_SIZE (10000)
+    LOG_LEVELS: per-module levels, e.g. "question_generator=DEBUG,stt_scheduler=WARNING"
+    LOG_SAMPLE_LIMIT (20) records per LOG_SAMPLE_WINDOW seconds (1) for each sample_key
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+
+request_id_var = contextvars.ContextVar('request_id', default=None)
+session_id_var = contextvars.ContextVar('session_id', default=None)
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+@contextlib.contextmanager
+def bind_context(request_id=None, session_id=None):
+    """Attach correlation ids to every record logged inside the block (on this thread or task)"""
+    tokens = []
+    if request_id is not None:
+        tokens.append((request_id_var, request_id_var.set(request_id)))
+    if session_id is not None:
+        tokens.append((session_id_var, session_id_var.set(session_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+class CorrelationFilter(logging.Filter):
+    """Copies the current request and session ids onto each record"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.session_id = getattr(record, 'session_id', None) or session_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Limits records logged with extra={'sample_key': ...} to `limit` per key per window.
+
+    The first record let through after a suppressed stretch carries the
+    number of records dropped as 'suppressed'.
+    """
+
+    def __init__(self, limit=20, window=1.0):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows = {}    # key -> [window start, count, suppressed]
+
+    def filter(self, record):
+        key = getattr(record, 'sample_key', None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                state = self._windows[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if state[1] >= self.limit:
+                state[2] += 1
+                return False
+            state[1] += 1
+            return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        extras = {k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS and v is not None}
+        if extras:
+            line += ' ' + ' '.join(f'{k}={v}' for k, v in extras.items())
+        return line
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of waiting when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener = None
+_handler = None
+_lock = threading.Lock()
+
+def configure_logging():
+    """
+    Route all logging through the queue handler (idempotent)
+
+    Returns:
+        NonBlockingQueueHandler: The installed handler ('dropped' counts lost records)
+    """
+    global _listener, _handler
+    with _lock:
+        if _handler is not None:
+            return _handler
+
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter() if os.getenv('LOG_FORMAT', 'json') == 'json' else TextFormatter())
+
+        _handler = NonBlockingQueueHandler(queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', 10000))))
+        _handler.addFilter(SamplingFilter(limit=int(os.getenv('LOG_SAMPLE_LIMIT', 20)),
+                                          window=float(os.getenv('LOG_SAMPLE_WINDOW', 1.0))))
+        _handler.addFilter(CorrelationFilter())
+
+        root = logging.getLogger()
+        root.handlers = [_handler]
+        root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        for entry in filter(None, os.getenv('LOG_LEVELS', '').split(',')):
+            name, _, level = entry.partition('=')
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+        _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_after_fork)
+        return _handler
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+def _restart_after_fork():
+    """
+    A forked worker (gunicorn preload) inherits the queue but not the listener
+    thread; give it a fresh queue, whose lock may have been held at fork, and
+    its own listener.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _handler.queue = queue.Queue(maxsize=_handler.queue.maxsize)
+    _handler.dropped = 0
+    _listener = logging.handlers.QueueListener(_handler.queue, *_listener.handlers, respect_handler_level=False)
+    _listener.start()
+
+def install_request_context(app):
+    """
+    Give every Flask request a correlation id
+
+    The id comes from the X-Request-ID header (or is generated), is echoed in
+    the response, and is attached with the request's session id (from the
+    JSON body, when present) to every record logged while handling it.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _bind_request_ids():
+        request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16]
+        body = request.get_json(silent=True) if request.is_json else None
+        session_id = None
+        if isinstance(body, dict):
+            profile = body.get('user_profile')
+            session_id = body.get('session_id') or (profile.get('session_id') if isinstance(profile, dict) else None)
+        g._log_tokens = [(request_id_var, request_id_var.set(request_id))]
+        if session_id:
+            g._log_tokens.append((session_id_var, session_id_var.set(str(session_id))))
+
+    @app.after_request
+    def _echo_request_id(response):
+        request_id = request_id_var.get()
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
+
+    @app.teardown_request
+    def _unbind_request_ids(error=None):
+        for var, token in reversed(g.pop('_log_tokens', [])):
+            var.reset(token)
+
+    return app
@@ -0,0 +1,230 @@
+"""
+EduNerve AI - Metrics
+Counters, gauges and histograms exported in the Prometheus text format
+
+Metrics are kept per process; under gunicorn each worker exports its own
+series, labelled with its pid. With METRICS_ENABLED=false every recording
+call returns immediately and stage timers are a shared no-op object.
+"""
+
+import bisect
+import os
+import threading
+import time
+
+ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + list(extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}    # label values tuple -> value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+        return lines
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Per-bucket (non-cumulative) counts, +Inf last, then sum
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [('le', bound)])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {total}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+REQUEST_LATENCY = histogram('edunerve_http_request_duration_seconds', 'HTTP request latency',
+                            ('route', 'method', 'status'))
+REQUESTS_IN_FLIGHT = gauge('edunerve_http_requests_in_flight', 'HTTP requests being handled', ('route',))
+STAGE_LATENCY = histogram('edunerve_stage_duration_seconds', 'Time spent in one stage of a component',
+                          ('component', 'stage'))
+CACHE_EVENTS = counter('edunerve_cache_events_total', 'Cache lookups by result', ('cache', 'result'))
+PROCESS_INFO = gauge('edunerve_process_info', 'Process exporting these series (one per worker)', ('pid',))
+
+class _StageTimer:
+    __slots__ = ('component', 'stage', 'started')
+
+    def __init__(self, component, stage):
+        self.component = component
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAGE_LATENCY.observe(time.perf_counter() - self.started, component=self.component, stage=self.stage)
+        return False
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP_TIMER = _NoopTimer()
+
+def stage_timer(component, stage):
+    """
+    Time a block as one stage of a component
+
+        with stage_timer('proctoring', 'face_detection'):
+            ...
+    """
+    return _StageTimer(component, stage) if ENABLED else _NOOP_TIMER
+
+def record_cache(cache, hit):
+    CACHE_EVENTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def instrument_flask(app):
+    """
+    Record latency and in-flight requests per route and serve GET /metrics
+
+    Routes are labelled by their URL rule (e.g. /report/download/<filename>),
+    so label cardinality stays bounded.
+    """
+    from flask import Response, g, request
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics_endpoint():
+        """Prometheus metrics"""
+        # Set on every scrape: a preforked worker inherits the master's pid here
+        PROCESS_INFO.clear()
+        PROCESS_INFO.set(1, pid=os.getpid())
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+    if not ENABLED:
+        return app
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_route = request.url_rule.rule if request.url_rule else 'unmatched'
+        g._metrics_started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc(route=g._metrics_route)
+
+    @app.after_request
+    def _remember_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish(error=None):
+        route = g.pop('_metrics_route', None)
+        if route is None:
+            return
+        REQUESTS_IN_FLIGHT.dec(route=route)
+        status = g.pop('_metrics_status', 500)
+        REQUEST_LATENCY.observe(time.perf_counter() - g._metrics_started,
+                                route=route, method=request.method, status=status)
+
+    return app
@@ -0,0 +1,232 @@
+"""
+EduNerve AI - Mock LLM Server
+Local stand-in for the OpenAI chat completions API, for load testing question generation
+
+Usage:
+    python mock_llm_server.py --port 8089 --latency-ms 800 --latency-sigma 0.5 --error-rate 0.02
+    OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:8089/v1 python api_server.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TOPICS = ['caching', 'concurrency', 'testing', 'indexing', 'scaling', 'error handling', 'deployment',
+          'data modeling', 'profiling', 'security', 'memory management', 'API design']
+
+class MockBehaviour:
+    """Latency, failure and malformed-output settings shared by all requests"""
+
+    def __init__(self, latency_ms=800, latency_sigma=0.5, error_rate=0.0, rate_limit_rate=0.0,
+                 malformed_rate=0.0, truncate_rate=0.0, seed=None):
+        """
+        Args:
+            latency_ms (float): Median response time
+            latency_sigma (float): Log-normal shape; 0 for fixed latency, ~1 for a heavy tail
+            error_rate (float): Fraction of requests answered with HTTP 500
+            rate_limit_rate (float): Fraction of requests answered with HTTP 429
+            malformed_rate (float): Fraction of responses with prose, fences and trailing commas
+            truncate_rate (float): Fraction of responses cut off mid-object
+            seed (int): Random seed for reproducible runs
+        """
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.truncate_rate = truncate_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'streamed': 0, 'errors': 0, 'rate_limited': 0,
+                      'malformed': 0, 'truncated': 0, 'in_flight': 0, 'max_in_flight': 0}
+
+    def roll(self):
+        with self._lock:
+            return self._random.random()
+
+    def latency(self):
+        """Seconds for one response, log-normal around the median"""
+        with self._lock:
+            factor = self._random.lognormvariate(0, self.latency_sigma) if self.latency_sigma else 1.0
+        return self.latency_ms * factor / 1000.0
+
+    def count(self, key, delta=1):
+        with self._lock:
+            self.stats[key] += delta
+            if key == 'in_flight':
+                self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+
+def make_questions(prompt, rng):
+    """Question objects for a generation prompt (count and interest are read from its text)"""
+    count = re.search(r'Generate (\d+)', prompt)
+    interest = re.search(r'Interest: (.+)', prompt)
+    level = re.search(r'Skill Level: (\w+)', prompt)
+    count = int(count.group(1)) if count else 5
+    interest = interest.group(1).strip() if interest else 'Programming'
+    level = level.group(1).capitalize() if level else 'Intermediate'
+    return [
+        {
+            'text': f"How would you approach {rng.choice(TOPICS)} in a {interest} project "
+                    f"(scenario {rng.randrange(1_000_000)})?",
+            'category': interest,
+            'difficulty': level,
+            'context': f'Mock question {i + 1} of {count}'
+        }
+        for i in range(count)
+    ]
+
+def render_content(questions, behaviour):
+    """JSON text of the questions, possibly wrapped, broken or cut off"""
+    content = json.dumps(questions, indent=2)
+    if behaviour.roll() < behaviour.malformed_rate:
+        behaviour.count('malformed')
+        content = 'Here are the questions:\n```json\n' + content.replace('}', ',}', 1) + '\n```'
+    if behaviour.roll() < behaviour.truncate_rate:
+        behaviour.count('truncated')
+        content = content[:int(len(content) * 0.7)]
+    return content
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    behaviour = MockBehaviour()
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.behaviour.stats)
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        behaviour = self.behaviour
+        behaviour.count('requests')
+        behaviour.count('in_flight')
+        try:
+            latency = behaviour.latency()
+            roll = behaviour.roll()
+            if roll < behaviour.error_rate:
+                behaviour.count('errors')
+                time.sleep(latency)
+                self._send_json(500, {'error': {'message': 'Mock server error', 'type': 'server_error'}})
+                return
+            if roll < behaviour.error_rate + behaviour.rate_limit_rate:
+                behaviour.count('rate_limited')
+                self._send_json(429, {'error': {'message': 'Mock rate limit', 'type': 'rate_limit_error'}},
+                                headers={'Retry-After': '1'})
+                return
+
+            prompt = request.get('messages', [{}])[-1].get('content', '')
+            content = render_content(make_questions(prompt, random.Random(behaviour.roll())), behaviour)
+            if request.get('stream'):
+                behaviour.count('streamed')
+                self._stream(request, content, latency)
+            else:
+                time.sleep(latency)
+                self._send_json(200, self._completion(request, content))
+        finally:
+            behaviour.count('in_flight', -1)
+
+    def _completion(self, request, content):
+        return {
+            'id': f'chatcmpl-{uuid.uuid4().hex[:24]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                         'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': len(content) // 4,
+                      'total_tokens': len(content) // 4}
+        }
+
+    def _stream(self, request, content, latency):
+        """Server-sent events: first token after a third of the latency, the rest spread evenly"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        completion_id = f'chatcmpl-{uuid.uuid4().hex[:24]}'
+        chunks = [content[i:i + 24] for i in range(0, len(content), 24)] or ['']
+        time.sleep(latency / 3)
+        delay = (2 * latency / 3) / len(chunks)
+        try:
+            for i, piece in enumerate(chunks):
+                event = {
+                    'id': completion_id,
+                    'object': 'chat.completion.chunk',
+                    'created': int(time.time()),
+                    'model': request.get('model', 'mock'),
+                    'choices': [{'index': 0, 'delta': {'content': piece},
+                                 'finish_reason': 'stop' if i == len(chunks) - 1 else None}]
+                }
+                self.wfile.write(f'data: {json.dumps(event)}\n\n'.encode())
+                self.wfile.flush()
+                time.sleep(delay)
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # client stopped reading (deadline reached)
+
+def serve(host='127.0.0.1', port=8089, behaviour=None):
+    """
+    Start the mock server in a background thread
+
+    Returns:
+        ThreadingHTTPServer: Call shutdown() to stop it
+    """
+    handler = type('ConfiguredMockLLMHandler', (MockLLMHandler,), {'behaviour': behaviour or MockBehaviour()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='mock-llm', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a mock OpenAI chat completions API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=800, help='Median response time')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Log-normal shape (0 = fixed)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of HTTP 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of HTTP 429 responses')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Fraction of fenced/invalid responses')
+    parser.add_argument('--truncate-rate', type=float, default=0.0, help='Fraction of truncated responses')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    behaviour = MockBehaviour(args.latency_ms, args.latency_sigma, args.error_rate, args.rate_limit_rate,
+                              args.malformed_rate, args.truncate_rate, args.seed)
+    server = serve(args.host, args.port, behaviour)
+    print(f"🤖 Mock LLM listening on http://{args.host}:{args.port}/v1 (stats at /stats)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+EduNerve AI - On-demand Sampling Profiler
+Samples thread stacks for a time window or for flagged requests, without a restart
+
+Output is in the collapsed-stack format ("thread;outer;inner count" per line)
+read by flamegraph.pl, speedscope and inferno. All endpoints require the
+X-Admin-Token header to match PROFILER_ADMIN_TOKEN; when that is unset the
+profiler is disabled.
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+
+class StackSampler:
+    """
+    Periodically records the stacks of selected threads.
+
+    Memory is bounded by `max_stacks` distinct stacks (further new stacks are
+    counted under "[truncated]") and `max_depth` frames per stack. Overhead is
+    bounded by stretching the sleep between samples so sampling never takes
+    more than `max_overhead` of wall time, and by a hard `max_duration`.
+    """
+
+    def __init__(self, interval=0.01, max_stacks=10000, max_depth=64, max_overhead=0.05, max_duration=120,
+                 thread_filter=None):
+        """
+        Args:
+            interval (float): Seconds between samples (at least 1ms)
+            max_stacks (int): Distinct stacks kept
+            max_depth (int): Innermost frames kept per stack
+            max_overhead (float): Fraction of wall time sampling may use
+            max_duration (float): Seconds after which sampling stops by itself
+            thread_filter (function): (thread ident, thread name) -> bool; all threads when None
+        """
+        self.interval = max(0.001, interval)
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.max_overhead = max_overhead
+        self.max_duration = max_duration
+        self.thread_filter = thread_filter
+        self.stacks = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started_at = None
+        self.stopped_at = None
+        self._lock = threading.Lock()   # the request sampler thread writes while requests read
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample_once(self, idents=None):
+        """Record one stack per selected thread (or per thread in `idents`)"""
+        started = time.perf_counter()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        keys = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (idents is not None and ident not in idents):
+                continue
+            name = names.get(ident, f'thread-{ident}')
+            if self.thread_filter and not self.thread_filter(ident, name):
+                continue
+            frames = []
+            while frame is not None and len(frames) < self.max_depth:
+                frames.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            # Group pool threads (stt-worker-3, asgi-io_12) under one root
+            root = name.rstrip('0123456789').rstrip('-_') or name
+            keys.append(';'.join([root] + frames[::-1]))
+        with self._lock:
+            for key in keys:
+                if key in self.stacks or len(self.stacks) < self.max_stacks:
+                    self.stacks[key] += 1
+                else:
+                    self.stacks['[truncated]'] += 1
+            self.samples += 1
+            elapsed = time.perf_counter() - started
+            self.sampling_seconds += elapsed
+        return elapsed
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_duration
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            elapsed = self.sample_once()
+            self._stop.wait(max(self.interval, elapsed / self.max_overhead - elapsed))
+        self.stopped_at = time.time()
+
+    def start(self, duration=None):
+        """Sample on a background thread for `duration` seconds (max_duration at most)"""
+        if duration:
+            self.max_duration = min(self.max_duration, duration)
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def collapsed(self):
+        """Aggregated stacks in collapsed format, most frequent first"""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return ''.join(f'{stack} {count}\n' for stack, count in stacks)
+
+    def summary(self):
+        wall = (self.stopped_at or time.time()) - (self.started_at or time.time())
+        with self._lock:
+            samples, distinct, sampling_seconds = self.samples, len(self.stacks), self.sampling_seconds
+        return {
+            'samples': samples,
+            'distinct_stacks': distinct,
+            'wall_seconds': round(wall, 3),
+            'overhead': round(sampling_seconds / wall, 4) if wall > 0 else 0.0,
+            'running': self.running
+        }
+
+class RequestProfiler:
+    """
+    Samples only the threads currently serving flagged requests.
+
+    One shared sampler thread runs while at least one flagged request is in
+    progress; each request gets its own aggregated stacks, kept for the last
+    `max_results` requests.
+    """
+
+    def __init__(self, interval=0.005, max_results=20, max_stacks=2000, max_depth=64):
+        self.interval = interval
+        self.max_results = max_results
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._active = {}              # thread ident -> (profile id, StackSampler)
+        self._results = OrderedDict()  # profile id -> dict
+        self._thread = None
+
+    def begin(self):
+        """Start profiling the calling thread; returns the profile id"""
+        profile_id = uuid.uuid4().hex[:12]
+        sampler = StackSampler(self.interval, self.max_stacks, self.max_depth)
+        sampler.started_at = time.time()
+        with self._lock:
+            self._active[threading.get_ident()] = (profile_id, sampler)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+                self._thread.start()
+        return profile_id
+
+    def end(self, route=None):
+        """Stop profiling the calling thread and store its result"""
+        with self._lock:
+            entry = self._active.pop(threading.get_ident(), None)
+        if entry is None:
+            return None
+        profile_id, sampler = entry
+        sampler.stopped_at = time.time()
+        with self._lock:
+            self._results[profile_id] = {'route': route, **sampler.summary(), 'collapsed': sampler.collapsed()}
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return profile_id
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    # Cleared under the lock so a concurrent begin() starts a new sampler
+                    self._thread = None
+                    return
+            started = time.perf_counter()
+            for ident, (_, sampler) in active.items():
+                sampler.sample_once(idents={ident})
+            elapsed = time.perf_counter() - started
+            time.sleep(max(self.interval, elapsed * 20))
+
+    def result(self, profile_id):
+        with self._lock:
+            return self._results.get(profile_id)
+
+    def list_results(self):
+        with self._lock:
+            return [{'profile_id': pid, **{k: v for k, v in r.items() if k != 'collapsed'}}
+                    for pid, r in self._results.items()]
+
+def install_profiler(app):
+    """
+    Add admin-gated profiling to a Flask app
+
+    Window mode: POST /admin/profiler/start {"seconds", "interval", "threads"}
+    samples every thread (or those whose name starts with one of "threads");
+    GET /admin/profiler/stop returns the collapsed stacks.
+
+    Request mode: a request sent with X-Profile: 1 and the admin token is
+    sampled while it runs; the response carries X-Profile-Id, and
+    GET /admin/profiler/requests/<id> returns its collapsed stacks.
+
+    Profiler state is per process. Under gunicorn, start, stop and result
+    requests sent to the public port may reach different workers (404). Every
+    response names the worker (X-Profile-Worker: pid), and the start response
+    includes the worker's private address when it has one (WORKER_ADDRESS, see
+    wsgi.start_forwarding_listener). Send the follow-up requests there.
+    """
+    from flask import Response, g, jsonify, request
+
+    token = os.getenv('PROFILER_ADMIN_TOKEN')
+    state = {'window': None}
+    requests_profiler = RequestProfiler(interval=float(os.getenv('PROFILER_REQUEST_INTERVAL', 0.005)))
+
+    def authorized():
+        supplied = request.headers.get('X-Admin-Token', '')
+        return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+    def collapsed_response(text, summary):
+        response = Response(text, mimetype='text/plain')
+        response.headers['X-Profile-Samples'] = str(summary['samples'])
+        response.headers['X-Profile-Overhead'] = str(summary['overhead'])
+        return response
+
+    @app.before_request
+    def _maybe_profile_request():
+        if request.headers.get('X-Profile') == '1' and authorized():
+            g._profile_id = requests_profiler.begin()
+
+    @app.after_request
+    def _profile_header(response):
+        profile_id = g.get('_profile_id')
+        if profile_id:
+            response.headers['X-Profile-Id'] = profile_id
+        if profile_id or request.path.startswith('/admin/profiler/'):
+            response.headers['X-Profile-Worker'] = str(os.getpid())
+        return response
+
+    @app.teardown_request
+    def _finish_request_profile(error=None):
+        if g.pop('_profile_id', None):
+            requests_profiler.end(request.url_rule.rule if request.url_rule else request.path)
+
+    @app.route('/admin/profiler/start', methods=['POST'])
+    def profiler_start():
+        """Start sampling all (or selected) threads for a time window"""
+        if not authorized():
+            return jsonify({'error': 'Forbidden'}), 403
+        current = state['window']
+        if current and current.running:
+            return jsonify({'error': 'Profiler already running', **current.summary()}), 409
+
+        data = request.json or {}
+        prefixes = tuple(data.get('threads') or ())
+        sampler = StackSampler(
+            interval=float(data.get('interval', 0.01)),
+            max_duration=min(float(data.get('seconds', 30)), float(os.getenv('PROFILER_MAX_SECONDS', 300))),
+            thread_filter=(lambda ident, name: name.startswith(prefixes)) if prefixes else None
+        )
+        state['window'] = sampler.start()
+        return jsonify({'success': True, 'seconds': sampler.max_duration, 'interval': sampler.interval,
+                        'worker': os.getpid(), 'worker_address': os.getenv('WORKER_ADDRESS')})
+
+    @app.route('/admin/profiler/stop', methods=['GET', 'POST'])
+    def profiler_stop():
+        """Stop window sampling (if still running) and return the collapsed stacks"""
+        if not authorized():
+            return jsonify({'error': 'Forbidden'}), 403
+        sampler = state['window']
+        if sampler is None:
+            return jsonify({'error': 'Profiler was not started in this worker', 'worker': os.getpid()}), 404
+        sampler.stop()
+        return collapsed_response(sampler.collapsed(), sampler.summary())
+
+    @app.route('/admin/profiler/status', methods=['GET'])
+    def profiler_status():
+        """Window sampler state and the stored per-request profiles"""
+        if not authorized():
+            return jsonify({'error': 'Forbidden'}), 403
+        sampler = state['window']
+        return jsonify({
+            'success': True,
+            'window': sampler.summary() if sampler else None,
+            'requests': requests_profiler.list_results()
+        })
+
+    @app.route('/admin/profiler/requests/<profile_id>', methods=['GET'])
+    def profiler_request_result(profile_id):
+        """Collapsed stacks of one profiled request"""
+        if not authorized():
+            return jsonify({'error': 'Forbidden'}), 403
+        result = requests_profiler.result(profile_id)
+        if result is None:
+            return jsonify({'error': 'Profile not found'}), 404
+        return collapsed_response(result['collapsed'], result)
+
+    return app
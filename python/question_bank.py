@@ -0,0 +1,196 @@
+"""
+EduNerve AI - Indexed Question Bank
+Question store with ids, tags and difficulty, loaded once per process
+"""
+
+import bisect
+import json
+import logging
+import os
+import random
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'question_bank.json')
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+def normalize_text(text):
+    """Canonical form used for exact de-duplication"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', text.lower())).strip()
+
+class QuestionBank:
+    """
+    Questions indexed by id, normalized text and (tag, difficulty).
+
+    Every question is listed under each of its tags, so sampling for a set of
+    interests and levels only touches the matching buckets.
+    """
+
+    def __init__(self, questions=None):
+        """
+        Args:
+            questions (list): Dicts with 'id', 'text', 'category', 'difficulty' and 'tags'
+        """
+        self._lock = threading.Lock()
+        self.questions = {}          # id -> question
+        self._by_text = {}           # normalized text -> id
+        self._index = {}             # (tag, difficulty) -> list of ids
+        self._tags = {}              # tag -> count
+        self._tag_categories = {}    # tag -> {category: count}
+        self.duplicates_skipped = 0
+        for question in questions or []:
+            self.add(question)
+
+    @classmethod
+    def load(cls, path=DEFAULT_BANK_PATH):
+        """Build a bank from a JSON file ({"questions": [...]})"""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data.get('questions', []))
+
+    def add(self, question):
+        """
+        Add a question unless an identical one exists
+
+        Returns:
+            str: Id of the stored question (the existing one for duplicates)
+        """
+        key = normalize_text(question['text'])
+        with self._lock:
+            if key in self._by_text:
+                self.duplicates_skipped += 1
+                return self._by_text[key]
+
+            question = dict(question)
+            question.setdefault('id', f'q-{len(self.questions) + 1:06d}')
+            question['difficulty'] = question.get('difficulty', 'intermediate').lower()
+            tags = {t.lower() for t in question.get('tags', [])}
+            if question.get('category'):
+                tags.add(question['category'].lower())
+            question['tags'] = sorted(tags)
+
+            self.questions[question['id']] = question
+            self._by_text[key] = question['id']
+            for tag in question['tags']:
+                self._index.setdefault((tag, question['difficulty']), []).append(question['id'])
+                self._tags[tag] = self._tags.get(tag, 0) + 1
+                if question.get('category'):
+                    categories = self._tag_categories.setdefault(tag, {})
+                    categories[question['category']] = categories.get(question['category'], 0) + 1
+            return question['id']
+
+    def get(self, question_id):
+        return self.questions.get(question_id)
+
+    def contains_text(self, text):
+        return normalize_text(text) in self._by_text
+
+    def has_tag(self, tag):
+        return tag.lower() in self._tags
+
+    def tags(self):
+        """Tag -> number of questions"""
+        return dict(self._tags)
+
+    def count(self, tag, difficulty):
+        """Number of questions in one (tag, difficulty) bucket"""
+        return len(self._index.get((tag.lower(), difficulty.lower()), ()))
+
+    def tag_categories(self, tag):
+        """Categories of the questions carrying a tag, most common first"""
+        categories = self._tag_categories.get(tag.lower(), {})
+        return sorted(categories, key=categories.get, reverse=True)
+
+    def categories(self):
+        """Distinct question categories in insertion order"""
+        return list(dict.fromkeys(q['category'] for q in self.questions.values() if q.get('category')))
+
+    def sample(self, tags, difficulties, k, exclude=None):
+        """
+        Draw up to k distinct questions matching any tag at any of the difficulties
+
+        Indices are drawn from the virtual concatenation of the matching buckets
+        (random.sample over a range is O(k)) and mapped back with a binary search
+        over bucket offsets, so no candidate list is ever materialized.
+
+        Args:
+            tags (list): Tags to match (case-insensitive)
+            difficulties (list): Difficulty levels to match
+            k (int): Number of questions wanted
+            exclude (set): Question ids that must not be returned
+
+        Returns:
+            list: Question dicts (shared; copy before mutating)
+        """
+        exclude = exclude or set()
+        buckets = [self._index[key] for key in
+                   ((t.lower(), d.lower()) for t in tags for d in difficulties) if key in self._index]
+        offsets = []
+        total = 0
+        for bucket in buckets:
+            offsets.append(total)
+            total += len(bucket)
+        if total == 0 or k <= 0:
+            return []
+
+        chosen = []
+        chosen_ids = set()
+        attempts = 0
+        # Rejection sampling handles overlap between buckets and excluded ids;
+        # after a few rounds fall back to an exact filtered draw
+        while len(chosen) < k and attempts < 3:
+            attempts += 1
+            for position in random.sample(range(total), min(total, 2 * (k - len(chosen)))):
+                b = bisect.bisect_right(offsets, position) - 1
+                question_id = buckets[b][position - offsets[b]]
+                if question_id in exclude or question_id in chosen_ids:
+                    continue
+                chosen_ids.add(question_id)
+                chosen.append(self.questions[question_id])
+                if len(chosen) == k:
+                    break
+
+        if len(chosen) < k:
+            remaining = list({qid for bucket in buckets for qid in bucket} - exclude - chosen_ids)
+            for question_id in random.sample(remaining, min(len(remaining), k - len(chosen))):
+                chosen.append(self.questions[question_id])
+        return chosen
+
+    def __len__(self):
+        return len(self.questions)
+
+_default_bank = None
+_default_bank_lock = threading.Lock()
+
+def load_question_bank(path=None):
+    """
+    Get the shared question bank, loading it on first use
+
+    Args:
+        path (str): Bank file; defaults to QUESTION_BANK_PATH or data/question_bank.json
+    """
+    global _default_bank
+    with _default_bank_lock:
+        if _default_bank is None:
+            _default_bank = QuestionBank.load(path or os.getenv('QUESTION_BANK_PATH', DEFAULT_BANK_PATH))
+            logger.info("Loaded question bank: %d questions, %d tags", len(_default_bank), len(_default_bank.tags()))
+        return _default_bank
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    bank = load_question_bank()
+    print(bank.tags())
+    for q in bank.sample(['AI/ML', 'deep-learning'], ['intermediate', 'advanced'], 4):
+        print(f"[{q['id']}] {q['text']}")
+
+    # Scale check: 50k synthetic questions
+    big = QuestionBank({'text': f'Synthetic question {i}', 'category': f'Topic{i % 50}',
+                        'difficulty': DIFFICULTIES[i % 3], 'tags': [f'tag{i % 200}']} for i in range(50000))
+    started = time.perf_counter()
+    for _ in range(1000):
+        big.sample(['topic1', 'topic2', 'tag7'], ['beginner', 'advanced'], 10)
+    print(f"50k bank: {(time.perf_counter() - started):.3f}ms per sample of 10")
@@ -0,0 +1,165 @@
+"""
+EduNerve AI - Question Generation Cache
+Caches LLM-generated question sets by normalized candidate profile
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from metrics import record_cache
+
+class MemoryCacheBackend:
+    """Process-local variant storage"""
+
+    def __init__(self):
+        self._entries = {}   # key -> list of (created_at, questions)
+
+    def get_variants(self, key):
+        return list(self._entries.get(key, []))
+
+    def set_variants(self, key, variants):
+        if variants:
+            self._entries[key] = list(variants)
+        else:
+            self._entries.pop(key, None)
+
+    def count(self):
+        return len(self._entries), sum(len(v) for v in self._entries.values())
+
+class SQLiteCacheBackend:
+    """Persistent variant storage shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS question_cache ('
+            'key TEXT NOT NULL, created_at REAL NOT NULL, questions TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_question_cache_key ON question_cache (key)')
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_variants(self, key):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT created_at, questions FROM question_cache WHERE key = ? ORDER BY created_at', (key,)
+            ).fetchall()
+        return [(created_at, json.loads(questions)) for created_at, questions in rows]
+
+    def set_variants(self, key, variants):
+        with self._lock:
+            self._conn.execute('DELETE FROM question_cache WHERE key = ?', (key,))
+            self._conn.executemany(
+                'INSERT INTO question_cache (key, created_at, questions) VALUES (?, ?, ?)',
+                [(key, created_at, json.dumps(questions)) for created_at, questions in variants]
+            )
+            self._conn.commit()
+
+    def count(self):
+        with self._lock:
+            keys, variants = self._conn.execute(
+                'SELECT COUNT(DISTINCT key), COUNT(*) FROM question_cache'
+            ).fetchone()
+        return keys, variants
+
+class QuestionCache:
+    """
+    Pool of up to `variants_per_key` generated question sets per profile.
+
+    A lookup only hits once the pool for a profile is full; until then the
+    caller generates a fresh set and adds it, so candidates with identical
+    profiles still see several different interviews.
+    """
+
+    def __init__(self, variants_per_key=3, ttl=3600, backend=None):
+        """
+        Args:
+            variants_per_key (int): Question sets kept per profile
+            ttl (float): Seconds before a cached set expires
+            backend: MemoryCacheBackend (default) or SQLiteCacheBackend
+        """
+        self.variants_per_key = max(1, variants_per_key)
+        self.ttl = ttl
+        self.backend = backend or MemoryCacheBackend()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'expired': 0}
+
+    @staticmethod
+    def make_key(interests, skill_level, num_questions):
+        """Normalize a profile so equivalent requests share a cache entry"""
+        normalized = sorted({i.strip().lower() for i in interests if i and i.strip()})
+        return f"{'|'.join(normalized)}::{skill_level.strip().lower()}::{int(num_questions)}"
+
+    def _fresh(self, key):
+        now = time.time()
+        variants = self.backend.get_variants(key)
+        fresh = [v for v in variants if now - v[0] < self.ttl]
+        if len(fresh) != len(variants):
+            self._stats['expired'] += len(variants) - len(fresh)
+            self.backend.set_variants(key, fresh)
+        return fresh
+
+    def get(self, key):
+        """
+        Look up a cached question set
+
+        Returns:
+            list: A random cached variant, or None when the pool is not full yet
+        """
+        with self._lock:
+            fresh = self._fresh(key)
+            if len(fresh) >= self.variants_per_key:
+                self._stats['hits'] += 1
+                record_cache('questions', True)
+                return [dict(q) for q in random.choice(fresh)[1]]
+            self._stats['misses'] += 1
+            record_cache('questions', False)
+            return None
+
+    def put(self, key, questions):
+        """Add a generated question set, replacing the oldest when the pool is full"""
+        if not questions:
+            return
+        with self._lock:
+            fresh = self._fresh(key)
+            fresh.append((time.time(), questions))
+            self.backend.set_variants(key, fresh[-self.variants_per_key:])
+            self._stats['stores'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['keys'], stats['variants'] = self.backend.count()
+        stats['variants_per_key'] = self.variants_per_key
+        stats['ttl'] = self.ttl
+        return stats
+
+def create_cache_from_env():
+    """
+    Build the cache configured by environment variables
+
+    QUESTION_CACHE_ENABLED (default true), QUESTION_CACHE_VARIANTS (3),
+    QUESTION_CACHE_TTL seconds (3600), QUESTION_CACHE_PATH (SQLite file; in-memory when unset)
+
+    Returns:
+        QuestionCache or None when disabled
+    """
+    if os.getenv('QUESTION_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+
+    path = os.getenv('QUESTION_CACHE_PATH')
+    backend = SQLiteCacheBackend(path) if path else MemoryCacheBackend()
+    return QuestionCache(
+        variants_per_key=int(os.getenv('QUESTION_CACHE_VARIANTS', 3)),
+        ttl=float(os.getenv('QUESTION_CACHE_TTL', 3600)),
+        backend=backend
+    )
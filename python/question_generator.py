@@ -3,10 +3,23 @@ EduNerve AI - Personalized Question Generator
 Generates interview questions based on user interests and skill level
 """
 
+import contextvars
+import logging
 import os
-import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FuturesTimeout
 from typing import List, Dict
 from dotenv import load_dotenv
+from question_cache import create_cache_from_env
+from question_pool import QuestionPool
+from question_bank import load_question_bank
+from question_similarity import CandidateHistory, QuestionSetFilter
+from json_stream_parser import IncrementalObjectParser
+from adaptive_engine import AdaptiveEngine
+from llm_client import LLMUnavailableError, create_llm_client_from_env
+from metrics import stage_timer
+
+logger = logging.getLogger(__name__)
 
 # Try to import OpenAI (optional)
 try:
@@ -14,199 +27,308 @@ try:
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
-    print("⚠️  OpenAI library not installed. Using fallback question generation.")
+    logger.warning("OpenAI library not installed. Using fallback question generation.")
 
 load_dotenv()
 
 class PersonalizedQuestionGenerator:
-    def __init__(self):
+    def __init__(self, cache=None, use_pool=None):
+        """
+        Args:
+            cache (QuestionCache): Cache for LLM-generated sets; configured from the environment when omitted
+            use_pool (bool): Serve requests from a pre-generated question pool; defaults to
+                the QUESTION_POOL_ENABLED environment variable. Queues are kept for the bank's
+                categories plus QUESTION_POOL_INTERESTS (comma-separated)
+        """
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.client = None
+        self.llm = None
+        self.cache = cache if cache is not None else create_cache_from_env()
+        self.stats = {'requests': 0, 'openai': 0, 'partial': 0, 'fallback': 0, 'cache_hits': 0,
+                      'near_duplicates': 0, 'llm_salvaged': 0, 'llm_topups': 0}
+        self.llm_topups = int(os.getenv('QUESTION_LLM_TOPUPS', 1))
+        self.similarity_threshold = float(os.getenv('QUESTION_SIMILARITY_THRESHOLD', 0.6))
+        self.history = CandidateHistory(threshold=self.similarity_threshold)
+        self.llm_deadline = float(os.getenv('QUESTION_LLM_DEADLINE', 8))
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('QUESTION_LLM_CONCURRENCY', 8)),
+            thread_name_prefix='question-llm'
+        )
         
         if OPENAI_AVAILABLE and self.openai_api_key:
             try:
-                self.client = OpenAI(api_key=self.openai_api_key)
-                print("✅ OpenAI client initialized")
+                self.llm = create_llm_client_from_env(self.openai_api_key)
+                self.client = self.llm.client
+                logger.info("OpenAI client initialized")
             except Exception as e:
-                print(f"⚠️  Failed to initialize OpenAI client: {e}")
+                logger.warning("Failed to initialize OpenAI client: %s", e)
                 self.client = None
         
-        # Question templates for fallback
-        self.question_templates = {
-            'Programming': {
-                'beginner': [
-                    "What is the difference between a list and a tuple in Python?",
-                    "Explain what a for loop does and provide an example.",
-                    "What are variables and how do you declare them in your preferred language?",
-                    "Describe the basic data types you know.",
-                    "What is the purpose of functions in programming?"
-                ],
-                'intermediate': [
-                    "Explain the concept of object-oriented programming and its main principles.",
-                    "What is the difference between == and === in JavaScript?",
-                    "Describe how exception handling works in your preferred language.",
-                    "What are lambda functions and when would you use them?",
-                    "Explain the difference between mutable and immutable objects."
-                ],
-                'advanced': [
-                    "Explain the event loop and asynchronous programming in JavaScript.",
-                    "What are design patterns and describe at least three commonly used ones.",
-                    "Discuss memory management and garbage collection in your preferred language.",
-                    "Explain the CAP theorem and its implications for distributed systems.",
-                    "What are closures and how do they work? Provide practical examples."
-                ]
-            },
-            'Data Science': {
-                'beginner': [
-                    "What is the difference between supervised and unsupervised learning?",
-                    "Explain what a dataset is and its components.",
-                    "What is data cleaning and why is it important?",
-                    "Describe basic statistical measures like mean, median, and mode.",
-                    "What is a correlation and how is it measured?"
-                ],
-                'intermediate': [
-                    "Explain the bias-variance tradeoff in machine learning.",
-                    "What is overfitting and how can you prevent it?",
-                    "Describe the difference between classification and regression problems.",
-                    "What are feature engineering techniques you've used?",
-                    "Explain cross-validation and its importance."
-                ],
-                'advanced': [
-                    "Compare and contrast different ensemble methods like bagging and boosting.",
-                    "Explain the mathematics behind gradient descent optimization.",
-                    "Discuss the challenges of working with imbalanced datasets.",
-                    "What are embedding layers in deep learning and their applications?",
-                    "Explain dimensionality reduction techniques like PCA and t-SNE."
-                ]
-            },
-            'Web Development': {
-                'beginner': [
-                    "What is HTML and what is its role in web development?",
-                    "Explain the difference between HTML, CSS, and JavaScript.",
-                    "What is a responsive website?",
-                    "Describe the purpose of CSS selectors.",
-                    "What is the DOM (Document Object Model)?"
-                ],
-                'intermediate': [
-                    "Explain the concept of RESTful APIs and HTTP methods.",
-                    "What is the difference between localStorage and sessionStorage?",
-                    "Describe how CORS works and why it's important.",
-                    "What are CSS preprocessors and why would you use them?",
-                    "Explain the concept of single-page applications (SPAs)."
-                ],
-                'advanced': [
-                    "Discuss server-side rendering vs. client-side rendering trade-offs.",
-                    "Explain how JWT authentication works in detail.",
-                    "What are microservices and when should you use them?",
-                    "Describe strategies for optimizing website performance.",
-                    "Explain the WebSocket protocol and its use cases."
-                ]
-            },
-            'AI/ML': {
-                'beginner': [
-                    "What is artificial intelligence and machine learning?",
-                    "Explain the difference between AI, ML, and deep learning.",
-                    "What is a neural network in simple terms?",
-                    "Describe what training data is and why it's important.",
-                    "What is the purpose of activation functions?"
-                ],
-                'intermediate': [
-                    "Explain backpropagation and how neural networks learn.",
-                    "What are convolutional neural networks (CNNs) used for?",
-                    "Describe the vanishing gradient problem.",
-                    "What is transfer learning and when is it useful?",
-                    "Explain the concept of reinforcement learning."
-                ],
-                'advanced': [
-                    "Discuss transformer architecture and attention mechanisms.",
-                    "Explain generative adversarial networks (GANs) and their applications.",
-                    "What are the challenges in deploying ML models to production?",
-                    "Describe techniques for handling class imbalance in deep learning.",
-                    "Explain federated learning and privacy-preserving ML."
-                ]
-            },
-            'Cloud': {
-                'beginner': [
-                    "What is cloud computing and its main benefits?",
-                    "Explain the difference between IaaS, PaaS, and SaaS.",
-                    "What are the major cloud service providers?",
-                    "Describe what virtualization means.",
-                    "What is a virtual machine?"
-                ],
-                'intermediate': [
-                    "Explain the concept of auto-scaling in cloud environments.",
-                    "What are containerization and its advantages?",
-                    "Describe the difference between vertical and horizontal scaling.",
-                    "What is serverless computing and when would you use it?",
-                    "Explain load balancing and its importance."
-                ],
-                'advanced': [
-                    "Discuss multi-region deployment strategies and disaster recovery.",
-                    "Explain Kubernetes architecture and orchestration concepts.",
-                    "What are the challenges of cloud security and compliance?",
-                    "Describe CI/CD pipelines in cloud environments.",
-                    "Explain infrastructure as code (IaC) and tools like Terraform."
-                ]
-            }
-        }
+        # Indexed question bank for template questions (shared, loaded once per process)
+        self.bank = load_question_bank()
+        self.adaptive = AdaptiveEngine(self.bank, self._bank_question)
+
+        if use_pool is None:
+            use_pool = os.getenv('QUESTION_POOL_ENABLED', 'false').lower() == 'true'
+        self.pool = None
+        if use_pool:
+            self.pool = QuestionPool(
+                producer=self._produce_for_pool,
+                fallback=lambda interest, level, count: self.generate_fallback([interest], level, count),
+                low_water=int(os.getenv('QUESTION_POOL_LOW_WATER', 10)),
+                high_water=int(os.getenv('QUESTION_POOL_HIGH_WATER', 30))
+            )
+            # Queues only for known interests: the bank's categories and any configured ones
+            configured = [i.strip() for i in os.getenv('QUESTION_POOL_INTERESTS', '').split(',') if i.strip()]
+            for interest in dict.fromkeys([*self.bank.categories(), *configured]):
+                for level in ('beginner', 'intermediate', 'advanced'):
+                    self.pool.register(interest, level)
     
-    def generate_with_openai(self, interests: List[str], skill_level: str, num_questions: int = 5) -> List[Dict]:
+    def _llm_ready(self) -> bool:
+        """True if OpenAI is configured and its circuit breaker is not open"""
+        return self.llm is not None and self.llm.available()
+
+    def _split_counts(self, interests: List[str], num_questions: int) -> List[int]:
+        """Spread num_questions across interests, earlier interests taking the remainder"""
+        base, extra = divmod(num_questions, len(interests))
+        return [base + (1 if i < extra else 0) for i in range(len(interests))]
+
+    def _completion_request(self, interest: str, skill_level: str, num_questions: int,
+                            avoid: List[str] = None) -> Dict:
+        """Keyword arguments of a streamed chat completion asking for questions on one interest"""
+        prompt = f"""Generate {num_questions} technical interview questions for a candidate with the following profile:
+- Interest: {interest}
+- Skill Level: {skill_level}
+
+For each question, provide:
+1. The question text
+2. Category (use "{interest}")
+3. Difficulty level
+4. Brief context or hints for the interviewer
+
+Format the response as JSON array with objects containing: text, category, difficulty, context"""
+        if avoid:
+            prompt += "\n\nDo not repeat these questions:\n" + "\n".join(f"- {text}" for text in avoid)
+
+        return {
+            'model': "gpt-3.5-turbo",
+            'messages': [
+                {"role": "system", "content": "You are an expert technical interviewer creating personalized interview questions."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'max_tokens': 250 * num_questions,
+            'stream': True
+        }
+
+    def _parse_questions(self, parser: IncrementalObjectParser, content: str, interest: str,
+                         skill_level: str) -> List[Dict]:
+        """Valid question dictionaries completed by the next piece of a streamed response"""
+        questions = []
+        for obj in parser.feed(content):
+            text = obj.get('text')
+            if isinstance(text, str) and text.strip():
+                questions.append({
+                    'text': text.strip(),
+                    'category': obj.get('category') or interest,
+                    'difficulty': obj.get('difficulty') or skill_level.capitalize(),
+                    'context': obj.get('context') or '',
+                    'source': 'openai'
+                })
+        return questions
+
+    def _request_questions(self, interest: str, skill_level: str, num_questions: int, stop_at: float,
+                           avoid: List[str] = None) -> List[Dict]:
+        """
+        Stream one OpenAI completion and keep every complete question object in it
+
+        Objects are parsed incrementally as tokens arrive, so fenced, prefixed or
+        truncated output (including a stream cut off at stop_at) still yields the
+        questions completed before the problem.
+
+        Args:
+            interest: Interest to generate for
+            skill_level: User's skill level
+            num_questions: Number of questions to request
+            stop_at: time.monotonic() value by which the request and reading must finish
+            avoid: Question texts already generated, which must not be repeated
+
+        Returns:
+            List of valid question dictionaries
+        """
+        stream = self.llm.create_completion(
+            deadline=stop_at, **self._completion_request(interest, skill_level, num_questions, avoid)
+        )
+
+        parser = IncrementalObjectParser()
+        questions = []
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    questions.extend(self._parse_questions(parser, chunk.choices[0].delta.content,
+                                                           interest, skill_level))
+                if len(questions) >= num_questions or time.monotonic() > stop_at:
+                    break
+        except Exception:
+            self.llm.record_failure()
+            if not questions:
+                raise
+        finally:
+            if hasattr(stream, 'close'):
+                stream.close()
+
+        if parser.incomplete or parser.malformed:
+            self.stats['llm_salvaged'] += 1
+        return questions[:num_questions]
+
+    def _generate_for_interest(self, interest: str, skill_level: str, num_questions: int,
+                               stop_at: float) -> List[Dict]:
+        """
+        Generate questions for a single interest
+
+        If the response is truncated or some objects are malformed, only the
+        missing number of questions is requested again while time remains.
+
+        Args:
+            interest: Interest to generate for
+            skill_level: User's skill level
+            num_questions: Number of questions to generate
+            stop_at: time.monotonic() value by which all requests must finish
+
+        Returns:
+            List of question dictionaries
+        """
+        if time.monotonic() >= stop_at:
+            return []   # queued behind other parts until the caller had already used templates
+        questions = []
+
+        for attempt in range(1 + self.llm_topups):
+            if time.monotonic() >= stop_at:
+                break
+            if attempt:
+                self.stats['llm_topups'] += 1
+            questions.extend(self._request_questions(
+                interest, skill_level, num_questions - len(questions), stop_at,
+                avoid=[q['text'] for q in questions]
+            ))
+            if len(questions) >= num_questions:
+                break
+
+        if not questions:
+            raise ValueError(f'No valid questions in OpenAI response for {interest}')
+        return questions[:num_questions]
+
+    def generate_with_openai(self, interests: List[str], skill_level: str, num_questions: int = 5,
+                             deadline: float = None) -> List[Dict]:
         """
         Generate questions using OpenAI API
+
+        One request per interest is sent concurrently. Interests whose request
+        fails or misses the deadline are filled from templates, so the call
+        takes at most `deadline` seconds and keeps every LLM result that arrived.
         
         Args:
             interests: List of user interests
             skill_level: User's skill level (beginner/intermediate/advanced)
             num_questions: Number of questions to generate
+            deadline: Seconds to wait for the LLM; defaults to QUESTION_LLM_DEADLINE
             
         Returns:
             List of question dictionaries
         """
-        if not self.client:
+        if not self._llm_ready():
             return self.generate_fallback(interests, skill_level, num_questions)
-        
-        try:
-            prompt = f"""Generate {num_questions} technical interview questions for a candidate with the following profile:
-- Interests: {', '.join(interests)}
-- Skill Level: {skill_level}
 
-For each question, provide:
-1. The question text
-2. Category (based on their interests)
-3. Difficulty level
-4. Brief context or hints for the interviewer
+        deadline = deadline or self.llm_deadline
+        parts = self._submit_parts(interests, skill_level, num_questions, deadline)
+        with stage_timer('questions', 'openai_wait'):
+            wait([future for _, _, future in parts], timeout=deadline)
 
-Format the response as JSON array with objects containing: text, category, difficulty, context"""
+        questions = []
+        for interest, count, future in parts:
+            questions.extend(self._finish_part(interest, count, future, skill_level, deadline))
 
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert technical interviewer creating personalized interview questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            # Parse the response
-            import json
-            questions_text = response.choices.message.content
-            
-            # Extract JSON from the response (handle markdown code blocks)
-            if '```json' in questions_text:
-                questions_text = questions_text.split('```json').split('```')
-            elif '```' in questions_text:
-                questions_text = questions_text.split('```').split('```')
-            
-            questions = json.loads(questions_text.strip())
-            
-            print(f"✅ Generated {len(questions)} questions using OpenAI")
-            return questions
-            
-        except Exception as e:
-            print(f"⚠️  Error generating questions with OpenAI: {e}")
-            return self.generate_fallback(interests, skill_level, num_questions)
+        generated = sum(1 for q in questions if q.get('source') == 'openai')
+        logger.debug("Generated %d of %d questions using OpenAI", generated, len(questions),
+                     extra={'source': 'openai', 'generated': generated})
+        return questions[:num_questions]
+
+    def _submit_parts(self, interests: List[str], skill_level: str, num_questions: int, deadline: float):
+        """
+        Start one OpenAI request per interest (carrying the caller's log correlation ids)
+
+        Returns:
+            List of (interest, count, future) tuples
+        """
+        # Measured from submission, not from when a part leaves the executor queue, and stopping
+        # a little before the caller's deadline so partial results still reach it
+        stop_at = time.monotonic() + 0.9 * deadline
+        return [
+            (interest, count, self.executor.submit(contextvars.copy_context().run, self._generate_for_interest,
+                                                   interest, skill_level, count, stop_at))
+            for interest, count in zip(interests, self._split_counts(interests, num_questions)) if count
+        ]
+
+    def _finish_part(self, interest: str, count: int, future, skill_level: str, deadline: float) -> List[Dict]:
+        """Result of one interest's request, topped up from templates if it failed or is not done yet"""
+        part = []
+        if future.done():
+            try:
+                part = future.result()
+            except LLMUnavailableError as e:
+                logger.warning("OpenAI unavailable for %s (%s), using templates", interest, e,
+                               extra={'sample_key': 'llm_unavailable'})
+            except Exception as e:
+                logger.warning("Error generating %s questions with OpenAI: %s", interest, e)
+        else:
+            future.cancel()
+            logger.warning("OpenAI timed out for %s after %ss, using templates", interest, deadline)
+
+        if len(part) < count:
+            part.extend(self.generate_fallback([interest], skill_level, count - len(part)))
+        return part
     
+    def _bank_question(self, question: Dict, interest: str, skill_level: str) -> Dict:
+        """Response dictionary for a question bank entry"""
+        return {
+            'id': question['id'],
+            'text': question['text'],
+            'category': interest,
+            'difficulty': skill_level.capitalize(),
+            'context': f'Assess candidate\'s understanding of {interest} concepts at {skill_level} level',
+            'source': 'template'
+        }
+
+    def _interest_tags(self, interest: str) -> List[str]:
+        """
+        Bank tags to draw an interest's questions from, most specific first
+
+        The interest's own tag, then the categories its questions belong to,
+        then general programming. A tag can have questions at some levels
+        only, so callers walk the list until they have enough.
+        """
+        chain = [interest, *self.bank.tag_categories(interest), 'Programming']
+        return [tag for tag in dict.fromkeys(t.lower() for t in chain) if self.bank.has_tag(tag)] or ['programming']
+
+    def _draw(self, tags: List[str], skill_level: str, count: int, used: set) -> List[Dict]:
+        """Up to count unused bank questions, taking each tag's bucket at the level in turn"""
+        drawn = []
+        for tag in tags:
+            if len(drawn) >= count:
+                break
+            for question in self.bank.sample([tag], [skill_level], count - len(drawn), exclude=used):
+                used.add(question['id'])
+                drawn.append(question)
+        return drawn
+
+    def _interest_for(self, question: Dict, interests: List[str], chains: List[List[str]]) -> str:
+        """Interest a bank question drawn for several interests belongs to"""
+        for depth in range(max(len(chain) for chain in chains)):
+            for interest, chain in zip(interests, chains):
+                if depth < len(chain) and chain[depth] in question['tags']:
+                    return interest
+        return interests[0]
+
     def generate_fallback(self, interests: List[str], skill_level: str, num_questions: int = 5) -> List[Dict]:
         """
         Generate questions using template-based approach (fallback)
@@ -219,55 +341,57 @@ Format the response as JSON array with objects containing: text, category, diffi
         Returns:
             List of question dictionaries
         """
+        chains = [self._interest_tags(interest) for interest in interests]
         questions = []
-        questions_per_interest = max(1, num_questions // len(interests))
-        
-        for interest in interests:
-            # Get templates for this interest and skill level
-            templates = self.question_templates.get(interest, {}).get(skill_level, [])
-            
-            if not templates:
-                # Fallback to general programming questions
-                templates = self.question_templates['Programming'][skill_level]
-            
-            # Randomly select questions
-            selected = random.sample(templates, min(questions_per_interest, len(templates)))
-            
-            for question_text in selected:
-                questions.append({
-                    'text': question_text,
-                    'category': interest,
-                    'difficulty': skill_level.capitalize(),
-                    'context': f'Assess candidate\'s understanding of {interest} concepts at {skill_level} level'
-                })
-        
-        # If we need more questions, add from the first interest
-        while len(questions) < num_questions and interests:
-            remaining_templates = self.question_templates.get(interests, {}).get(skill_level, [])
-            unused = [q for q in remaining_templates if q not in [qu['text'] for qu in questions]]
-            if unused:
-                questions.append({
-                    'text': random.choice(unused),
-                    'category': interests,
-                    'difficulty': skill_level.capitalize(),
-                    'context': f'Additional {interests} question'
-                })
-            else:
-                break
+        used = set()
+
+        for interest, chain, count in zip(interests, chains, self._split_counts(interests, num_questions)):
+            for question in self._draw(chain, skill_level, count, used):
+                questions.append(self._bank_question(question, interest, skill_level))
+
+        # If an interest ran out of questions, top up from all of them
+        if len(questions) < num_questions:
+            tags = list(dict.fromkeys(tag for chain in chains for tag in chain))
+            for question in self._draw(tags, skill_level, num_questions - len(questions), used):
+                questions.append(self._bank_question(question, self._interest_for(question, interests, chains),
+                                                     skill_level))
         
-        print(f"✅ Generated {len(questions)} questions using templates")
+        logger.debug("Generated %d questions using templates", len(questions), extra={'source': 'template'})
         return questions[:num_questions]
     
-    def generate_questions(self, user_profile: Dict) -> List[Dict]:
+    def _produce_for_pool(self, interest: str, skill_level: str, count: int) -> List[Dict]:
+        """Generate questions for one pool queue (runs on the refill thread)"""
+        if self._llm_ready():
+            return self.generate_with_openai([interest], skill_level, count)
+        return self.generate_fallback([interest], skill_level, count)
+
+    def generate_from_pool(self, interests: List[str], skill_level: str, num_questions: int,
+                           session_id: str = None) -> List[Dict]:
         """
-        Main method to generate personalized questions
-        
+        Draw questions from the pre-generated pool, spread across interests
+
         Args:
-            user_profile: Dictionary with 'interests', 'skill_level', 'num_questions'
-            
+            interests: List of user interests
+            skill_level: User's skill level
+            num_questions: Number of questions to return
+            session_id: Interview session; questions it already received are not repeated
+
         Returns:
             List of question dictionaries
         """
+        questions = []
+        for interest, count in zip(interests, self._split_counts(interests, num_questions)):
+            if count:
+                questions.extend(self.pool.draw(interest, skill_level, count, session_id))
+        return questions[:num_questions]
+
+    def _validate_profile(self, user_profile: Dict):
+        """
+        Read and validate the generation settings of a profile
+
+        Returns:
+            Tuple of (interests, skill_level, num_questions)
+        """
         interests = user_profile.get('interests', ['Programming'])
         skill_level = user_profile.get('skill_level', 'intermediate')
         num_questions = user_profile.get('num_questions', 5)
@@ -282,14 +406,245 @@ Format the response as JSON array with objects containing: text, category, diffi
         if num_questions < 1 or num_questions > 20:
             num_questions = 5
         
-        print(f"📝 Generating {num_questions} questions for: {', '.join(interests)} ({skill_level})")
+        logger.debug("Generating %d questions for: %s (%s)", num_questions, ', '.join(interests), skill_level)
+        return interests, skill_level, num_questions
+
+    def generate_questions(self, user_profile: Dict) -> List[Dict]:
+        """
+        Main method to generate personalized questions
         
-        # Try OpenAI first, fallback to templates
-        if self.client:
-            return self.generate_with_openai(interests, skill_level, num_questions)
+        Args:
+            user_profile: Dictionary with 'interests', 'skill_level', 'num_questions'
+                and optionally 'session_id' and 'candidate_id'
+            
+        Returns:
+            List of question dictionaries
+        """
+        interests, skill_level, num_questions = self._validate_profile(user_profile)
+        self.stats['requests'] += 1
+
+        with stage_timer('questions', 'generate'):
+            questions = self._generate(interests, skill_level, num_questions, user_profile.get('session_id'))
+        with stage_timer('questions', 'dedupe'):
+            return self.remove_near_duplicates(questions, interests, skill_level, num_questions,
+                                               user_profile.get('candidate_id'))
+
+    def _generate(self, interests: List[str], skill_level: str, num_questions: int,
+                  session_id: str = None) -> List[Dict]:
+        """Produce a question set from the pool, cache, OpenAI or templates"""
+        if self.pool:
+            return self.generate_from_pool(interests, skill_level, num_questions, session_id)
+
+        # Try OpenAI first (through the cache), fallback to templates
+        if self._llm_ready():
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.make_key(interests, skill_level, num_questions)
+                cached = self.cache.get(cache_key)
+                if cached:
+                    self.stats['cache_hits'] += 1
+                    logger.debug("Served %d questions from cache", len(cached))
+                    return cached
+
+            questions = self.generate_with_openai(interests, skill_level, num_questions)
+            self._record_generated(questions, cache_key)
+            return questions
         else:
+            self.stats['fallback'] += 1
             return self.generate_fallback(interests, skill_level, num_questions)
 
+    def _record_generated(self, questions: List[Dict], cache_key: str = None, seeded: int = 0):
+        """
+        Count an LLM-backed set by where its questions came from and cache it if complete
+
+        `seeded` template questions placed first on purpose (the streaming
+        path's opening question) do not make a set partial.
+        """
+        # Only cache complete LLM results, never the template fallback
+        from_openai = sum(1 for q in questions if q.get('source') == 'openai')
+        if questions and from_openai == len(questions) - seeded:
+            self.stats['openai'] += 1
+            if cache_key:
+                self.cache.put(cache_key, questions)
+        elif from_openai:
+            self.stats['partial'] += 1
+        else:
+            self.stats['fallback'] += 1
+
+    def iter_questions(self, user_profile: Dict):
+        """
+        Generate personalized questions, yielding each one as soon as it is available
+
+        The first question comes from the question bank (or the whole set from
+        the cache or pool), so the interview can start immediately while the
+        remaining questions are generated concurrently and yielded per interest
+        as their LLM responses arrive.
+
+        Args:
+            user_profile: Same as generate_questions
+
+        Yields:
+            Question dictionaries
+        """
+        interests, skill_level, num_questions = self._validate_profile(user_profile)
+        self.stats['requests'] += 1
+        question_set = QuestionSetFilter(self.similarity_threshold, self.history, user_profile.get('candidate_id'))
+
+        def emit(questions):
+            for question in questions:
+                if len(question_set.kept) < num_questions and question_set.accept(question):
+                    yield question
+
+        cached = None
+        cache_key = None
+        if self._llm_ready() and not self.pool and self.cache:
+            cache_key = self.cache.make_key(interests, skill_level, num_questions)
+            cached = self.cache.get(cache_key)
+            if cached:
+                self.stats['cache_hits'] += 1
+
+        if cached or self.pool or not self._llm_ready():
+            yield from emit(cached or self._generate(interests, skill_level, num_questions,
+                                                     user_profile.get('session_id')))
+        else:
+            seed = self.generate_fallback(interests[:1], skill_level, 1)
+            generated = list(seed)
+            yield from emit(seed)
+
+            # The first interest already has its template question, so the others take any remainder
+            rotated = interests[1:] + interests[:1]
+            remaining = num_questions - len(question_set.kept)
+            parts = self._submit_parts(rotated, skill_level, remaining, self.llm_deadline) if remaining else []
+            pending = {future: (interest, count) for interest, count, future in parts}
+            try:
+                for future in as_completed(pending, timeout=self.llm_deadline):
+                    interest, count = pending.pop(future)
+                    part = self._finish_part(interest, count, future, skill_level, self.llm_deadline)
+                    generated.extend(part)
+                    yield from emit(part)
+            except FuturesTimeout:
+                pass
+            for future, (interest, count) in pending.items():
+                part = self._finish_part(interest, count, future, skill_level, self.llm_deadline)
+                generated.extend(part)
+                yield from emit(part)
+
+            # Cached like a generate_questions set, so later requests for this profile skip the LLM
+            self._record_generated(generated[:num_questions], cache_key, seeded=len(seed))
+
+        yield from self._complete_set(question_set, interests, skill_level, num_questions)
+
+    def remove_near_duplicates(self, questions: List[Dict], interests: List[str], skill_level: str,
+                               num_questions: int, candidate_id: str = None) -> List[Dict]:
+        """
+        Drop questions that nearly repeat another in the set or one the candidate saw before
+
+        Dropped questions are replaced from the question bank, and the final set
+        is recorded in the candidate's history.
+
+        Args:
+            questions: Generated questions (LLM and template mixed)
+            interests: List of user interests, used for replacements
+            skill_level: User's skill level
+            num_questions: Number of questions wanted
+            candidate_id: Candidate whose history is checked and updated
+
+        Returns:
+            List of question dictionaries
+        """
+        question_set = QuestionSetFilter(self.similarity_threshold, self.history, candidate_id)
+        for question in questions:
+            question_set.accept(question)
+        list(self._complete_set(question_set, interests, skill_level, num_questions))
+        return question_set.kept[:num_questions]
+
+    def _complete_set(self, question_set: QuestionSetFilter, interests: List[str], skill_level: str,
+                      num_questions: int):
+        """
+        Fill a filtered set up to num_questions from the bank and record it
+
+        Yields:
+            Each question added
+        """
+        if len(question_set.kept) < num_questions:
+            chains = [self._interest_tags(interest) for interest in interests]
+            tags = list(dict.fromkeys(tag for chain in chains for tag in chain))
+            used = {q['id'] for q in question_set.kept if q.get('id')}
+            wanted = 3 * (num_questions - len(question_set.kept))
+            for candidate in self.bank.sample(tags, [skill_level], wanted, exclude=used):
+                question = self._bank_question(candidate, self._interest_for(candidate, interests, chains),
+                                               skill_level)
+                if question_set.accept(question):
+                    yield question
+                if len(question_set.kept) == num_questions:
+                    break
+
+        # A repeat for this candidate is better than a short interview
+        for question in question_set.seen_before:
+            if len(question_set.kept) >= num_questions:
+                break
+            if question_set.accept(question, allow_seen=True):
+                yield question
+
+        self.stats['near_duplicates'] += question_set.rejected
+        question_set.record()
+
+    def start_adaptive_interview(self, user_profile: Dict) -> Dict:
+        """
+        Start an interview whose difficulty follows the candidate's answers
+
+        The profile's skill level is only the starting estimate; num_questions is
+        the most that will be asked (the session stops early once the ability
+        estimate is precise enough).
+
+        Args:
+            user_profile: Dictionary with 'session_id', 'interests', 'skill_level', 'num_questions'
+
+        Returns:
+            Dictionary with 'question' (the first one) and 'state'
+        """
+        interests, skill_level, num_questions = self._validate_profile(user_profile)
+        try:
+            max_questions = int(user_profile.get('max_questions', num_questions))
+        except (TypeError, ValueError):
+            max_questions = num_questions
+        if max_questions < 1 or max_questions > 20:
+            max_questions = num_questions
+
+        topics = [(interest, self._interest_tags(interest)) for interest in interests]
+        session = self.adaptive.start(user_profile.get('session_id', 'default'), topics, skill_level,
+                                      max_questions=max_questions)
+        return {'question': self.adaptive.next_question(session), 'state': session.to_dict()}
+
+    def answer_adaptive_question(self, session_id: str, question_id: str, score: float) -> Dict:
+        """
+        Score an answer and choose the next question
+
+        Args:
+            session_id: Adaptive interview session
+            question_id: Question that was answered
+            score: Answer score, 0-1 or 0-100
+
+        Returns:
+            Dictionary with 'question' (None once finished) and 'state'
+        """
+        session = self.adaptive.get(session_id)
+        if session is None:
+            raise KeyError(f'No adaptive interview for session {session_id}')
+        session.record_score(question_id, score)
+        return {'question': self.adaptive.next_question(session), 'state': session.to_dict()}
+
+    def get_stats(self):
+        """Get generation counters and cache hit-rate metrics"""
+        return {
+            **self.stats,
+            'openai_available': self.client is not None,
+            'llm': self.llm.get_stats() if self.llm else None,
+            'adaptive': self.adaptive.get_stats(),
+            'cache': self.cache.get_stats() if self.cache else None,
+            'pool': self.pool.get_stats() if self.pool else None
+        }
+
 # Example usage
 if __name__ == "__main__":
     generator = PersonalizedQuestionGenerator()
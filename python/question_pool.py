@@ -0,0 +1,199 @@
+"""
+EduNerve AI - Pre-generated Question Pool
+Keeps per-(interest, skill level) queues of questions topped up in the background
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+class QuestionPool:
+    """
+    Requests draw questions from in-memory queues in O(1) per question while a
+    background worker refills any queue that drops below the low-water mark,
+    so request latency never includes an LLM call.
+
+    Only registered keys get a queue: interests come from clients, and a queue
+    per arbitrary string would grow memory and LLM spend without bound. Other
+    keys are served by the fallback.
+    """
+
+    def __init__(self, producer, fallback, low_water=10, high_water=30, batch_size=10,
+                 max_sessions=10000, retry_delay=5.0):
+        """
+        Args:
+            producer (function): (interest, skill_level, count) -> list of questions; may be slow
+            fallback (function): (interest, skill_level, count) -> list of questions; must be fast
+            low_water (int): Refill a queue when it has fewer questions than this
+            high_water (int): Refill target
+            batch_size (int): Questions requested from the producer per call
+            max_sessions (int): Sessions whose served questions are remembered for de-duplication
+            retry_delay (float): Seconds to wait before retrying a queue whose producer failed
+        """
+        self.producer = producer
+        self.fallback = fallback
+        self.low_water = low_water
+        self.high_water = max(high_water, low_water + 1)
+        self.batch_size = batch_size
+        self.max_sessions = max_sessions
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._needs_refill = threading.Condition(self._lock)
+        self._pools = {}                    # (interest, skill_level) -> deque of questions
+        self._retry_at = {}                 # (interest, skill_level) -> monotonic time
+        self._seen = OrderedDict()          # session_id -> set of question texts (LRU)
+        self._stats = {'drawn': 0, 'pool_misses': 0, 'refills': 0, 'refill_errors': 0, 'produced': 0,
+                       'duplicates_dropped': 0}
+        self._running = True
+
+        self._worker = threading.Thread(target=self._refill_loop, name="question-pool-refill", daemon=True)
+        self._worker.start()
+
+    def register(self, interest, skill_level):
+        """Start maintaining a queue for a key (filled in the background)"""
+        with self._lock:
+            if (interest, skill_level) not in self._pools:
+                self._pools[(interest, skill_level)] = deque()
+                self._needs_refill.notify()
+
+    def _session_seen(self, session_id):
+        if session_id is None:
+            return set()
+        seen = self._seen.get(session_id)
+        if seen is None:
+            seen = self._seen[session_id] = set()
+            if len(self._seen) > self.max_sessions:
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(session_id)
+        return seen
+
+    def draw(self, interest, skill_level, count, session_id=None):
+        """
+        Take questions for one interest without repeating any the session already saw
+
+        Args:
+            interest (str): Interest / category (served by the fallback unless registered)
+            skill_level (str): beginner, intermediate or advanced
+            count (int): Number of questions wanted
+            session_id (str): Interview session used for de-duplication
+
+        Returns:
+            list: Up to `count` question dicts
+        """
+        key = (interest, skill_level)
+        drawn = []
+        with self._lock:
+            pool = self._pools.get(key)
+            seen = self._session_seen(session_id)
+
+            # Each candidate is inspected once; ones this session has seen go back to the tail
+            for _ in range(len(pool) if pool is not None else 0):
+                if len(drawn) == count:
+                    break
+                question = pool.popleft()
+                if question['text'] in seen:
+                    pool.append(question)
+                    continue
+                seen.add(question['text'])
+                drawn.append(question)
+
+            self._stats['drawn'] += len(drawn)
+            if pool is not None and len(pool) < self.low_water:
+                self._needs_refill.notify()
+
+        record_cache('question_pool', len(drawn) == count)
+        if len(drawn) < count:
+            with self._lock:
+                self._stats['pool_misses'] += 1
+            drawn.extend(self._top_up_from_fallback(interest, skill_level, count - len(drawn), session_id,
+                                                    {q['text'] for q in drawn}))
+        return drawn
+
+    def _top_up_from_fallback(self, interest, skill_level, count, session_id, taken):
+        """Serve an empty or exhausted queue from the fast local generator, skipping texts in `taken`"""
+        extra = []
+        for question in self.fallback(interest, skill_level, count + 5):
+            with self._lock:
+                seen = self._session_seen(session_id)
+                if question['text'] in seen or question['text'] in taken:
+                    continue
+                seen.add(question['text'])
+                taken.add(question['text'])
+            extra.append(question)
+            if len(extra) == count:
+                break
+        return extra
+
+    def _next_refill(self):
+        """Pick the emptiest queue below the low-water mark (called with the lock held)"""
+        now = time.monotonic()
+        candidates = [
+            (len(pool), key) for key, pool in self._pools.items()
+            if len(pool) < self.low_water and self._retry_at.get(key, 0) <= now
+        ]
+        return min(candidates)[1] if candidates else None
+
+    def _refill_loop(self):
+        while self._running:
+            with self._lock:
+                key = self._next_refill()
+                if key is None:
+                    self._needs_refill.wait(timeout=self.retry_delay)
+                    continue
+                missing = self.high_water - len(self._pools[key])
+
+            interest, skill_level = key
+            try:
+                questions = self.producer(interest, skill_level, min(self.batch_size, missing))
+            except Exception as e:
+                logger.warning("Question pool refill failed for %s (%s): %s", interest, skill_level, e,
+                               extra={'sample_key': 'pool_refill_failed'})
+                questions = []
+
+            with self._lock:
+                # Template producers have only a few questions per level; never queue a text twice
+                pool = self._pools[key]
+                queued = {q['text'] for q in pool}
+                fresh = []
+                for question in questions:
+                    if question['text'] not in queued:
+                        queued.add(question['text'])
+                        fresh.append(question)
+                self._stats['duplicates_dropped'] += len(questions) - len(fresh)
+                if fresh:
+                    pool.extend(fresh)
+                    self._stats['refills'] += 1
+                    self._stats['produced'] += len(fresh)
+                    self._retry_at.pop(key, None)
+                elif questions:
+                    # Nothing new to add: wait before asking the producer again
+                    self._retry_at[key] = time.monotonic() + self.retry_delay
+                else:
+                    self._stats['refill_errors'] += 1
+                    self._retry_at[key] = time.monotonic() + self.retry_delay
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                'queues': {f'{i}:{s}': len(p) for (i, s), p in self._pools.items()},
+                'sessions_tracked': len(self._seen),
+                'low_water': self.low_water,
+                'high_water': self.high_water
+            }
+
+    def forget_session(self, session_id):
+        """Drop de-duplication history for a finished session"""
+        with self._lock:
+            self._seen.pop(session_id, None)
+
+    def shutdown(self):
+        with self._lock:
+            self._running = False
+            self._needs_refill.notify_all()
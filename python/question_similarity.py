@@ -0,0 +1,217 @@
+"""
+EduNerve AI - Near-Duplicate Question Detection
+MinHash signatures with locality-sensitive hashing over character shingles
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+from question_bank import normalize_text
+
+_PRIME = (1 << 31) - 1
+
+class MinHashIndex:
+    """
+    Near-duplicate index over question texts.
+
+    Each text is reduced to `num_perm` MinHash values over its character
+    shingles. Signatures are split into `bands` bands and bucketed, so a query
+    only compares against texts sharing at least one band (sublinear in the
+    index size) before estimating Jaccard similarity from the signatures.
+    """
+
+    def __init__(self, num_perm=64, bands=16, shingle_size=4, threshold=0.6, seed=7):
+        """
+        Args:
+            num_perm (int): Hash functions per signature
+            bands (int): LSH bands; num_perm must be divisible by it
+            shingle_size (int): Characters per shingle
+            threshold (float): Estimated Jaccard similarity at or above which texts are duplicates
+            seed (int): Seed for the hash functions (must match across indexes that share signatures)
+        """
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures = {}                        # key -> signature
+        self._buckets = [dict() for _ in range(bands)]  # band -> band bytes -> set of keys
+
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text
+
+        Returns:
+            np.ndarray: uint64 array of length num_perm
+        """
+        normalized = normalize_text(text)
+        k = self.shingle_size
+        if len(normalized) <= k:
+            shingles = {normalized}
+        else:
+            shingles = {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+        hashes = np.fromiter((zlib.crc32(s.encode()) & 0x7FFFFFFF for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # All permutations at once: (num_perm, 1) x (1, n_shingles) -> min over shingles
+        return ((self._a * hashes[None, :] + self._b) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key, text=None, signature=None):
+        """Index a text (or a precomputed signature) under a key"""
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            self._signatures[key] = signature
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+        return signature
+
+    def remove(self, key):
+        with self._lock:
+            signature = self._signatures.pop(key, None)
+            if signature is None:
+                return
+            for band, band_key in enumerate(self._band_keys(signature)):
+                bucket = self._buckets[band].get(band_key)
+                if bucket:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._buckets[band][band_key]
+
+    def query(self, text=None, signature=None):
+        """
+        Find indexed texts similar to a text
+
+        Returns:
+            list: (key, estimated similarity) at or above the threshold, most similar first
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for band, band_key in enumerate(self._band_keys(signature)):
+                candidates |= self._buckets[band].get(band_key, set())
+            if not candidates:
+                return []
+            keys = list(candidates)
+            matrix = np.stack([self._signatures[key] for key in keys])
+
+        similarities = (matrix == signature).mean(axis=1)
+        matches = [(key, float(sim)) for key, sim in zip(keys, similarities) if sim >= self.threshold]
+        return sorted(matches, key=lambda m: -m[1])
+
+    def is_near_duplicate(self, text=None, signature=None):
+        return bool(self.query(text, signature))
+
+    def __len__(self):
+        return len(self._signatures)
+
+class CandidateHistory:
+    """Questions each candidate has been asked, checked with per-candidate MinHash indexes"""
+
+    def __init__(self, max_candidates=10000, max_questions=500, **index_options):
+        """
+        Args:
+            max_candidates (int): Candidates remembered (least recently seen are forgotten)
+            max_questions (int): Questions remembered per candidate
+            index_options: Passed to MinHashIndex
+        """
+        self.max_candidates = max_candidates
+        self.max_questions = max_questions
+        self.index_options = index_options
+        self._lock = threading.Lock()
+        self._candidates = OrderedDict()   # candidate id -> (MinHashIndex, OrderedDict of keys)
+
+    def _get(self, candidate_id, create=False):
+        with self._lock:
+            entry = self._candidates.get(candidate_id)
+            if entry is None and create:
+                entry = self._candidates[candidate_id] = (MinHashIndex(**self.index_options), OrderedDict())
+                if len(self._candidates) > self.max_candidates:
+                    self._candidates.popitem(last=False)
+            elif entry is not None:
+                self._candidates.move_to_end(candidate_id)
+            return entry
+
+    def has_seen(self, candidate_id, text=None, signature=None):
+        """True if the candidate was already asked this question or a near-duplicate"""
+        entry = self._get(candidate_id)
+        return bool(entry and entry[0].is_near_duplicate(text, signature))
+
+    def record(self, candidate_id, questions):
+        """Remember questions (dicts with 'text') asked to a candidate"""
+        index, keys = self._get(candidate_id, create=True)
+        for question in questions:
+            key = normalize_text(question['text'])
+            if key in keys:
+                continue
+            index.add(key, question['text'])
+            keys[key] = True
+            if len(keys) > self.max_questions:
+                oldest, _ = keys.popitem(last=False)
+                index.remove(oldest)
+
+class QuestionSetFilter:
+    """Builds one interview's question set, rejecting near-duplicates as questions arrive"""
+
+    def __init__(self, threshold=0.6, history=None, candidate_id=None):
+        """
+        Args:
+            threshold (float): Similarity at or above which questions are duplicates
+            history (CandidateHistory): Questions candidates were asked before
+            candidate_id (str): Candidate whose history is checked
+        """
+        self.index = MinHashIndex(threshold=threshold)
+        self.history = history
+        self.candidate_id = candidate_id
+        self.kept = []
+        self.seen_before = []    # rejected only because the candidate saw them before
+        self.rejected = 0
+
+    def accept(self, question, allow_seen=False):
+        """
+        Add a question unless it repeats one in the set (or, unless allow_seen, the candidate's history)
+
+        Returns:
+            bool: True if the question was added
+        """
+        signature = self.index.signature(question['text'])
+        if self.index.is_near_duplicate(signature=signature):
+            self.rejected += 1
+            return False
+        if not allow_seen and self.history and self.candidate_id and \
+                self.history.has_seen(self.candidate_id, signature=signature):
+            self.rejected += 1
+            self.seen_before.append(question)
+            return False
+        self.index.add(len(self.kept), signature=signature)
+        self.kept.append(question)
+        return True
+
+    def record(self):
+        """Save the accepted set to the candidate's history"""
+        if self.history and self.candidate_id:
+            self.history.record(self.candidate_id, self.kept)
+
+# Example usage
+if __name__ == "__main__":
+    index = MinHashIndex()
+    index.add('q1', "Explain the difference between mutable and immutable objects.")
+    index.add('q2', "What is transfer learning and when is it useful?")
+
+    for text in ["Explain the difference between mutable and immutable objects in Python.",
+                 "What is transfer learning, and when is it useful?",
+                 "Describe how a hash map handles collisions."]:
+        print(f"{text!r} -> {index.query(text)}")
@@ -0,0 +1,280 @@
+"""
+EduNerve AI - Admission Control
+Per-session and per-route token buckets plus a shared concurrency limit for CPU-heavy routes
+
+Every check is O(1) and never waits: a request over its limit is rejected at
+once with 429 and a Retry-After hint. Live interview traffic (frame analysis,
+questions, speech) may use every heavy slot, while batch work (report
+exports, batch transcription) is capped to a share of them so it can never
+starve candidates in an interview.
+
+Environment:
+    ADMISSION_ENABLED (true)
+    ADMISSION_HEAVY_SLOTS: concurrent CPU-heavy requests per worker (default: CPU count)
+    ADMISSION_BATCH_SHARE: fraction of heavy slots batch work may hold (0.5)
+    RATE_FRAMES_PER_SEC (5), RATE_REPORTS_PER_MIN (4), RATE_QUESTIONS_PER_MIN (30)
+    RATE_ROUTE_SESSIONS: sessions a worker is sized for; live routes allow this
+        many times the per-session rate in total (20)
+    RATE_TRUSTED_PROXIES: proxies in front of the server whose X-Forwarded-For
+        entries are trusted, for clients that name no session (0)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+import metrics
+
+LIVE = 'live'
+BATCH = 'batch'
+
+ADMISSION_REJECTED = metrics.counter('edunerve_admission_rejected_total', 'Requests rejected by admission control',
+                                     ('route', 'reason'))
+
+class TokenBucketLimiter:
+    """
+    One token bucket per key, refilled continuously at `rate` tokens per second
+    up to `burst`. Buckets are kept for the `max_keys` most recently seen keys.
+    """
+
+    def __init__(self, rate, burst, max_keys=50000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> [tokens, last refill]
+
+    def acquire(self, key, cost=1.0):
+        """
+        Take `cost` tokens from a key's bucket
+
+        Returns:
+            float: 0 when admitted, otherwise seconds until enough tokens are available
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / self.rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+class PriorityConcurrencyLimiter:
+    """
+    Non-blocking limit on requests in progress, with a cap for batch work.
+
+    Live requests may take any free slot; batch requests only while fewer
+    than `batch_slots` batch requests are running, so at least
+    `slots - batch_slots` slots always remain for live traffic (with a
+    single slot, batch work shares it).
+    """
+
+    def __init__(self, slots, batch_share=0.5):
+        self.slots = max(1, slots)
+        self.batch_slots = 0
+        if batch_share > 0:
+            self.batch_slots = min(max(1, int(self.slots * batch_share)), max(1, self.slots - 1))
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._batch_in_flight = 0
+        self._hold_seconds = 0.5    # moving average of how long a slot is held
+
+    def try_acquire(self, priority=LIVE):
+        """
+        Returns:
+            float: 0 when a slot was taken, otherwise a retry hint in seconds
+        """
+        with self._lock:
+            if self._in_flight < self.slots and (priority == LIVE or self._batch_in_flight < self.batch_slots):
+                self._in_flight += 1
+                if priority != LIVE:
+                    self._batch_in_flight += 1
+                return 0.0
+            return self._hold_seconds
+
+    def release(self, priority, held_seconds):
+        with self._lock:
+            self._in_flight -= 1
+            if priority != LIVE:
+                self._batch_in_flight -= 1
+            self._hold_seconds += 0.2 * (held_seconds - self._hold_seconds)
+
+    def get_stats(self):
+        with self._lock:
+            return {'slots': self.slots, 'batch_slots': self.batch_slots, 'in_flight': self._in_flight,
+                    'batch_in_flight': self._batch_in_flight, 'avg_hold_seconds': round(self._hold_seconds, 3)}
+
+def default_rules():
+    """
+    Limits per route (URL rule)
+
+    'session': (rate per second, burst) per session
+    'route': (rate per second, burst) for the route as a whole in this worker
+    'heavy': takes a slot of the shared CPU concurrency limit
+    'priority': LIVE or BATCH
+    """
+    frames = float(os.getenv('RATE_FRAMES_PER_SEC', 5))
+    reports = float(os.getenv('RATE_REPORTS_PER_MIN', 4)) / 60
+    questions = float(os.getenv('RATE_QUESTIONS_PER_MIN', 30)) / 60
+    sessions = int(os.getenv('RATE_ROUTE_SESSIONS', 20))
+
+    def live(rate, burst, **rule):
+        return {'session': (rate, burst), 'route': (sessions * rate, sessions * burst), 'priority': LIVE, **rule}
+
+    return {
+        '/proctoring/analyze-frame': live(frames, 2 * frames, heavy=True),
+        '/report/generate': {'session': (reports, 2), 'route': (4 * reports, 4), 'heavy': True, 'priority': BATCH},
+        '/stt/batch-transcribe': {'session': (1 / 60, 2), 'route': (1 / 10, 3), 'priority': BATCH},
+        '/questions/generate': live(questions, 5),
+        '/questions/generate-stream': live(questions, 5),
+        '/questions/adaptive/start': live(questions, 5),
+        '/tts/speak-question': live(1, 5),
+        '/tts/speak-warning': live(1, 5)
+    }
+
+def client_address(remote_addr, forwarded_for=None):
+    """
+    Address of the client behind RATE_TRUSTED_PROXIES proxies
+
+    Each trusted proxy appends the address it received the request from to
+    X-Forwarded-For, so the client is the entry that many places from the
+    end; anything before it was written by the client and is ignored.
+    """
+    trusted = int(os.getenv('RATE_TRUSTED_PROXIES', 0))
+    hops = [hop.strip() for hop in (forwarded_for or '').split(',') if hop.strip()]
+    if trusted > 0 and hops:
+        return hops[-min(trusted, len(hops))]
+    return remote_addr or 'unknown'
+
+class AdmissionController:
+    """Applies the rate rules and the heavy-route concurrency limit to one request at a time"""
+
+    def __init__(self, rules=None, heavy_slots=None, batch_share=None):
+        self.rules = rules if rules is not None else default_rules()
+        self.heavy = PriorityConcurrencyLimiter(
+            heavy_slots or int(os.getenv('ADMISSION_HEAVY_SLOTS', os.cpu_count() or 1)),
+            float(os.getenv('ADMISSION_BATCH_SHARE', 0.5)) if batch_share is None else batch_share
+        )
+        self._session_limits = {route: TokenBucketLimiter(*rule['session'])
+                                for route, rule in self.rules.items() if 'session' in rule}
+        self._route_limits = {route: TokenBucketLimiter(*rule['route'])
+                              for route, rule in self.rules.items() if 'route' in rule}
+        self._stats = {'admitted': 0, 'rate_limited': 0, 'overloaded': 0}
+
+    def admit(self, route, client_key, priority=None):
+        """
+        Decide on one request
+
+        Args:
+            route (str): URL rule of the request
+            client_key (str): 'session:<id>', or 'addr:<address>' when the request names no session
+            priority (str): Lowers a LIVE route to BATCH (X-Priority: batch); never raises it
+
+        Returns:
+            tuple: (ticket, retry_after). ticket is None when the request is
+                rejected; otherwise pass it to release() when the request ends
+                (it is False for routes that hold no slot).
+        """
+        rule = self.rules.get(route)
+        if rule is None:
+            return False, 0.0
+        priority = BATCH if priority == BATCH else rule.get('priority', LIVE)
+
+        limiter = self._session_limits.get(route)
+        wait = limiter.acquire(client_key) if limiter is not None else 0.0
+        if not wait and route in self._route_limits:
+            wait = self._route_limits[route].acquire(route)
+        if wait:
+            return self._reject(route, 'rate_limited', wait)
+
+        if rule.get('heavy'):
+            wait = self.heavy.try_acquire(priority)
+            if wait:
+                return self._reject(route, 'overloaded', wait)
+            self._stats['admitted'] += 1
+            return (priority, time.monotonic()), 0.0
+        self._stats['admitted'] += 1
+        return False, 0.0
+
+    def _reject(self, route, reason, retry_after):
+        self._stats[reason] += 1
+        ADMISSION_REJECTED.inc(route=route, reason=reason)
+        return None, retry_after
+
+    def release(self, ticket):
+        if ticket:
+            priority, started = ticket
+            self.heavy.release(priority, time.monotonic() - started)
+
+    def get_stats(self):
+        return {**self._stats, 'heavy': self.heavy.get_stats(),
+                'tracked_clients': sum(len(limiter) for limiter in self._session_limits.values())}
+
+def retry_after_header(seconds):
+    """Retry-After takes whole seconds"""
+    return str(max(1, math.ceil(seconds)))
+
+def install_admission_control(app, controller=None):
+    """
+    Check every request to a limited route before it is handled
+
+    Clients are identified by the X-Session-ID header or the request's
+    session_id, and by their address when they name no session. Session ids
+    are chosen by clients, so live routes also have a per-worker route limit
+    that a client sending fresh ids cannot get around. Rejected requests get
+    429 with Retry-After and 'retry_after' in the body; GET /admission/stats
+    reports the counters.
+    """
+    from flask import g, jsonify, request
+
+    if os.getenv('ADMISSION_ENABLED', 'true').lower() != 'true':
+        return None
+    controller = controller or AdmissionController()
+
+    def client_key():
+        session_id = request.headers.get('X-Session-ID')
+        if not session_id and request.is_json:
+            body = request.get_json(silent=True)
+            if isinstance(body, dict):
+                profile = body.get('user_profile')
+                session_id = body.get('session_id') or (profile.get('session_id') if isinstance(profile, dict)
+                                                        else None)
+        if session_id:
+            return f'session:{session_id}'
+        return 'addr:' + client_address(request.remote_addr, request.headers.get('X-Forwarded-For'))
+
+    @app.before_request
+    def _admit():
+        if request.url_rule is None or request.url_rule.rule not in controller.rules:
+            return None
+        route = request.url_rule.rule
+        ticket, retry_after = controller.admit(route, client_key(), request.headers.get('X-Priority'))
+        if ticket is None:
+            response = jsonify({'error': 'Too many requests', 'route': route, 'retry_after': round(retry_after, 2)})
+            response.headers['Retry-After'] = retry_after_header(retry_after)
+            return response, 429
+        g._admission_ticket = ticket
+        return None
+
+    @app.teardown_request
+    def _release(error=None):
+        controller.release(g.pop('_admission_ticket', None))
+
+    @app.route('/admission/stats', methods=['GET'])
+    def admission_stats():
+        """Admission control counters and heavy-route slots"""
+        return jsonify({'success': True, 'stats': controller.get_stats()})
+
+    return controller
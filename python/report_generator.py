@@ -15,7 +15,11 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import io
+import logging
 import os
+from metrics import stage_timer
+
+logger = logging.getLogger(__name__)
 
 class InterviewReportGenerator:
     def __init__(self):
@@ -234,7 +238,8 @@ class InterviewReportGenerator:
         story.append(Spacer(1, 0.2*inch))
         
         if 'skills' in report_data and report_data['skills']:
-            skills_chart = self.create_skills_chart(report_data['skills'])
+            with stage_timer('report', 'skills_chart'):
+                skills_chart = self.create_skills_chart(report_data['skills'])
             img = Image(skills_chart, width=6*inch, height=3.5*inch)
             story.append(img)
         story.append(Spacer(1, 0.3*inch))
@@ -278,7 +283,8 @@ class InterviewReportGenerator:
         story.append(Spacer(1, 0.2*inch))
         
         if 'psychometrics' in report_data and report_data['psychometrics']:
-            psychometric_chart = self.create_psychometric_chart(report_data['psychometrics'])
+            with stage_timer('report', 'psychometric_chart'):
+                psychometric_chart = self.create_psychometric_chart(report_data['psychometrics'])
             img = Image(psychometric_chart, width=5*inch, height=5*inch)
             story.append(img)
             story.append(Spacer(1, 0.3*inch))
@@ -343,8 +349,9 @@ class InterviewReportGenerator:
         story.append(recommendations_para)
         
         # Build PDF
-        doc.build(story)
-        print(f"✅ Report generated successfully: {output_path}")
+        with stage_timer('report', 'pdf_build'):
+            doc.build(story)
+        logger.info("Report generated: %s", output_path)
         
         return output_path
 
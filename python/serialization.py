@@ -0,0 +1,173 @@
+"""
+EduNerve AI - Response Serialization
+Fast JSON encoding, msgpack negotiation and response compression
+
+orjson is used when installed (falling back to compact stdlib json), msgpack
+is returned to clients that ask for it with Accept: application/msgpack, and
+bodies above COMPRESS_MIN_BYTES are compressed with br or gzip according to
+Accept-Encoding. Clients sending Prefer: return=minimal get responses without
+fields that merely echo the request or repeat server state.
+
+Environment:
+    COMPRESS_MIN_BYTES (1024), COMPRESS_LEVEL_GZIP (5), COMPRESS_LEVEL_BR (4)
+"""
+
+import datetime
+import gzip
+import json
+import os
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/msgpack', 'text/plain', 'text/html')
+
+def _default(value):
+    """Types neither encoder handles natively: numpy values, sets, dates (stdlib json)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value):
+        """Compact JSON as bytes"""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(value):
+        """Compact JSON as bytes"""
+        return json.dumps(value, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+    loads = json.loads
+
+def packb(value):
+    """msgpack bytes"""
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+def wants_msgpack(accept):
+    return MSGPACK_AVAILABLE and bool(accept) and any(kind in accept for kind in MSGPACK_TYPES)
+
+def wants_minimal(headers):
+    """Client asked to leave out echoed and repeated fields (Prefer: return=minimal)"""
+    return 'return=minimal' in headers.get('Prefer', '')
+
+def _encoding_weights(accept_encoding):
+    """Accept-Encoding as {coding: q}; a coding listed without q has q=1"""
+    weights = {}
+    for part in (accept_encoding or '').lower().split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+def choose_encoding(accept_encoding):
+    """
+    'br', 'gzip' or None: the acceptable coding with the highest q, br on ties
+
+    Codings with q=0 are refused, also when '*' would otherwise allow them.
+    """
+    weights = _encoding_weights(accept_encoding)
+    candidates = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=int(os.getenv('COMPRESS_LEVEL_BR', 4)))
+    return gzip.compress(body, compresslevel=int(os.getenv('COMPRESS_LEVEL_GZIP', 5)), mtime=0)
+
+def _add_vary(response, *fields):
+    current = [v.strip() for v in response.headers.get('Vary', '').split(',') if v.strip()]
+    for field in fields:
+        if field not in current:
+            current.append(field)
+    response.headers['Vary'] = ', '.join(current)
+
+def create_json_provider(app):
+    """
+    Flask JSON provider using the fast encoder
+
+    jsonify (and every `return {...}` from a view) goes through it, so all
+    endpoints get compact orjson output, and msgpack when the request's
+    Accept header asks for it.
+    """
+    from flask import request
+    from flask.json.provider import JSONProvider
+
+    class FastJSONProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            if request and wants_msgpack(request.headers.get('Accept')):
+                response = self._app.response_class(packb(obj), mimetype='application/msgpack')
+            else:
+                response = self._app.response_class(dumps(obj), mimetype='application/json')
+            _add_vary(response, 'Accept')
+            return response
+
+    return FastJSONProvider(app)
+
+def install_response_encoding(app):
+    """Use the fast JSON provider and compress large responses the client accepts compressed"""
+    from flask import request
+
+    app.json = create_json_provider(app)
+    min_bytes = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+
+    @app.after_request
+    def _compress(response):
+        if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES or response.status_code < 200):
+            return response
+        _add_vary(response, 'Accept-Encoding')
+        body = response.get_data()
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if encoding is None or len(body) < min_bytes:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return app
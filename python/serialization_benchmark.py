@@ -0,0 +1,113 @@
+"""
+EduNerve AI - Serialization Benchmark
+Times response encoders and compressors on typical endpoint payloads
+
+Usage:
+    python serialization_benchmark.py
+    python serialization_benchmark.py --repeat 20000 --payload transcript
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+import serialization
+
+def frame_analysis_payload():
+    """/proctoring/analyze-frame response"""
+    return {
+        'success': True,
+        'analysis': {
+            'timestamp': '2024-05-01T10:15:30.123456',
+            'face_count': 1,
+            'gaze_direction': 'center',
+            'head_pose': {'pitch': 4.21, 'yaw': -7.83, 'roll': 1.02},
+            'alerts': []
+        },
+        'session_counts': {'frames': 412, 'looking_away': 9, 'no_face': 1}
+    }
+
+def transcript_payload(segments=40):
+    """/stt/get-transcript response for a long answer"""
+    rng = random.Random(0)
+    words = 'I would use a hash map to get constant time lookups and then sort the keys by frequency'.split()
+    items = [{
+        'id': i, 'offset': i + 1, 'start': round(i * 3.1, 3), 'end': round(i * 3.1 + 2.4, 3),
+        'text': ' '.join(rng.choice(words) for _ in range(12)), 'confidence': round(rng.uniform(0.7, 1), 3),
+        'is_final': True, 'timestamp': 1714558530.0 + i
+    } for i in range(segments)]
+    return {'success': True, 'transcript': ' '.join(s['text'] for s in items), 'segments': items,
+            'offset': segments, 'session_id': 'interview-7f3a9c'}
+
+def questions_payload(count=10):
+    """/questions/generate response"""
+    profile = {'interests': ['Python', 'Databases', 'System Design'], 'skill_level': 'intermediate',
+               'num_questions': count, 'session_id': 'interview-7f3a9c'}
+    questions = [{
+        'id': f'q-{i:04d}', 'text': f'How would you design a rate limiter for an API serving {i + 2} regions?',
+        'category': profile['interests'][i % 3], 'difficulty': 'Intermediate',
+        'context': f"Assess candidate's understanding of {profile['interests'][i % 3]} concepts at intermediate level",
+        'source': 'openai'
+    } for i in range(count)]
+    return {'success': True, 'questions': questions, 'count': count, 'user_profile': profile}
+
+PAYLOADS = {
+    'frame': frame_analysis_payload,
+    'transcript': transcript_payload,
+    'questions': questions_payload
+}
+
+def encoders():
+    """name -> function(payload) -> bytes"""
+    found = {
+        'json-pretty': lambda p: json.dumps(p, indent=2, sort_keys=True).encode(),  # Flask debug-mode jsonify
+        'json-compact': lambda p: json.dumps(p, separators=(',', ':')).encode(),
+        'serialization.dumps': serialization.dumps
+    }
+    if serialization.MSGPACK_AVAILABLE:
+        found['msgpack'] = serialization.packb
+    return found
+
+def time_per_call(function, argument, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(argument)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def run(payload_names, repeat):
+    rows = []
+    for name in payload_names:
+        payload = PAYLOADS[name]()
+        for encoder_name, encode in encoders().items():
+            body = encode(payload)
+            row = {
+                'payload': name,
+                'encoder': encoder_name,
+                'bytes': len(body),
+                'encode_us': time_per_call(encode, payload, repeat),
+                'gzip_bytes': len(gzip.compress(body, compresslevel=5, mtime=0)),
+                'gzip_us': time_per_call(lambda b: gzip.compress(b, compresslevel=5, mtime=0), body, repeat // 10)
+            }
+            if serialization.BROTLI_AVAILABLE:
+                row['br_bytes'] = len(serialization.compress(body, 'br'))
+            rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark response serialization on typical payloads')
+    parser.add_argument('--payload', choices=sorted(PAYLOADS), action='append',
+                        help='Payload to measure (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=5000, help='Encodes per measurement')
+    args = parser.parse_args()
+
+    print(f"orjson: {serialization.ORJSON_AVAILABLE}, msgpack: {serialization.MSGPACK_AVAILABLE}, "
+          f"brotli: {serialization.BROTLI_AVAILABLE}\n")
+    print(f"{'payload':<11} {'encoder':<20} {'bytes':>7} {'encode µs':>10} {'gzip bytes':>11} {'gzip µs':>8}"
+          f"{' br bytes':>10}")
+    for row in run(args.payload or sorted(PAYLOADS), args.repeat):
+        print(f"{row['payload']:<11} {row['encoder']:<20} {row['bytes']:>7} {row['encode_us']:>10.2f} "
+              f"{row['gzip_bytes']:>11} {row['gzip_us']:>8.1f}{row.get('br_bytes', '-'):>10}")
+
+if __name__ == "__main__":
+    main()
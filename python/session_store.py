@@ -0,0 +1,496 @@
+"""
+EduNerve AI - Session State Store
+Session ownership, transcripts and proctoring counters shared by every worker
+
+A live STT session (its microphone capture and recognition callbacks) exists
+in exactly one worker process, its owner; so do adaptive interviews
+('adaptive:<session id>') and running batch transcription jobs
+('batch:<job id>'). The store records which worker owns
+each session, a snapshot of its transcript and its proctoring counters, so any
+worker can read a transcript, requests that must reach the owner can be routed
+there, and a session whose owner died or restarted can be resumed elsewhere.
+Records expire after SESSION_TTL seconds without activity.
+
+Forwarding needs an address that reaches one worker. Gunicorn workers share
+one listening socket, so under gunicorn.conf.py each worker also serves the
+app on a private port of its own (see wsgi.start_forwarding_listener) and
+advertises that. Without such an address (e.g. several uvicorn workers), a
+request for a session owned elsewhere gets 409 with X-Session-Owner, and
+the client must retry until it reaches the owner or the session expires.
+
+Backends:
+    MemorySessionBackend: one process (development, single worker)
+    RedisSessionBackend: shared by all workers and hosts (SESSION_REDIS_URL)
+    LocalRedis: in-process stand-in for the subset of the Redis API used here,
+        for exercising RedisSessionBackend without a server
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'edunerve:'
+
+try:
+    from redis import WatchError
+except ImportError:
+    class WatchError(Exception):
+        """A watched key changed before the transaction ran"""
+
+class SessionOwnedElsewhere(Exception):
+    """The session is owned by another live worker"""
+
+    def __init__(self, record):
+        super().__init__(f"Session {record['session_id']} is owned by worker {record['owner']}")
+        self.record = record
+
+class MemorySessionBackend:
+    """Process-local storage with per-key expiry"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}     # key -> (expires_at, value)
+
+    def _live(self, key):
+        entry = self._values.get(key)
+        if entry and entry[0] < time.time():
+            del self._values[key]
+            return None
+        return entry
+
+    def get_json(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return json.loads(entry[1]) if entry else None
+
+    def set_json(self, key, value, ttl, only_if_absent=False):
+        with self._lock:
+            if only_if_absent and self._live(key):
+                return False
+            self._values[key] = (time.time() + ttl, json.dumps(value))
+            return True
+
+    def replace_json(self, key, expected, value, ttl):
+        """Set a value only if the stored one still equals `expected` (None: absent); returns success"""
+        with self._lock:
+            entry = self._live(key)
+            if (json.loads(entry[1]) if entry else None) != expected:
+                return False
+            self._values[key] = (time.time() + ttl, json.dumps(value))
+            return True
+
+    def incr_fields(self, key, fields, ttl):
+        with self._lock:
+            entry = self._live(key)
+            counts = dict(entry[1]) if entry else {}
+            for field, amount in fields.items():
+                counts[field] = counts.get(field, 0) + amount
+            self._values[key] = (time.time() + ttl, counts)
+
+    def get_fields(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return dict(entry[1]) if entry else {}
+
+    def expire(self, key, ttl):
+        with self._lock:
+            entry = self._live(key)
+            if entry:
+                self._values[key] = (time.time() + ttl, entry[1])
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def scan(self, prefix):
+        with self._lock:
+            return [key for key in list(self._values) if key.startswith(prefix) and self._live(key)]
+
+class RedisSessionBackend:
+    """Storage in Redis, shared by every worker; counters use atomic hash increments"""
+
+    def __init__(self, client):
+        """
+        Args:
+            client: redis.Redis (with decode_responses=True) or LocalRedis
+        """
+        self.client = client
+
+    def get_json(self, key):
+        value = self.client.get(key)
+        return json.loads(value) if value else None
+
+    def set_json(self, key, value, ttl, only_if_absent=False):
+        return bool(self.client.set(key, json.dumps(value), px=int(ttl * 1000), nx=only_if_absent))
+
+    def replace_json(self, key, expected, value, ttl):
+        """Compare-and-set under WATCH: fails if the key changed since it was read"""
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                current = pipe.get(key)
+                if (json.loads(current) if current else None) != expected:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.set(key, json.dumps(value), px=int(ttl * 1000))
+                pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    def incr_fields(self, key, fields, ttl):
+        pipe = self.client.pipeline()
+        for field, amount in fields.items():
+            pipe.hincrby(key, field, amount)
+        pipe.pexpire(key, int(ttl * 1000))
+        pipe.execute()
+
+    def get_fields(self, key):
+        return {field: int(value) for field, value in self.client.hgetall(key).items()}
+
+    def expire(self, key, ttl):
+        self.client.pexpire(key, int(ttl * 1000))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*keys)
+
+    def scan(self, prefix):
+        return list(self.client.scan_iter(match=f'{prefix}*'))
+
+class LocalRedis:
+    """
+    In-process stand-in for the Redis commands RedisSessionBackend uses
+    (get, set with px/nx, hincrby, hgetall, pexpire, delete, scan_iter, and
+    pipelines with watch/multi)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = {}       # key -> value (str or dict for hashes)
+        self._expires = {}    # key -> expires_at
+        self._versions = {}   # key -> writes so far, for WATCH
+
+    def _touched(self, key):
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _purge(self, key):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            self._touched(key)
+
+    def get(self, key):
+        with self._lock:
+            self._purge(key)
+            return self._data.get(key)
+
+    def set(self, key, value, px=None, nx=False):
+        with self._lock:
+            self._purge(key)
+            if nx and key in self._data:
+                return None
+            self._data[key] = str(value)
+            self._expires.pop(key, None)
+            if px:
+                self._expires[key] = time.time() + px / 1000
+            self._touched(key)
+            return True
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            self._purge(key)
+            fields = self._data.setdefault(key, {})
+            fields[field] = str(int(fields.get(field, 0)) + amount)
+            self._touched(key)
+            return int(fields[field])
+
+    def hgetall(self, key):
+        with self._lock:
+            self._purge(key)
+            return dict(self._data.get(key) or {})
+
+    def pexpire(self, key, milliseconds):
+        with self._lock:
+            self._purge(key)
+            if key not in self._data:
+                return False
+            self._expires[key] = time.time() + milliseconds / 1000
+            self._touched(key)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            deleted = 0
+            for key in keys:
+                self._purge(key)
+                self._expires.pop(key, None)
+                deleted += self._data.pop(key, None) is not None
+                self._touched(key)
+            return deleted
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            for key in list(self._data):
+                self._purge(key)
+            return iter([key for key in self._data if fnmatch.fnmatchcase(key, match)])
+
+    def pipeline(self):
+        return _LocalPipeline(self)
+
+class _LocalPipeline:
+    """
+    Queues commands until execute(); after watch() commands run at once until
+    multi(), and execute() raises WatchError if a watched key was written since
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+        self._watched = {}
+        self._immediate = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.reset()
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        if self._immediate:
+            return method
+
+        def queue_call(*args, **kwargs):
+            self._calls.append((method, args, kwargs))
+            return self
+        return queue_call
+
+    def watch(self, *keys):
+        with self._client._lock:
+            for key in keys:
+                self._client._purge(key)
+                self._watched[key] = self._client._versions.get(key, 0)
+        self._immediate = True
+
+    def unwatch(self):
+        self._watched = {}
+        self._immediate = False
+
+    def multi(self):
+        self._immediate = False
+
+    def reset(self):
+        self._calls = []
+        self.unwatch()
+
+    def execute(self):
+        with self._client._lock:
+            try:
+                for key, version in self._watched.items():
+                    self._client._purge(key)
+                    if self._client._versions.get(key, 0) != version:
+                        raise WatchError(f'Watched key {key} changed')
+                return [method(*args, **kwargs) for method, args, kwargs in self._calls]
+            finally:
+                self.reset()
+
+class SessionStore:
+    """
+    Session records with an owning worker, transcript snapshots and proctoring counters.
+
+    Each worker refreshes a heartbeat key while it runs; a session whose owner
+    has no heartbeat (crashed, or restarted and released it) can be claimed by
+    any worker, which resumes it from the stored transcript.
+    """
+
+    def __init__(self, backend=None, worker_id=None, address=None, ttl=1800, heartbeat_interval=10):
+        """
+        Args:
+            backend: MemorySessionBackend (default) or RedisSessionBackend
+            worker_id (str): This worker's id; defaults to hostname:pid
+            address (str): Base URL other workers can forward requests to (optional)
+            ttl (float): Seconds an idle session record is kept
+            heartbeat_interval (float): Seconds between worker heartbeats
+        """
+        self.backend = backend or MemorySessionBackend()
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.address = address
+        self.ttl = ttl
+        self.heartbeat_interval = heartbeat_interval
+        self._stats = {'claimed': 0, 'resumed': 0, 'conflicts': 0, 'released': 0}
+        self._stop = threading.Event()
+        self._heartbeat()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name='session-heartbeat',
+                                                  daemon=True)
+        self._heartbeat_thread.start()
+
+    @staticmethod
+    def _key(kind, name):
+        return f'{KEY_PREFIX}{kind}:{name}'
+
+    def _heartbeat(self):
+        self.backend.set_json(self._key('worker', self.worker_id),
+                              {'address': self.address, 'at': time.time()}, ttl=3 * self.heartbeat_interval)
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self._heartbeat()
+            except Exception as e:
+                logger.warning("Session heartbeat failed: %s", e, extra={'sample_key': 'session_heartbeat'})
+
+    def set_address(self, address):
+        """Advertise the URL other workers forward this worker's session requests to"""
+        self.address = address
+        self._heartbeat()
+
+    def worker_alive(self, worker_id):
+        return worker_id == self.worker_id or self.backend.get_json(self._key('worker', worker_id)) is not None
+
+    def is_owner(self, record):
+        return record is not None and record.get('owner') == self.worker_id
+
+    def get_record(self, session_id):
+        """Session record, or None when unknown or expired"""
+        return self.backend.get_json(self._key('session', session_id))
+
+    def claim(self, session_id, kind='stt', **data):
+        """
+        Make this worker the owner of a session
+
+        Returns:
+            dict: The record; 'resumed' is True when a session left active by a dead or
+                restarted worker was taken over (its stored transcript should be restored)
+
+        Raises:
+            SessionOwnedElsewhere: Another live worker owns the session
+        """
+        key = self._key('session', session_id)
+        record = {'session_id': session_id, 'kind': kind, 'owner': self.worker_id, 'address': self.address,
+                  'status': 'active', 'created_at': time.time(), 'resumed': False, **data}
+        while True:
+            if self.backend.set_json(key, record, self.ttl, only_if_absent=True):
+                self._stats['claimed'] += 1
+                return record
+
+            existing = self.backend.get_json(key)
+            if existing is None:
+                continue    # expired or deleted since the set failed
+            owner = existing.get('owner')
+            if owner and owner != self.worker_id and self.worker_alive(owner):
+                self._stats['conflicts'] += 1
+                raise SessionOwnedElsewhere(existing)
+
+            # Sessions whose owner died or was shut down continue; stopped ones start over
+            record['resumed'] = owner != self.worker_id and existing.get('status') in ('active', 'interrupted')
+            record['created_at'] = existing.get('created_at', record['created_at'])
+            # Only one worker may take over: the record must still be the one judged above
+            if self.backend.replace_json(key, existing, record, self.ttl):
+                break
+
+        if not record['resumed']:
+            self.backend.delete(self._key('transcript', session_id))
+        self._stats['resumed' if record['resumed'] else 'claimed'] += 1
+        return record
+
+    def owned_record(self, session_id):
+        """
+        Record of a session this worker may act on
+
+        Returns:
+            dict: The record, or None when the session is unknown
+
+        Raises:
+            SessionOwnedElsewhere: Another live worker owns the session
+        """
+        record = self.get_record(session_id)
+        if record and record.get('owner') and not self.is_owner(record) and self.worker_alive(record['owner']):
+            raise SessionOwnedElsewhere(record)
+        return record
+
+    def touch(self, session_id):
+        """Keep a session's record, transcript and counters from expiring"""
+        for kind in ('session', 'transcript', 'proctoring'):
+            self.backend.expire(self._key(kind, session_id), self.ttl)
+
+    def release(self, session_id, status='stopped', **data):
+        """Give up ownership; the record (with any `data` added) and transcript stay readable until they expire"""
+        record = self.get_record(session_id)
+        if record is None:
+            return None
+        record.update(owner=None, address=None, status=status, released_at=time.time(), **data)
+        self.backend.set_json(self._key('session', session_id), record, self.ttl)
+        self._stats['released'] += 1
+        return record
+
+    def delete(self, session_id):
+        self.backend.delete(*(self._key(kind, session_id) for kind in ('session', 'transcript', 'proctoring')))
+
+    def save_transcript(self, session_id, buffer):
+        """Store a snapshot of a TranscriptBuffer"""
+        self.backend.set_json(self._key('transcript', session_id), buffer.snapshot(), self.ttl)
+
+    def load_transcript(self, session_id):
+        """Stored transcript snapshot ('segments', 'offset', 'text'), or None"""
+        return self.backend.get_json(self._key('transcript', session_id))
+
+    def record_alerts(self, session_id, alerts):
+        """Count one analyzed frame and its alerts by type"""
+        fields = {'frames': 1}
+        for alert in alerts:
+            fields[alert['type']] = fields.get(alert['type'], 0) + 1
+        self.backend.incr_fields(self._key('proctoring', session_id), fields, self.ttl)
+
+    def get_proctoring(self, session_id):
+        """Frame and alert counts of a session"""
+        return self.backend.get_fields(self._key('proctoring', session_id))
+
+    def active_sessions(self):
+        prefix = self._key('session', '')
+        return [key[len(prefix):] for key in self.backend.scan(prefix)]
+
+    def get_stats(self):
+        return {'worker_id': self.worker_id, 'backend': type(self.backend).__name__, 'ttl': self.ttl,
+                **self._stats}
+
+    def shutdown(self):
+        """Stop the heartbeat and mark this worker gone, so its sessions can be resumed at once"""
+        self._stop.set()
+        self.backend.delete(self._key('worker', self.worker_id))
+
+def create_session_store_from_env():
+    """
+    Build the session store configured by environment variables
+
+    SESSION_STORE: memory (default), redis (SESSION_REDIS_URL) or local-redis (stand-in)
+    SESSION_TTL seconds (1800), SESSION_HEARTBEAT seconds (10)
+    WORKER_ADDRESS: URL other workers can reach this one at, enabling request forwarding
+
+    Returns:
+        SessionStore
+    """
+    kind = os.getenv('SESSION_STORE', 'memory').lower()
+    if kind == 'redis':
+        import redis
+        backend = RedisSessionBackend(redis.Redis.from_url(os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0'),
+                                                           decode_responses=True))
+    elif kind == 'local-redis':
+        backend = RedisSessionBackend(LocalRedis())
+    else:
+        backend = MemorySessionBackend()
+    return SessionStore(
+        backend,
+        address=os.getenv('WORKER_ADDRESS') or None,
+        ttl=float(os.getenv('SESSION_TTL', 1800)),
+        heartbeat_interval=float(os.getenv('SESSION_HEARTBEAT', 10))
+    )
@@ -3,75 +3,165 @@ EduNerve AI - Speech Recognition for User Answers
 Listens to user's spoken answers and converts to text
 """
 
+import logging
 import speech_recognition as sr
 import threading
 import time
+from logging_setup import bind_context
+from stt_scheduler import RecognitionScheduler
+from voice_activity import VoiceActivityDetector, StreamingSegmenter
+from transcript_store import TranscriptBuffer
+from stt_backends import create_audio_source, get_backend
+
+logger = logging.getLogger(__name__)
 
 class AnswerListener:
-    def __init__(self):
+    def __init__(self, session_id='default', scheduler=None, backend=None, audio_source=None):
+        """
+        Args:
+            session_id (str): Session this listener records for
+            scheduler (RecognitionScheduler): Shared recognition pool; a private
+                single-worker pool is created when omitted
+            backend (RecognizerBackend): Recognizer to use; selected by STT_BACKEND when omitted
+            audio_source (sr.AudioSource): Audio input; the microphone (or STT_AUDIO_SOURCE fixtures) when omitted
+        """
+        self.session_id = session_id
+        self.scheduler = scheduler or RecognitionScheduler(num_workers=1)
+        self.backend = backend or get_backend()
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = audio_source or create_audio_source()
         self.is_listening = False
-        self.current_transcript = ""
+        self.transcript = TranscriptBuffer()
+        self.callback = None
+        self.segmenter = None
+        self._capture_thread = None
         
         # Adjust for ambient noise
         with self.microphone as source:
-            print("Calibrating for ambient noise... Please wait.")
+            logger.debug("Calibrating for ambient noise", extra={'session_id': session_id})
             self.recognizer.adjust_for_ambient_noise(source, duration=2)
-            print("Calibration complete!")
+            logger.debug("Calibration complete", extra={'session_id': session_id})
     
     def start_listening(self, callback=None):
         """
-        Start continuous listening in a background thread
-        
+        Start capturing audio in a background thread
+
+        Audio is segmented by voice activity detection and only voiced utterances
+        are queued on the shared recognition scheduler, so this thread only
+        records and never blocks on the recognition service.
+
         Args:
             callback (function): Function to call with recognized text
         """
+        self.callback = callback
         self.is_listening = True
-        
-        def listen_thread():
+        self.scheduler.register_session(self.session_id, self._recognize_segment)
+
+        def capture_thread():
             while self.is_listening:
                 try:
                     with self.microphone as source:
-                        print("Listening...")
-                        audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=30)
-                        
-                        try:
-                            # Recognize speech using Google Speech Recognition
-                            text = self.recognizer.recognize_google(audio)
-                            print(f"Recognized: {text}")
-                            
-                            self.current_transcript += " " + text
-                            
-                            if callback:
-                                callback(text)
-                                
-                        except sr.UnknownValueError:
-                            print("Could not understand audio")
-                        except sr.RequestError as e:
-                            print(f"Could not request results; {e}")
-                            
-                except sr.WaitTimeoutError:
-                    continue
+                        self.segmenter = StreamingSegmenter(VoiceActivityDetector(
+                            sample_rate=source.SAMPLE_RATE,
+                            energy_threshold=self.recognizer.energy_threshold
+                        ))
+                        while self.is_listening:
+                            chunk = source.stream.read(source.CHUNK)
+                            for segment in self.segmenter.feed(chunk):
+                                self._submit_segment(segment, source)
+                        for segment in self.segmenter.flush():
+                            self._submit_segment(segment, source)
                 except Exception as e:
-                    print(f"Error in listening: {e}")
-        
-        # Start listening in background thread
-        thread = threading.Thread(target=listen_thread, daemon=True)
-        thread.start()
-    
+                    logger.warning("Error in listening: %s", e, extra={'session_id': self.session_id})
+                    time.sleep(1)
+
+        self._capture_thread = threading.Thread(target=capture_thread, name=f"stt-capture-{self.session_id}",
+                                                daemon=True)
+        self._capture_thread.start()
+
+    def _submit_segment(self, segment, source):
+        """Queue one voiced utterance for recognition"""
+        segment_id = self.transcript.open_segment(segment['start'], segment['end'])
+        audio = sr.AudioData(segment['audio'], source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        if not self.scheduler.submit(self.session_id, (segment_id, audio)):
+            self.transcript.finalize_segment(segment_id, '', 0.0)
+            logger.warning("Dropped audio segment", extra={'session_id': self.session_id,
+                                                           'sample_key': 'stt_dropped'})
+
+    def _recognize_segment(self, job):
+        """Recognize one voiced segment (runs on a scheduler worker)"""
+        segment_id, audio = job
+        with bind_context(session_id=self.session_id):
+            try:
+                text, confidence = self.backend.recognize(audio)
+                logger.debug("Recognized: %s", text, extra={'segment_id': segment_id, 'confidence': confidence,
+                                                            'sample_key': 'stt_recognized'})
+
+                self.transcript.finalize_segment(segment_id, text, confidence)
+
+                if self.callback:
+                    self.callback(text)
+
+            except sr.UnknownValueError:
+                logger.debug("Could not understand audio", extra={'segment_id': segment_id,
+                                                                 'sample_key': 'stt_unintelligible'})
+                self.transcript.finalize_segment(segment_id, '', 0.0)
+            except sr.RequestError as e:
+                logger.warning("Could not request results; %s", e, extra={'sample_key': 'stt_request_error'})
+                self.transcript.finalize_segment(segment_id, '', None)
+                raise
+
+    def stop_capture(self, timeout=2.0):
+        """
+        Stop recording but keep the session registered, so the utterance in
+        progress is flushed and already queued segments are still recognized
+        """
+        self.is_listening = False
+        if self._capture_thread:
+            self._capture_thread.join(timeout)
+
     def stop_listening(self):
         """Stop the continuous listening"""
         self.is_listening = False
-        print("Stopped listening")
+        self.scheduler.unregister_session(self.session_id)
+        logger.info("Stopped listening", extra={'session_id': self.session_id})
     
     def get_transcript(self):
         """Get the current transcript"""
-        return self.current_transcript.strip()
+        return self.transcript.get_text()
     
+    def get_segments(self):
+        """
+        Get utterance segments detected so far
+
+        Returns:
+            list: Segment dicts with 'start'/'end' in seconds from the start of listening,
+                'text', 'confidence' and 'is_final'; an utterance still being spoken is
+                reported last with 'end' None
+        """
+        segments = self.transcript.segments()
+        if self.segmenter and self.segmenter.in_speech:
+            segments.append({'start': round(self.segmenter.speech_started_at, 3), 'end': None,
+                             'text': '', 'confidence': None, 'is_final': False})
+        return segments
+
+    def get_updates(self, offset=0):
+        """
+        Get segments added or recognized since an offset
+
+        Args:
+            offset (int): Offset returned by the previous poll (0 for everything)
+
+        Returns:
+            dict: 'segments', the new 'offset', and 'speaking' while an utterance is open
+        """
+        updates = self.transcript.since(offset)
+        updates['speaking'] = bool(self.segmenter and self.segmenter.in_speech)
+        return updates
+
     def clear_transcript(self):
         """Clear the current transcript"""
-        self.current_transcript = ""
+        self.transcript.clear()
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+"""
+EduNerve AI - Speech Recognition Backends
+Pluggable recognizers: Google Web Speech, local Whisper, and a deterministic fake,
+plus a WAV fixture audio source that stands in for the microphone
+"""
+
+import glob
+import hashlib
+import math
+import os
+import random
+import threading
+import time
+import wave
+import speech_recognition as sr
+
+class RecognizerBackend:
+    """Base class; recognize() returns (text, confidence) or raises sr.UnknownValueError"""
+
+    name = 'base'
+
+    def recognize(self, audio):
+        """
+        Transcribe one utterance
+
+        Args:
+            audio (sr.AudioData): Voiced segment
+
+        Returns:
+            tuple: (text, confidence) where confidence is between 0 and 1, or None
+        """
+        raise NotImplementedError
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (network)"""
+
+    name = 'google'
+
+    def __init__(self, language='en-US'):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio):
+        result = self.recognizer.recognize_google(audio, language=self.language, show_all=True)
+        if not result or not result.get('alternative'):
+            raise sr.UnknownValueError()
+
+        best = result['alternative'][0]
+        return best['transcript'], best.get('confidence')
+
+class WhisperBackend(RecognizerBackend):
+    """On-box Whisper model (requires the openai-whisper package)"""
+
+    name = 'whisper'
+
+    def __init__(self, model='base.en', language='english'):
+        self.model = model
+        self.language = language
+        self.recognizer = sr.Recognizer()
+        # Whisper models are not safe to run from several threads at once
+        self._lock = threading.Lock()
+
+    def recognize(self, audio):
+        with self._lock:
+            result = self.recognizer.recognize_whisper(audio, model=self.model, language=self.language,
+                                                       show_dict=True)
+
+        text = result.get('text', '').strip()
+        if not text:
+            raise sr.UnknownValueError()
+
+        # Average per-token log probability of the decoded segments, mapped to 0-1
+        logprobs = [s['avg_logprob'] for s in result.get('segments', []) if 'avg_logprob' in s]
+        confidence = round(math.exp(sum(logprobs) / len(logprobs)), 3) if logprobs else None
+        return text, confidence
+
+class FakeBackend(RecognizerBackend):
+    """
+    Deterministic offline stand-in for tests and load tests.
+
+    The transcript is derived from a hash of the audio bytes, with roughly
+    words_per_second words per second of audio, so the same segment always
+    produces the same text and confidence.
+    """
+
+    name = 'fake'
+
+    VOCABULARY = [
+        'the', 'algorithm', 'uses', 'a', 'hash', 'map', 'to', 'store', 'values', 'and',
+        'then', 'we', 'iterate', 'over', 'list', 'which', 'gives', 'linear', 'time',
+        'complexity', 'because', 'each', 'lookup', 'is', 'constant', 'model', 'data',
+        'training', 'request', 'server', 'cache', 'query', 'function', 'returns', 'result'
+    ]
+
+    def __init__(self, latency_ms=0, words_per_second=2.5, transcripts=None):
+        """
+        Args:
+            latency_ms (float): Simulated recognition time per segment
+            words_per_second (float): Speaking rate used to size the fake transcript
+            transcripts (dict): Optional sha1-of-audio -> text overrides
+        """
+        self.latency_ms = latency_ms
+        self.words_per_second = words_per_second
+        self.transcripts = transcripts or {}
+
+    def recognize(self, audio):
+        raw = audio.get_raw_data()
+        digest = hashlib.sha1(raw).hexdigest()
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        if digest in self.transcripts:
+            return self.transcripts[digest], 1.0
+
+        duration = len(raw) / (audio.sample_rate * audio.sample_width)
+        num_words = int(duration * self.words_per_second)
+        if num_words == 0:
+            raise sr.UnknownValueError()
+
+        seed = int(digest[:8], 16)
+        words = [self.VOCABULARY[(seed + i * 7919) % len(self.VOCABULARY)] for i in range(num_words)]
+        confidence = round(0.6 + (seed % 400) / 1000, 3)
+        return ' '.join(words), confidence
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'whisper': WhisperBackend,
+    'fake': FakeBackend
+}
+
+def get_backend(name=None):
+    """
+    Create the configured recognizer backend
+
+    Args:
+        name (str): Backend name; defaults to the STT_BACKEND environment variable, then 'google'
+
+    Returns:
+        RecognizerBackend: Backend instance
+    """
+    name = (name or os.getenv('STT_BACKEND', 'google')).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+
+    if name == 'whisper':
+        return WhisperBackend(model=os.getenv('STT_WHISPER_MODEL', 'base.en'))
+    if name == 'fake':
+        return FakeBackend(latency_ms=float(os.getenv('STT_FAKE_LATENCY_MS', 0)))
+    return GoogleBackend(language=os.getenv('STT_LANGUAGE', 'en-US'))
+
+class FixtureAudioSource(sr.AudioSource):
+    """
+    Microphone stand-in that plays WAV fixtures in a loop, in real time.
+
+    Each source starts at a random position, so concurrent sessions send
+    different audio (and get different fake transcripts).
+    """
+
+    CHUNK = 1024
+
+    def __init__(self, path, realtime=True):
+        """
+        Args:
+            path (str): WAV file or directory of WAV files (mono, 16-bit, same sample rate)
+            realtime (bool): Pace reads to the audio's duration, like a live microphone
+        """
+        files = sorted(glob.glob(os.path.join(path, '*.wav'))) if os.path.isdir(path) else [path]
+        if not files:
+            raise ValueError(f'No WAV fixtures in {path}')
+        frames = []
+        for file in files:
+            with wave.open(file, 'rb') as wav:
+                self.SAMPLE_RATE = wav.getframerate()
+                self.SAMPLE_WIDTH = wav.getsampwidth()
+                frames.append(wav.readframes(wav.getnframes()))
+        self.audio = b''.join(frames)
+        self.realtime = realtime
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = _FixtureStream(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+class _FixtureStream:
+    def __init__(self, source):
+        self.source = source
+        frame_bytes = source.SAMPLE_WIDTH
+        self.position = random.randrange(len(source.audio) // frame_bytes) * frame_bytes
+        self.started = time.monotonic()
+        self.frames_read = 0
+
+    def read(self, frames):
+        source = self.source
+        size = frames * source.SAMPLE_WIDTH
+        chunk = b''
+        while len(chunk) < size:
+            piece = source.audio[self.position:self.position + size - len(chunk)]
+            chunk += piece
+            self.position = (self.position + len(piece)) % len(source.audio)
+        self.frames_read += frames
+        if source.realtime:
+            ahead = self.frames_read / source.SAMPLE_RATE - (time.monotonic() - self.started)
+            if ahead > 0:
+                time.sleep(ahead)
+        return chunk
+
+def create_audio_source():
+    """
+    Audio input for live sessions
+
+    STT_AUDIO_SOURCE set to a WAV file or directory replays fixtures instead of
+    opening the microphone (load tests, servers without audio hardware).
+    """
+    path = os.getenv('STT_AUDIO_SOURCE')
+    if path:
+        return FixtureAudioSource(path)
+    return sr.Microphone()
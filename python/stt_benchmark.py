@@ -0,0 +1,154 @@
+"""
+EduNerve AI - STT Backend Benchmark
+Times recognizer backends on bundled WAV fixtures without a microphone
+
+Usage:
+    python stt_benchmark.py --backend fake --concurrency 8 --repeat 20
+    python stt_benchmark.py --backend whisper --fixtures fixtures/audio
+    python stt_benchmark.py --make-fixtures
+"""
+
+import argparse
+import glob
+import os
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import speech_recognition as sr
+from stt_backends import get_backend
+from voice_activity import VoiceActivityDetector
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'audio')
+
+def make_fixture(path, utterances, sample_rate=16000, seed=0):
+    """
+    Write a synthetic speech-like WAV: voiced harmonic bursts separated by low noise
+
+    Args:
+        path (str): Output file
+        utterances (list): Durations in seconds of each voiced burst
+        sample_rate (int): Output sample rate
+        seed (int): Noise seed so fixtures are reproducible
+    """
+    rng = np.random.default_rng(seed)
+    pieces = []
+    for duration in utterances:
+        pieces.append(rng.normal(0, 30, int(0.6 * sample_rate)))
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        pitch = 120 + 40 * np.sin(2 * np.pi * 0.7 * t)
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3 * t))   # syllable-rate modulation
+        pieces.append(2500 * voiced * envelope + rng.normal(0, 30, len(t)))
+    pieces.append(rng.normal(0, 30, int(0.6 * sample_rate)))
+
+    samples = np.clip(np.concatenate(pieces), -32768, 32767).astype(np.int16)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+def make_fixtures(directory=FIXTURE_DIR):
+    """Regenerate the bundled fixtures"""
+    os.makedirs(directory, exist_ok=True)
+    make_fixture(os.path.join(directory, 'short_answer.wav'), [0.8, 1.2], seed=1)
+    make_fixture(os.path.join(directory, 'long_answer.wav'), [1.5, 0.6, 2.0], seed=2)
+    print(f"✅ Fixtures written to {directory}")
+
+def load_segments(path, detector_kwargs=None):
+    """
+    Read a WAV file and cut it into voiced segments
+
+    Returns:
+        list: sr.AudioData for every detected utterance
+    """
+    with sr.AudioFile(path) as source:
+        audio = sr.Recognizer().record(source)
+
+    raw = audio.get_raw_data(convert_width=2)
+    vad = VoiceActivityDetector(sample_rate=audio.sample_rate, **(detector_kwargs or {}))
+    return [
+        sr.AudioData(raw[seg['start_sample'] * 2:seg['end_sample'] * 2], audio.sample_rate, 2)
+        for seg in vad.detect_segments(raw)
+    ]
+
+def run_benchmark(backend, segments, concurrency=1, repeat=1):
+    """
+    Recognize every segment `repeat` times on `concurrency` threads
+
+    Returns:
+        dict: Throughput and latency summary
+    """
+    jobs = segments * repeat
+    audio_seconds = sum(len(s.get_raw_data()) / (s.sample_rate * s.sample_width) for s in jobs)
+    latencies = []
+    failures = 0
+
+    def recognize(segment):
+        started = time.perf_counter()
+        try:
+            backend.recognize(segment)
+            ok = True
+        except (sr.UnknownValueError, sr.RequestError):
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, ok in pool.map(recognize, jobs):
+            latencies.append(latency)
+            failures += 0 if ok else 1
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'backend': backend.name,
+        'segments': len(jobs),
+        'failures': failures,
+        'audio_seconds': round(audio_seconds, 2),
+        'wall_seconds': round(wall, 3),
+        'segments_per_second': round(len(jobs) / wall, 1) if wall else 0,
+        'real_time_factor': round(wall / audio_seconds, 4) if audio_seconds else 0,
+        'latency_ms': {
+            'p50': round(latencies[len(latencies) // 2] * 1000, 1),
+            'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+            'max': round(latencies[-1] * 1000, 1)
+        } if latencies else {}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark STT backends on WAV fixtures')
+    parser.add_argument('--backend', default=None, help='google, whisper or fake (default: STT_BACKEND)')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='Directory of .wav files')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--make-fixtures', action='store_true', help='Regenerate the bundled fixtures and exit')
+    args = parser.parse_args()
+
+    if args.make_fixtures:
+        make_fixtures(args.fixtures)
+        return
+
+    paths = sorted(glob.glob(os.path.join(args.fixtures, '*.wav')))
+    if not paths:
+        print(f"⚠️  No WAV fixtures in {args.fixtures}; run with --make-fixtures")
+        return
+
+    segments = []
+    for path in paths:
+        file_segments = load_segments(path)
+        print(f"🎙️  {os.path.basename(path)}: {len(file_segments)} voiced segments")
+        segments.extend(file_segments)
+
+    backend = get_backend(args.backend)
+    result = run_benchmark(backend, segments, concurrency=args.concurrency, repeat=args.repeat)
+
+    print(f"\n📊 Backend: {result['backend']}")
+    for key, value in result.items():
+        if key != 'backend':
+            print(f"   {key}: {value}")
+
+if __name__ == "__main__":
+    main()
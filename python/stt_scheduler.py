@@ -0,0 +1,265 @@
+"""
+EduNerve AI - Shared Speech Recognition Scheduler
+Runs recognition for every STT session on one fixed pool of worker threads
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class RecognitionScheduler:
+    def __init__(self, num_workers=4, max_sessions=200, max_pending_per_session=16,
+                 idle_timeout=300, reap_interval=15, on_evict=None):
+        """
+        Args:
+            num_workers (int): Number of recognition worker threads shared by all sessions
+            max_sessions (int): Maximum number of registered sessions
+            max_pending_per_session (int): Segments a session may have queued before new ones are dropped
+            idle_timeout (float): Seconds without activity before a session is evicted
+            reap_interval (float): Seconds between idle session sweeps
+            on_evict (function): Called with the session id of every evicted session
+        """
+        self.num_workers = num_workers
+        self.max_sessions = max_sessions
+        self.max_pending_per_session = max_pending_per_session
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self.on_evict = on_evict
+
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._sessions = {}     # session_id -> {'handler', 'pending', 'last_active'}
+        self._ready = deque()   # round-robin order of sessions that have pending segments
+        self._running = True
+
+        # Metrics
+        self._latencies = deque(maxlen=1000)
+        self._queue_waits = deque(maxlen=1000)
+        self._counters = {
+            'submitted': 0,
+            'recognized': 0,
+            'failed': 0,
+            'dropped': 0,
+            'evicted': 0
+        }
+
+        self._workers = []
+        for i in range(num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"stt-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        self._reaper = threading.Thread(target=self._reaper_loop, name="stt-reaper", daemon=True)
+        self._reaper.start()
+
+    def register_session(self, session_id, handler):
+        """
+        Register a session and the function that recognizes its segments
+
+        Args:
+            session_id (str): Session identifier
+            handler (function): Called with each queued segment on a worker thread
+        """
+        with self._lock:
+            if session_id not in self._sessions and len(self._sessions) >= self.max_sessions:
+                raise RuntimeError('Too many active speech recognition sessions')
+            self._sessions[session_id] = {
+                'handler': handler,
+                'pending': deque(),
+                'last_active': time.monotonic()
+            }
+
+    def unregister_session(self, session_id):
+        """Remove a session and discard its pending segments"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def has_session(self, session_id):
+        with self._lock:
+            return session_id in self._sessions
+
+    def touch(self, session_id):
+        """Mark a session as active so it is not evicted"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session:
+                session['last_active'] = time.monotonic()
+
+    def submit(self, session_id, segment):
+        """
+        Queue an utterance segment for recognition
+
+        Args:
+            session_id (str): Session the segment belongs to
+            segment: Audio passed unchanged to the session handler
+
+        Returns:
+            bool: False if the segment was dropped
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or len(session['pending']) >= self.max_pending_per_session:
+                self._counters['dropped'] += 1
+                return False
+
+            if not session['pending']:
+                self._ready.append(session_id)
+            session['pending'].append((segment, time.monotonic()))
+            session['last_active'] = time.monotonic()
+            self._counters['submitted'] += 1
+            self._work_available.notify()
+            return True
+
+    def _next_job(self):
+        """Pop one segment, rotating across sessions so none can starve the others"""
+        while self._running:
+            while self._ready:
+                session_id = self._ready.popleft()
+                session = self._sessions.get(session_id)
+                if session is None or not session['pending']:
+                    continue
+
+                segment, enqueued_at = session['pending'].popleft()
+                if session['pending']:
+                    self._ready.append(session_id)
+                self._in_flight += 1
+                return session['handler'], segment, enqueued_at
+
+            self._work_available.wait()
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+            if job is None:
+                return
+
+            handler, segment, enqueued_at = job
+            started = time.monotonic()
+            try:
+                handler(segment)
+                outcome = 'recognized'
+            except Exception as e:
+                logger.warning("Error in recognition worker: %s", e, extra={'sample_key': 'stt_worker_error'})
+                outcome = 'failed'
+            finished = time.monotonic()
+
+            with self._lock:
+                self._counters[outcome] += 1
+                self._queue_waits.append(started - enqueued_at)
+                self._latencies.append(finished - started)
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def _reaper_loop(self):
+        while self._running:
+            time.sleep(self.reap_interval)
+            self.evict_idle()
+
+    def evict_idle(self):
+        """
+        Evict sessions that have been idle longer than idle_timeout
+
+        Returns:
+            list: Evicted session ids
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            evicted = [sid for sid, s in self._sessions.items() if s['last_active'] < cutoff]
+            for session_id in evicted:
+                del self._sessions[session_id]
+            self._counters['evicted'] += len(evicted)
+
+        for session_id in evicted:
+            logger.info("Evicting idle speech recognition session", extra={'session_id': session_id})
+            if self.on_evict:
+                try:
+                    self.on_evict(session_id)
+                except Exception as e:
+                    logger.warning("Error evicting session: %s", e, extra={'session_id': session_id})
+        return evicted
+
+    def get_metrics(self):
+        """Get queue depth, latency and throughput metrics"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = sorted(self._queue_waits)
+            return {
+                'workers': self.num_workers,
+                'active_sessions': len(self._sessions),
+                'queue_depth': sum(len(s['pending']) for s in self._sessions.values()),
+                'sessions_waiting': len(self._ready),
+                **self._counters,
+                'recognition_latency_ms': _summarize(latencies),
+                'queue_wait_ms': _summarize(waits)
+            }
+
+    def drain(self, timeout=None):
+        """
+        Wait until every queued segment has been recognized
+
+        Args:
+            timeout (float): Seconds to wait at most (None waits indefinitely)
+
+        Returns:
+            bool: True if the queue emptied in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._in_flight or any(s['pending'] for s in self._sessions.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def shutdown(self):
+        """Stop the workers after their current segment"""
+        with self._lock:
+            self._running = False
+            self._work_available.notify_all()
+
+def _summarize(sorted_seconds):
+    if not sorted_seconds:
+        return {'count': 0, 'avg': 0, 'p50': 0, 'p95': 0, 'max': 0}
+
+    def pct(p):
+        return round(sorted_seconds[min(len(sorted_seconds) - 1, int(p * len(sorted_seconds)))] * 1000, 1)
+
+    return {
+        'count': len(sorted_seconds),
+        'avg': round(sum(sorted_seconds) / len(sorted_seconds) * 1000, 1),
+        'p50': pct(0.50),
+        'p95': pct(0.95),
+        'max': round(sorted_seconds[-1] * 1000, 1)
+    }
+
+# Example usage
+if __name__ == "__main__":
+    import random
+
+    def make_handler(session_id):
+        def handle(segment):
+            time.sleep(random.uniform(0.01, 0.05))
+            print(f"[{session_id}] recognized segment {segment}")
+        return handle
+
+    scheduler = RecognitionScheduler(num_workers=2, idle_timeout=1, reap_interval=0.5,
+                                     on_evict=lambda sid: print(f"Evicted {sid}"))
+    for sid in ['alice', 'bob']:
+        scheduler.register_session(sid, make_handler(sid))
+
+    # alice floods the queue, bob submits a single segment; bob is still served promptly
+    for i in range(10):
+        scheduler.submit('alice', i)
+    scheduler.submit('bob', 0)
+
+    time.sleep(2)
+    print(scheduler.get_metrics())
+    scheduler.shutdown()
@@ -0,0 +1,138 @@
+"""
+Session store behaviour on the in-process backend and on RedisSessionBackend
+over the LocalRedis stand-in
+"""
+
+import threading
+import time
+import pytest
+from session_store import (LocalRedis, MemorySessionBackend, RedisSessionBackend, SessionOwnedElsewhere,
+                           SessionStore)
+
+@pytest.fixture(params=['memory', 'local-redis'])
+def backend(request):
+    if request.param == 'memory':
+        return MemorySessionBackend()
+    return RedisSessionBackend(LocalRedis())
+
+@pytest.fixture
+def workers(backend):
+    """Two workers sharing one backend"""
+    first = SessionStore(backend, worker_id='worker-a', address='http://a', ttl=30, heartbeat_interval=5)
+    second = SessionStore(backend, worker_id='worker-b', address='http://b', ttl=30, heartbeat_interval=5)
+    yield first, second
+    first.shutdown()
+    second.shutdown()
+
+def test_claim_records_owner_and_address(workers):
+    first, _ = workers
+    record = first.claim('s1')
+    assert record['owner'] == 'worker-a'
+    assert record['address'] == 'http://a'
+    assert not record['resumed']
+    assert first.get_record('s1')['owner'] == 'worker-a'
+    assert first.active_sessions() == ['s1']
+
+def test_claim_conflicts_while_owner_is_alive(workers):
+    first, second = workers
+    first.claim('s1')
+    with pytest.raises(SessionOwnedElsewhere) as error:
+        second.claim('s1')
+    assert error.value.record['owner'] == 'worker-a'
+    with pytest.raises(SessionOwnedElsewhere):
+        second.owned_record('s1')
+    # The owner may claim its own session again
+    assert first.claim('s1')['owner'] == 'worker-a'
+
+def test_takeover_after_owner_shutdown_resumes_transcript(workers):
+    first, second = workers
+    first.claim('s1')
+    first.backend.set_json(first._key('transcript', 's1'), {'segments': [], 'offset': 3, 'text': 'so far'}, 30)
+    first.release('s1', status='interrupted')
+    first.shutdown()
+
+    record = second.claim('s1')
+    assert record['owner'] == 'worker-b'
+    assert record['resumed']
+    assert second.load_transcript('s1')['text'] == 'so far'
+
+def test_claim_of_stopped_session_starts_over(workers):
+    first, second = workers
+    first.claim('s1')
+    first.backend.set_json(first._key('transcript', 's1'), {'segments': [], 'offset': 1, 'text': 'old'}, 30)
+    first.release('s1')
+
+    record = second.claim('s1')
+    assert not record['resumed']
+    assert second.load_transcript('s1') is None
+
+def test_record_alerts_counts_frames_and_alert_types(workers):
+    first, second = workers
+    first.record_alerts('s1', [{'type': 'looking_away'}])
+    second.record_alerts('s1', [{'type': 'looking_away'}, {'type': 'no_face'}])
+    second.record_alerts('s1', [])
+    assert first.get_proctoring('s1') == {'frames': 3, 'looking_away': 2, 'no_face': 1}
+
+def test_records_expire_after_ttl(backend):
+    store = SessionStore(backend, worker_id='worker-a', ttl=0.2, heartbeat_interval=5)
+    try:
+        store.claim('s1')
+        store.record_alerts('s1', [{'type': 'no_face'}])
+        time.sleep(0.1)
+        store.touch('s1')
+        time.sleep(0.15)
+        assert store.get_record('s1') is not None
+        time.sleep(0.2)
+        assert store.get_record('s1') is None
+        assert store.get_proctoring('s1') == {}
+        assert store.active_sessions() == []
+    finally:
+        store.shutdown()
+
+def test_dead_worker_heartbeat_expires(backend):
+    first = SessionStore(backend, worker_id='worker-a', ttl=30, heartbeat_interval=0.05)
+    second = SessionStore(backend, worker_id='worker-b', ttl=30, heartbeat_interval=5)
+    try:
+        first.claim('s1')
+        first._stop.set()           # stop heartbeats as a crash would, without deregistering
+        time.sleep(0.25)
+        assert not second.worker_alive('worker-a')
+        assert second.claim('s1')['resumed']
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+def test_only_one_worker_takes_over_a_dead_owners_session(workers):
+    first, second = workers
+    dead = SessionStore(first.backend, worker_id='worker-dead', ttl=30, heartbeat_interval=5)
+    dead.claim('s1')
+    dead.shutdown()
+
+    # Both claimers read the dead owner's record before either writes
+    both_read = threading.Barrier(2)
+    read = first.backend.get_json
+
+    def get_json(key):
+        value = read(key)
+        if key == first._key('session', 's1') and value and value['owner'] == 'worker-dead':
+            both_read.wait(timeout=5)
+        return value
+
+    first.backend.get_json = get_json
+    outcomes = {}
+
+    def claim(store):
+        try:
+            outcomes[store.worker_id] = store.claim('s1')['owner']
+        except SessionOwnedElsewhere as e:
+            outcomes[store.worker_id] = ('conflict', e.record['owner'])
+
+    threads = [threading.Thread(target=claim, args=(store,)) for store in (first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winner = first.get_record('s1')['owner']
+    loser = 'worker-b' if winner == 'worker-a' else 'worker-a'
+    assert outcomes == {winner: winner, loser: ('conflict', winner)}
@@ -0,0 +1,31 @@
+"""
+Transcript buffer offsets across a snapshot and restore
+"""
+
+from transcript_store import TranscriptBuffer
+
+def test_restore_keeps_since_in_offset_order():
+    buffer = TranscriptBuffer()
+    first = buffer.open_segment(0.0, 1.0)         # offset 1
+    second = buffer.add_segment('second', 1.0)    # offsets 2, 3
+    buffer.finalize_segment(first, 'first')       # offset 4: the first segment now changed last
+    snapshot = buffer.snapshot()
+    assert [s['id'] for s in snapshot['segments']] == [first, second]
+
+    resumed = TranscriptBuffer()
+    resumed.restore(snapshot)
+    assert [s['id'] for s in resumed.since(3)['segments']] == [first]
+    assert resumed.get_text() == 'first second'
+
+def test_restore_gives_pending_segments_a_new_offset():
+    buffer = TranscriptBuffer()
+    buffer.add_segment('heard', 0.0)
+    lost = buffer.open_segment(2.0)
+    snapshot = buffer.snapshot()
+
+    resumed = TranscriptBuffer()
+    resumed.restore(snapshot)
+    changed = resumed.since(snapshot['offset'])
+    assert [(s['id'], s['is_final']) for s in changed['segments']] == [(lost, True)]
+    assert changed['offset'] == snapshot['offset'] + 1
+    assert resumed.open_segment(4.0) == lost + 1
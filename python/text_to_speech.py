@@ -3,15 +3,29 @@ EduNerve AI - Text to Speech for AI Avatar
 Speaks questions and warnings using Google Text-to-Speech
 """
 
+import logging
 import os
+import time
 from gtts import gTTS
 from playsound import playsound
 import tempfile
 
+logger = logging.getLogger(__name__)
+
 class AIAvatarSpeaker:
-    def __init__(self, language='en', slow=False):
+    def __init__(self, language='en', slow=False, backend=None):
+        """
+        Args:
+            language (str): gTTS language
+            slow (bool): Slower speech
+            backend (str): 'gtts', or 'fake' to only wait as long as synthesis and
+                playback would take (load tests); defaults to TTS_BACKEND
+        """
         self.language = language
         self.slow = slow
+        self.backend = (backend or os.getenv('TTS_BACKEND', 'gtts')).lower()
+        self.fake_latency_ms = float(os.getenv('TTS_FAKE_LATENCY_MS', 300))
+        self.fake_words_per_second = float(os.getenv('TTS_FAKE_WORDS_PER_SEC', 2.5))
         
     def speak(self, text):
         """
@@ -20,6 +34,11 @@ class AIAvatarSpeaker:
         Args:
             text (str): The text to speak
         """
+        if self.backend == 'fake':
+            playback = len(text.split()) / self.fake_words_per_second if self.fake_words_per_second > 0 else 0
+            time.sleep(self.fake_latency_ms / 1000 + playback)
+            return
+
         try:
             # Create a temporary file
             with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
@@ -36,7 +55,7 @@ class AIAvatarSpeaker:
             os.remove(temp_file)
             
         except Exception as e:
-            print(f"Error in text-to-speech: {e}")
+            logger.warning("Error in text-to-speech: %s", e)
     
     def speak_question(self, question_text):
         """Speak an interview question"""
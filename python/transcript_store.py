@@ -0,0 +1,164 @@
+"""
+EduNerve AI - Incremental Transcript Buffer
+Stores recognized utterances as segments with monotonically increasing offsets
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+class TranscriptBuffer:
+    """
+    Segment list for one STT session.
+
+    Every change (a new pending segment, or a segment becoming final) is stamped
+    with the next offset and moved to the end of an ordered map, so the map is
+    always sorted by offset and "segments since offset N" only walks the changes
+    the client has not seen yet.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._segments = OrderedDict()   # segment id -> segment, ordered by offset
+        self._offset = 0
+        self._next_id = 0
+        self._text_cache = None
+
+    @property
+    def offset(self):
+        """Offset of the most recent change"""
+        return self._offset
+
+    def _stamp(self, segment):
+        self._offset += 1
+        segment['offset'] = self._offset
+        self._segments[segment['id']] = segment
+        self._segments.move_to_end(segment['id'])
+
+    def open_segment(self, start, end=None):
+        """
+        Add an interim segment for an utterance that is waiting for recognition
+
+        Args:
+            start (float): Utterance start in seconds
+            end (float): Utterance end in seconds, if already known
+
+        Returns:
+            int: Segment id used to finalize it
+        """
+        with self._lock:
+            segment_id = self._next_id
+            self._next_id += 1
+            self._stamp({
+                'id': segment_id,
+                'start': start,
+                'end': end,
+                'text': '',
+                'confidence': None,
+                'is_final': False,
+                'timestamp': time.time()
+            })
+            return segment_id
+
+    def finalize_segment(self, segment_id, text, confidence=None):
+        """
+        Record the recognition result of a segment
+
+        Args:
+            segment_id (int): Id returned by open_segment
+            text (str): Recognized text ('' when nothing was understood)
+            confidence (float): Recognizer confidence between 0 and 1
+        """
+        with self._lock:
+            segment = self._segments.get(segment_id)
+            if segment is None:
+                return
+            segment = dict(segment, text=text, confidence=confidence, is_final=True, timestamp=time.time())
+            self._stamp(segment)
+            self._text_cache = None
+
+    def add_segment(self, text, start=None, end=None, confidence=None):
+        """Append an already recognized segment"""
+        segment_id = self.open_segment(start, end)
+        self.finalize_segment(segment_id, text, confidence)
+        return segment_id
+
+    def since(self, offset=0):
+        """
+        Get every segment added or changed after an offset
+
+        Args:
+            offset (int): Last offset the caller has seen
+
+        Returns:
+            dict: 'segments' in offset order and the new 'offset' to poll with
+        """
+        with self._lock:
+            changed = []
+            for segment in reversed(self._segments.values()):
+                if segment['offset'] <= offset:
+                    break
+                changed.append(dict(segment))
+            changed.reverse()
+            return {'segments': changed, 'offset': self._offset}
+
+    def segments(self):
+        """Get all segments in utterance order"""
+        with self._lock:
+            return [dict(s) for s in sorted(self._segments.values(), key=lambda s: s['id'])]
+
+    def get_text(self):
+        """Get the final transcript text (joined once per change, not per poll)"""
+        with self._lock:
+            if self._text_cache is None:
+                parts = [s for s in self._segments.values() if s['is_final'] and s['text']]
+                parts.sort(key=lambda s: s['id'])
+                self._text_cache = ' '.join(s['text'] for s in parts)
+            return self._text_cache
+
+    def snapshot(self):
+        """Segments, offset and text as plain data, for storing outside the process"""
+        return {'segments': self.segments(), 'offset': self._offset, 'text': self.get_text()}
+
+    def restore(self, snapshot):
+        """
+        Continue a transcript from a snapshot (a session resumed by another worker)
+
+        Segments that were still waiting for recognition are kept as empty final
+        segments, since their audio was lost with the previous worker; that
+        change gets a new offset, so pollers see them become final.
+        """
+        with self._lock:
+            self._segments.clear()
+            self._offset = max(self._offset, snapshot.get('offset', 0))
+            # Snapshots list segments by id; the map must be ordered by offset for since()
+            pending = []
+            for segment in sorted(snapshot.get('segments', []), key=lambda s: s['offset']):
+                if segment['is_final']:
+                    self._segments[segment['id']] = dict(segment)
+                else:
+                    pending.append(segment)
+            for segment in pending:
+                self._stamp(dict(segment, is_final=True))
+            self._next_id = max(self._segments, default=-1) + 1
+            self._text_cache = None
+
+    def clear(self):
+        """Drop all segments; offsets keep increasing so pollers are not confused"""
+        with self._lock:
+            self._segments.clear()
+            self._text_cache = None
+
+# Example usage
+if __name__ == "__main__":
+    buffer = TranscriptBuffer()
+
+    first = buffer.open_segment(0.4, 2.1)
+    second = buffer.open_segment(3.0, 5.2)
+    print("Poll 1:", buffer.since(0))
+
+    seen = buffer.offset
+    buffer.finalize_segment(first, "I would use a hash map", 0.91)
+    buffer.finalize_segment(second, "to get constant time lookups", 0.87)
+    print("Poll 2:", buffer.since(seen))
+    print("Text:", buffer.get_text())
@@ -0,0 +1,274 @@
+"""
+EduNerve AI - Voice Activity Detection
+Splits raw 16-bit PCM audio into speech utterances using frame energy
+"""
+
+import numpy as np
+
+class VoiceActivityDetector:
+    def __init__(self, sample_rate=16000, frame_ms=30, energy_threshold=None, threshold_ratio=3.0,
+                 min_threshold=150, min_speech_ms=250, hangover_ms=400, pre_roll_ms=150,
+                 max_segment_s=30):
+        """
+        Args:
+            sample_rate (int): Samples per second of the PCM input
+            frame_ms (int): Analysis frame length in milliseconds
+            energy_threshold (float): Fixed RMS threshold; adaptive from the noise floor when None
+            threshold_ratio (float): Adaptive threshold as a multiple of the noise floor
+            min_threshold (float): Lower bound for the adaptive threshold
+            min_speech_ms (int): Shorter voiced runs are discarded as clicks/noise
+            hangover_ms (int): Silence allowed inside an utterance before it is closed
+            pre_roll_ms (int): Audio kept before the detected speech onset
+            max_segment_s (float): Utterances longer than this are split
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = max(1, int(sample_rate * frame_ms / 1000))
+        self.energy_threshold = energy_threshold
+        self.threshold_ratio = threshold_ratio
+        self.min_threshold = min_threshold
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.pre_roll_frames = int(pre_roll_ms / frame_ms)
+        self.max_segment_frames = max(1, int(max_segment_s * 1000 / frame_ms))
+
+    def frame_energies(self, samples):
+        """
+        Compute the RMS energy of every complete frame
+
+        Args:
+            samples (np.ndarray): int16 PCM samples
+
+        Returns:
+            np.ndarray: One RMS value per frame
+        """
+        n_frames = len(samples) // self.frame_size
+        if n_frames == 0:
+            return np.zeros(0, dtype=np.float32)
+        frames = samples[:n_frames * self.frame_size].astype(np.float32).reshape(n_frames, self.frame_size)
+        return np.sqrt(np.mean(frames * frames, axis=1))
+
+    def threshold_for(self, energies):
+        """Energy threshold for a block of frames"""
+        if self.energy_threshold is not None:
+            return self.energy_threshold
+        if len(energies) == 0:
+            return self.min_threshold
+        noise_floor = np.percentile(energies, 10)
+        return max(self.min_threshold, noise_floor * self.threshold_ratio)
+
+    def detect_segments(self, samples):
+        """
+        Find speech utterances in a complete recording
+
+        Args:
+            samples (np.ndarray or bytes): int16 PCM samples
+
+        Returns:
+            list: Dicts with 'start' and 'end' in seconds, and 'start_sample'/'end_sample'
+        """
+        if isinstance(samples, (bytes, bytearray)):
+            samples = np.frombuffer(samples, dtype=np.int16)
+        energies = self.frame_energies(samples)
+        voiced = energies > self.threshold_for(energies)
+        runs = self._close_gaps(_runs(voiced))
+        return [self._to_segment(start, end) for start, end in runs]
+
+    def _close_gaps(self, runs):
+        """Merge runs separated by short pauses, drop short blips and split long ones"""
+        merged = []
+        for start, end in runs:
+            if merged and start - merged[-1][1] <= self.hangover_frames:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        result = []
+        for start, end in merged:
+            if end - start < self.min_speech_frames:
+                continue
+            start = max(0, start - self.pre_roll_frames)
+            for chunk_start in range(start, end, self.max_segment_frames):
+                result.append((chunk_start, min(end, chunk_start + self.max_segment_frames)))
+        return result
+
+    def _to_segment(self, start_frame, end_frame):
+        start_sample = start_frame * self.frame_size
+        end_sample = end_frame * self.frame_size
+        return {
+            'start': round(start_sample / self.sample_rate, 3),
+            'end': round(end_sample / self.sample_rate, 3),
+            'start_sample': start_sample,
+            'end_sample': end_sample
+        }
+
+class StreamingSegmenter:
+    """Incremental VAD over a live PCM stream; emits each utterance as soon as it ends"""
+
+    def __init__(self, detector, noise_adaptation=0.05):
+        """
+        Args:
+            detector (VoiceActivityDetector): Frame and timing configuration
+            noise_adaptation (float): Smoothing factor for the running noise floor
+        """
+        self.detector = detector
+        self.noise_adaptation = noise_adaptation
+        self.noise_floor = None
+        self._pending = np.zeros(0, dtype=np.int16)   # samples not yet forming a full frame
+        self._frames = []                             # frames of the utterance in progress
+        self._history = []                            # recent silent frames kept for pre-roll
+        self._frame_index = 0                         # frames consumed since the stream started
+        self._speech_start = None
+        self._silent_run = 0
+        self._voiced_count = 0
+
+    @property
+    def in_speech(self):
+        """True while an utterance is open"""
+        return self._speech_start is not None
+
+    @property
+    def speech_started_at(self):
+        """Start time in seconds of the open utterance, or None"""
+        if self._speech_start is None:
+            return None
+        return self._speech_start * self.detector.frame_size / self.detector.sample_rate
+
+    def _threshold(self):
+        d = self.detector
+        if d.energy_threshold is not None:
+            return d.energy_threshold
+        if self.noise_floor is None:
+            return d.min_threshold
+        return max(d.min_threshold, self.noise_floor * d.threshold_ratio)
+
+    def feed(self, pcm_bytes):
+        """
+        Consume a chunk of raw int16 PCM
+
+        Args:
+            pcm_bytes (bytes): Raw audio data
+
+        Returns:
+            list: Completed utterances as dicts with 'start', 'end' (seconds) and 'audio' (bytes)
+        """
+        d = self.detector
+        samples = np.concatenate([self._pending, np.frombuffer(pcm_bytes, dtype=np.int16)])
+        n_frames = len(samples) // d.frame_size
+        self._pending = samples[n_frames * d.frame_size:]
+        if n_frames == 0:
+            return []
+
+        frames = samples[:n_frames * d.frame_size].reshape(n_frames, d.frame_size)
+        energies = d.frame_energies(frames.ravel())
+        voiced = energies > self._threshold()
+
+        # Track the noise floor from unvoiced frames, vectorized per chunk
+        quiet = energies[~voiced]
+        if len(quiet):
+            level = float(np.median(quiet))
+            self.noise_floor = level if self.noise_floor is None else \
+                (1 - self.noise_adaptation) * self.noise_floor + self.noise_adaptation * level
+
+        completed = []
+        for start, end in _runs(voiced, include_silence=True):
+            is_voiced = bool(voiced[start])
+            completed.extend(self._advance(frames[start:end], is_voiced))
+        return completed
+
+    def _advance(self, frames, is_voiced):
+        """Advance the state machine over a run of frames that share one voiced flag"""
+        d = self.detector
+        completed = []
+        count = len(frames)
+
+        if is_voiced:
+            if self._speech_start is None:
+                self._speech_start = self._frame_index - len(self._history)
+                self._frames = list(self._history)
+                self._history = []
+            self._frames.extend(frames)
+            self._voiced_count += count
+            self._silent_run = 0
+        elif self._speech_start is not None:
+            self._frames.extend(frames)
+            self._silent_run += count
+            if self._silent_run > d.hangover_frames:
+                completed.extend(self._close())
+                self._keep_pre_roll(frames)
+        else:
+            self._keep_pre_roll(frames)
+
+        self._frame_index += count
+
+        if self._speech_start is not None and len(self._frames) >= d.max_segment_frames:
+            completed.extend(self._close())
+        return completed
+
+    def _keep_pre_roll(self, frames):
+        """Remember the most recent silent frames so an onset keeps its lead-in"""
+        keep = self.detector.pre_roll_frames
+        self._history = (self._history + list(frames))[-keep:] if keep else []
+
+    def _close(self):
+        """Emit the open utterance, trimming trailing silence"""
+        d = self.detector
+        frames = self._frames[:len(self._frames) - self._silent_run] if self._silent_run else self._frames
+        start = self._speech_start
+        self._speech_start = None
+        voiced_count = self._voiced_count
+        self._frames = []
+        self._silent_run = 0
+        self._voiced_count = 0
+
+        if voiced_count < d.min_speech_frames:
+            return []
+
+        segment = d._to_segment(start, start + len(frames))
+        segment['audio'] = np.concatenate(frames).astype(np.int16).tobytes()
+        return [segment]
+
+    def flush(self):
+        """Close any open utterance at the end of the stream"""
+        if self._speech_start is None:
+            return []
+        self._silent_run = 0
+        return self._close()
+
+def _runs(mask, include_silence=False):
+    """
+    Run-length encode a boolean mask
+
+    Returns:
+        list: (start, end) frame index pairs of True runs, or of all runs when include_silence
+    """
+    if len(mask) == 0:
+        return []
+    changes = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    bounds = np.concatenate(([0], changes, [len(mask)]))
+    runs = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    if include_silence:
+        return runs
+    return [(s, e) for s, e in runs if mask[s]]
+
+# Example usage
+if __name__ == "__main__":
+    rate = 16000
+    rng = np.random.default_rng(0)
+    t = np.arange(rate) / rate
+    silence = (rng.normal(0, 40, rate // 2)).astype(np.int16)
+    tone = (3000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    audio = np.concatenate([silence, tone, silence, silence, tone[:rate // 2], silence])
+
+    vad = VoiceActivityDetector(sample_rate=rate)
+    print("Batch segments:")
+    for seg in vad.detect_segments(audio):
+        print(f"  {seg['start']:.2f}s - {seg['end']:.2f}s")
+
+    print("Streaming segments:")
+    segmenter = StreamingSegmenter(vad)
+    pcm = audio.tobytes()
+    for i in range(0, len(pcm), 3200):
+        for seg in segmenter.feed(pcm[i:i + 3200]):
+            print(f"  {seg['start']:.2f}s - {seg['end']:.2f}s ({len(seg['audio'])} bytes)")
+    for seg in segmenter.flush():
+        print(f"  {seg['start']:.2f}s - {seg['end']:.2f}s ({len(seg['audio'])} bytes)")
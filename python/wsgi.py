@@ -0,0 +1,92 @@
+"""
+EduNerve AI - Production WSGI Entry Point
+App factory for multi-process serving (the Flask dev server is for local development only)
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:application
+"""
+
+import os
+import threading
+
+def create_app(preload=None):
+    """
+    Build the Flask application for a production server
+
+    Args:
+        preload (bool): Import every service module now so a preforking server
+            shares them copy-on-write; defaults to SERVER_PRELOAD (true)
+
+    Returns:
+        Flask: The API application
+    """
+    import api_server
+
+    if preload is None:
+        preload = os.getenv('SERVER_PRELOAD', 'true').lower() == 'true'
+    if preload:
+        api_server.services.preload_modules()
+        # Plain data, safe to build before fork and shared by every worker
+        from question_bank import load_question_bank
+        load_question_bank()
+
+    os.makedirs('reports', exist_ok=True)
+    api_server.app.config['DEBUG'] = False
+    return api_server.app
+
+_forwarding_server = None
+
+def start_forwarding_listener(app, host=None):
+    """
+    Serve the app on a private port of this worker, for requests forwarded to a session's owner
+
+    Workers of a preforking server accept on one shared socket, so the public
+    port cannot reach a particular worker. This listener (an ephemeral port on
+    WORKER_FORWARD_HOST, default 127.0.0.1) is advertised as the worker's
+    address in the session store.
+
+    Returns:
+        str: The advertised address
+    """
+    global _forwarding_server
+    import socket
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import api_server
+
+    host = host or os.getenv('WORKER_FORWARD_HOST', '127.0.0.1')
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass    # gunicorn's access log already has the original request
+
+    _forwarding_server = make_server(host, 0, app, threaded=True, request_handler=QuietHandler)
+    advertised = socket.gethostname() if host in ('0.0.0.0', '::') else host
+    address = f'http://{advertised}:{_forwarding_server.server_port}'
+    threading.Thread(target=_forwarding_server.serve_forever, name='worker-forwarding', daemon=True).start()
+
+    os.environ['WORKER_ADDRESS'] = address
+    if api_server.sessions.ready:
+        api_server.sessions.set_address(address)
+    return address
+
+def forwarding_enabled():
+    """WORKER_FORWARDING: true, false or auto (default: only with a shared session store)"""
+    setting = os.getenv('WORKER_FORWARDING', 'auto').lower()
+    if setting == 'auto':
+        return os.getenv('SESSION_STORE', 'memory').lower() != 'memory'
+    return setting == 'true'
+
+def init_worker():
+    """Per-worker setup after fork: the forwarding listener, then services configured by SERVICE_WARMUP"""
+    import api_server
+    if forwarding_enabled():
+        start_forwarding_listener(api_server.app)
+    api_server.services.warmup_from_env()
+
+def shutdown_worker(timeout):
+    """Per-worker teardown once in-flight requests have finished"""
+    import api_server
+    api_server.shutdown_services(timeout)
+    if _forwarding_server is not None:
+        _forwarding_server.shutdown()
+
+application = create_app()